@@ -0,0 +1,165 @@
+#!/usr/bin/python
+# coding: utf-8
+
+""" This file is a benchmark of the reading of compressed csv files :
+
+    * decompress-to-temp - the compressed file is decompressed in a temporary csv file which is read
+    * streaming - the compressed file is decompressed as a stream while it is parsed by the DataManager
+
+    Usage: python benchmarks/compressed_csv.py -rows 1000000 -fields 10
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from ranalysis.data.csvparser import COMPRESSIONS, open_csv_file  # noqa: E402
+from ranalysis.data.datamanager import DataManager  # noqa: E402
+
+OPTIONS = {'delimiter': ';', 'unit': 1, 'clear': 1, 'cache': 0, 'lazy': 0}
+
+
+def write_csv_file(filename, rows, fields):
+    """ Write a csv file of random data
+
+    Parameters
+    ----------
+    filename : str
+        the file name of the csv file
+    rows : int
+        the number of data lines
+    fields : int
+        the number of fields
+    """
+    data = np.random.default_rng(0).random((rows, fields))
+    with open(filename, 'w') as outfile:
+        outfile.write(";".join("f" + str(index) for index in range(fields)) + "\n")
+        outfile.write(";".join("u" for _ in range(fields)) + "\n")
+        np.savetxt(outfile, data, delimiter=";", fmt="%.6f")
+
+
+def compress_csv_file(filename, compression):
+    """ Compress a csv file
+
+    Parameters
+    ----------
+    filename : str
+        the file name of the csv file
+    compression : str
+        the compression ('gzip', 'bz2' or 'xz')
+
+    Returns
+    ------
+    str
+        the file name of the compressed file
+    """
+    compressed_filename = filename + "." + compression
+    with open(filename, 'rb') as infile, COMPRESSIONS[compression][1].open(compressed_filename, 'wb') as outfile:
+        shutil.copyfileobj(infile, outfile)
+    return compressed_filename
+
+
+def read_decompress_to_temp(filename, temp_dir):
+    """ Decompress a csv file in a temporary file then read it
+
+    Parameters
+    ----------
+    filename : str
+        the file name of the compressed csv file
+    temp_dir : str
+        the directory of the temporary file
+
+    Returns
+    ------
+    tuple(int, int)
+        the number of read rows and the number of bytes written in the temporary file
+    """
+    temp_filename = os.path.join(temp_dir, "decompressed.csv")
+    with open_csv_file(filename) as infile, open(temp_filename, 'wb') as outfile:
+        shutil.copyfileobj(infile, outfile)
+    manager = DataManager()
+    manager.read_csv_file(temp_filename, OPTIONS)
+    written = os.path.getsize(temp_filename)
+    os.remove(temp_filename)
+    return len(manager.get_data_tuple()), written
+
+
+def read_streaming(filename):
+    """ Read a compressed csv file decompressed as a stream
+
+    Parameters
+    ----------
+    filename : str
+        the file name of the compressed csv file
+
+    Returns
+    ------
+    tuple(int, int)
+        the number of read rows and the number of bytes written in a temporary file (0)
+    """
+    manager = DataManager()
+    manager.read_csv_file(filename, OPTIONS)
+    return len(manager.get_data_tuple()), 0
+
+
+def run_benchmark(function, arguments, repeat):
+    """ Run a reading function several times
+
+    Parameters
+    ----------
+    function : function
+        the reading function
+    arguments : tuple
+        the arguments of the function
+    repeat : int
+        the number of runs
+
+    Returns
+    ------
+    tuple(float, int, int)
+        the best time (seconds), the number of read rows and the number of bytes written in a temporary file
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows, written = function(*arguments)
+        times.append(time.perf_counter() - start)
+    return min(times), rows, written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-rows', action='store', type=int, default=1000000,
+                        help='the number of data lines of the csv file ( -rows 1000000 )')
+    parser.add_argument('-fields', action='store', type=int, default=10,
+                        help='the number of fields of the csv file ( -fields 10 )')
+    parser.add_argument('-repeat', action='store', type=int, default=3,
+                        help='the number of runs of each benchmark ( -repeat 3 )')
+    parser.add_argument('-compressions', action='store', type=str, default="gzip,bz2,xz",
+                        help='the compressions to benchmark ( -compressions gzip,bz2,xz )')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        csv_filename = os.path.join(work_dir, "data.csv")
+        write_csv_file(csv_filename, args.rows, args.fields)
+        print("csv file: " + str(args.rows) + " rows, " + str(args.fields) + " fields, "
+              + str(os.path.getsize(csv_filename) // 1024) + " KB")
+        print("{:<6} {:>10} {:>18} {:>12} {:>14}".format("", "size (KB)", "decompress-to-temp", "streaming",
+                                                        "temp I/O (KB)"))
+        for compression_name in args.compressions.split(","):
+            compressed = compress_csv_file(csv_filename, compression_name)
+            temp_time, temp_rows, temp_written = run_benchmark(read_decompress_to_temp, (compressed, work_dir),
+                                                               args.repeat)
+            stream_time, stream_rows, _ = run_benchmark(read_streaming, (compressed,), args.repeat)
+            assert temp_rows == stream_rows == args.rows
+            print("{:<6} {:>10} {:>17.3f}s {:>11.3f}s {:>14}".format(compression_name,
+                                                                   os.path.getsize(compressed) // 1024, temp_time,
+                                                                   stream_time, temp_written // 1024))
+            os.remove(compressed)
@@ -6,7 +6,9 @@
 import argparse
 import logging
 
+from ranalysis.cli.batchrenderer import render_jobs, RENDER_FORMATS
 from ranalysis.cli.clihandler import CliHandler
+from ranalysis.cli.jobfile import run_job_file
 from ranalysis.gui.ranalysisframe import RAnalysisFrame
 from ranalysis.log.loghandler import logger
 
@@ -16,17 +18,48 @@ if __name__ == "__main__":
     parser.add_argument('-gui', action='store_true',
                         help='run ranalysis with gui')
     parser.add_argument('-f', action='store', type=str,
-                        help='the absolute path to the csv data file')
+                        help='the absolute path to the csv data file (with -output, several files can be given: '
+                             '-f run1.csv,run2.csv)')
     parser.add_argument('-x', action='store', type=str,
                         help='the field name of the x data from csv file ( -x xname )')
     parser.add_argument('-y', action='store', type=str,
                         help='the field name of the y data from csv file ( -y yname1 )')
     parser.add_argument('-my', action='store', type=str,
                         help='the field names of the y data from csv file ( -my yname1,yname2,yname3 ) ')
+    parser.add_argument('-xrange', action='store', type=str,
+                        help='the range of the x data to plot ( -xrange 1200,1300 )')
+    parser.add_argument('-where', action='store', type=str,
+                        help='the filter expression of the rows to plot ( -where "phase == 2 and P > 1e5" )')
+    parser.add_argument('-decimation', action='store', type=str, choices=['minmax', 'lttb', 'none'],
+                        help='the decimation of the series to the width of the graph ( -decimation lttb )')
     parser.add_argument('-d', action='store', type=str,
                         help='the delimiter in the csv file ( -d ; )')
     parser.add_argument('-u', action='store', type=str,
                         help='unit after variable name in the csv file ( -u 0 ou -u 1 )')
+    parser.add_argument('-w', action='store', type=int,
+                        help='the number of processes used to parse the csv file ( -w 8 )')
+    parser.add_argument('-chunk', action='store', type=int,
+                        help='read the csv file chunk by chunk of rows when plotting ( -chunk 1000000 )')
+    parser.add_argument('-convert', action='store', type=str,
+                        help='convert the csv file into a column file ( -convert data.rcol )')
+    parser.add_argument('-compression', action='store', type=str, choices=['zlib', 'lzma'],
+                        help='the compression of the columns of the column file ( -compression zlib )')
+    parser.add_argument('-float32', action='store_true',
+                        help='store the float data in float32 instead of float64')
+    parser.add_argument('-no_cache', action='store_true',
+                        help='do not use the binary cache of the parsed csv files')
+    parser.add_argument('-cache_dir', action='store', type=str,
+                        help='the directory of the binary cache ( -cache_dir ~/.ranalysis/cache )')
+    parser.add_argument('-cache_size', action='store', type=int,
+                        help='the maximum size in MB of the binary cache ( -cache_size 4096 )')
+    parser.add_argument('-output', action='store', type=str,
+                        help='save the figures in the output directory without display ( -output figures )')
+    parser.add_argument('-format', action='store', type=str, choices=RENDER_FORMATS,
+                        help='the format of the saved figures ( -format svg )')
+    parser.add_argument('-processes', action='store', type=int,
+                        help='the number of processes rendering the figures of several files ( -processes 8 )')
+    parser.add_argument('-jobs', action='store', type=str,
+                        help='render the plots listed in a json or toml job file ( -jobs nightly.json )')
     args = parser.parse_args()
 
     if args.gui:
@@ -36,21 +69,59 @@ if __name__ == "__main__":
         app.mainloop()
     else:
         logger.log(logging.INFO, "-- Running RAnalysis CLI version")
-        if args.f:
-            if args.x:
-                options = {'delimiter': ';', 'unit': 1}
+        if args.jobs:
+            run_job_file(args.jobs, args.processes)
+        elif args.f:
+            if args.x or args.convert:
+                options = {'delimiter': ';', 'unit': 1, 'cache': 1, 'lazy': 1}
                 if args.d:
                     options['delimiter'] = args.d
                 if args.u:
-                    options['unit'] = args.u
+                    options['unit'] = int(args.u)
+                if args.no_cache:
+                    options['cache'] = 0
+                if args.cache_dir:
+                    options['cache_dir'] = args.cache_dir
+                if args.cache_size:
+                    options['cache_size'] = args.cache_size * 1024 ** 2
+                if args.chunk:
+                    options['chunk_size'] = args.chunk
+                if args.w:
+                    options['workers'] = args.w
+                if args.float32:
+                    options['float32'] = 1
+                if args.decimation:
+                    options['decimation'] = None if args.decimation == 'none' else args.decimation
+                if args.output:
+                    options['output'] = args.output
+                if args.format:
+                    options['format'] = args.format
 
-                cli_handler = CliHandler(args.f, options)
+                # several files are rendered in parallel processes
+                file_paths = args.f.split(",")
+                batch = args.output is not None and len(file_paths) > 1 and not args.convert
+                cli_handler = None if batch else CliHandler(args.f, options)
 
-                if args.y:
-                    cli_handler.show_from_fieldname(args.x, args.y)
+                x_range = None
+                if args.xrange:
+                    try:
+                        x_range = tuple(float(bound) for bound in args.xrange.split(","))
+                    except ValueError:
+                        x_range = ()
+
+                if args.convert:
+                    cli_handler.convert_data(args.convert, args.compression)
+                elif x_range is not None and len(x_range) != 2:
+                    logger.log(logging.ERROR, "-- ERROR x range must be two numbers ( -xrange 0,10 )")
+                elif batch and (args.y or args.my):
+                    y_list = [args.y] if args.y else args.my.split(",")
+                    render_jobs([(file_path, args.x, y_list) for file_path in file_paths], options, args.processes,
+                                x_range, args.where)
+                elif args.y:
+                    cli_handler.show_from_fieldname(args.x, args.y, x_range, args.where)
                 elif args.my:
                     y_list = args.my.split(",")
-                    cli_handler.show_from_fieldnames(args.x, y_list)
+                    cli_handler.show_from_fieldnames(args.x, y_list, x_range, args.where)
                 else:
                     logger.log(logging.ERROR, "-- ERROR y data field name is missing")
             else:
@@ -0,0 +1,117 @@
+#!/usr/bin/python
+# coding: utf-8
+
+""" This file can be imported as a module and contains the batch rendering functions :
+
+    * use_headless_backend - use the matplotlib backend without display (Agg)
+    * render_job - render the figure of a job (csv file, x field name, y field names) in a file
+    * render_jobs - render the figures of many jobs in parallel processes
+
+    The figures are saved in an output directory (png, svg or pdf) and closed, no display is needed. The jobs are sorted
+    by csv file and sent by batches to the processes: each process keeps the data of the last csv file it read, the
+    jobs of the same file do not parse it again.
+"""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+
+from ranalysis.cli.clihandler import CliHandler
+from ranalysis.log.loghandler import logger
+
+RENDER_FORMATS = ('png', 'svg', 'pdf')
+JOBS_PER_BATCH = 16
+
+# the handler of the last csv file read in the process ((file path, options), CliHandler)
+_handler = None
+
+
+def use_headless_backend():
+    """ Use the matplotlib backend without display (Agg) """
+    matplotlib.use('Agg')
+
+
+def render_job(file_path, x_fieldname, y_fieldnames, options, x_range=None, where=None):
+    """ Render the figure of a job in a file (the data of the csv file is kept for the next job of the same file)
+
+    Parameters
+    ----------
+    file_path : str
+        the file path to the csv file
+    x_fieldname : str
+        the fieldname of the x-axis variable to plot
+    y_fieldnames : list(str)
+        the list of fieldname of the y-axis variable to plot
+    options : dict
+        the options to read the csv file, with the 'output' directory and the 'format' of the figures
+    x_range : tuple(float, float)
+        the range (min, max) of the x values to plot (None to plot all the values)
+    where : str
+        the filter expression of the rows to plot (None to plot all the rows)
+
+    Returns
+    ------
+    str
+        the path of the saved figure (None if the job failed)
+    """
+    global _handler
+    try:
+        key = (file_path, repr(sorted(options.items())))
+        if _handler is None or _handler[0] != key:
+            if _handler is not None:
+                _handler[1].close()
+                _handler = None
+            _handler = (key, CliHandler(file_path, options))
+        return _handler[1].show_from_fieldnames(x_fieldname, list(y_fieldnames), x_range, where)
+    except Exception as error:
+        logger.log(logging.ERROR, "[BatchRenderer] Job " + str((file_path, x_fieldname, y_fieldnames)) + " failed: "
+                   + str(error))
+        return None
+
+
+def render_jobs(jobs, options, processes=None, x_range=None, where=None):
+    """ Render the figures of many jobs in parallel processes
+
+    Parameters
+    ----------
+    jobs : list(tuple(str, str, list(str)))
+        the jobs (file path to the csv file, x field name, y field names)
+    options : dict
+        the options to read the csv files, with the 'output' directory and the 'format' of the figures
+    processes : int
+        the number of processes (None for the number of processors)
+    x_range : tuple(float, float)
+        the range (min, max) of the x values to plot in all the figures (None to plot all the values)
+    where : str
+        the filter expression of the rows to plot in all the figures (None to plot all the rows)
+
+    Returns
+    ------
+    list(str)
+        the paths of the saved figures in the order of the jobs (None for the jobs which failed)
+    """
+    if not options.get('output'):
+        raise ValueError("The output directory of the figures is missing")
+    if options.get('format', 'png') not in RENDER_FORMATS:
+        raise ValueError("Unknown figure format " + str(options.get('format')))
+    jobs = list(jobs)
+    processes = processes or os.cpu_count() or 1
+    logger.log(logging.INFO, "[BatchRenderer] Render " + str(len(jobs)) + " figures in " + str(processes)
+               + " processes")
+
+    # the jobs of the same file are sent in the same batches
+    order = sorted(range(len(jobs)), key=lambda index: jobs[index][0])
+    chunksize = max(1, min(JOBS_PER_BATCH, len(jobs) // processes))
+    paths = [None] * len(jobs)
+    with ProcessPoolExecutor(max_workers=processes, initializer=use_headless_backend) as executor:
+        results = executor.map(render_job, [jobs[index][0] for index in order], [jobs[index][1] for index in order],
+                               [jobs[index][2] for index in order], [options] * len(jobs), [x_range] * len(jobs),
+                               [where] * len(jobs), chunksize=chunksize)
+        for index, path in zip(order, results):
+            paths[index] = path
+
+    logger.log(logging.INFO, "[BatchRenderer] " + str(sum(path is not None for path in paths)) + " figures saved in "
+               + options['output'])
+    return paths
@@ -3,16 +3,22 @@
 
 """ This file contains the CliHandler class """
 
+import hashlib
 import logging
+import os
 import queue
+import re
 
 import matplotlib.pyplot as plt
+import numpy as np
 from matplotlib import style
 
 from ranalysis.data.datamanager import DataManager
+from ranalysis.data.rowfilter import RowFilter
 from ranalysis.log.loghandler import logger, QueueHandler
 from ranalysis.plot.graph import graph_from_fieldname, graph_from_fieldnames, graph_from_function, graph_clear,\
-    graph_compare_plot_from_fieldnames, graph_compare_plot_values_from_fieldnames
+    graph_compare_plot_from_fieldnames, graph_compare_plot_values_from_fieldnames, graph_from_chunks,\
+    graph_compare_plot_diff_from_chunks, graph_compare_plot_diff_from_fieldnames, graph_add_title
 
 
 class CliHandler:
@@ -28,19 +34,33 @@ class CliHandler:
             the file path to the csv file
         __data_manager : DataManager
             the data manager used to read csv file
+        __options : dict
+            the options to read the csv file (with 'chunk_size', the file is read chunk by chunk when plotting, with
+            'decimation', the series are decimated to the width of the graph with 'minmax' (default) or 'lttb' or
+            not decimated with None, with 'output', the figures are not shown but saved in the output directory with
+            the Agg backend in the 'format' format ('png' (default), 'svg' or 'pdf'))
 
         Methods
         -------
         read_data(fil_path, options)
             read data from file_path with csv options
-        show_from_function(function, xmin, xmax, discr, xlabel, ylabel)
+        show_from_function(function, xmin, xmax, discr, xlabel, ylabel, figure_name=None, marker=".", title=None)
             show plot from mathematic functions
-        show_from_fieldname(x_fieldname, y_fieldname)
+        show_from_fieldname(x_fieldname, y_fieldname, x_range=None, where=None, figure_name=None, marker=".",
+                            title=None)
             show plot from data field name (x-axis and y-axis)
-        show_from_fieldnames(x_fieldname, y_fieldnames)
+        show_from_fieldnames(x_fieldname, y_fieldnames, x_range=None, where=None, figure_name=None, marker=".",
+                             title=None)
             show plot from data field name (x-axis and multiple y-axis)
-        show_diff_from_fieldnames(x_fieldname, y_fieldnames, values=False):
+        show_diff_from_fieldnames(x_fieldname, y_fieldnames, values=False, figure_name=None, marker=".", title=None,
+                                  diff_graph=False):
             show plot difference between two graph from fieldnames in a plt matplotlib object
+        convert_data(filename, compression)
+            convert the data file into a column file
+        close()
+            remove the queue handler from the logger
+        get_figure_path(output, figure_name, output_format)
+            return the path of a saved figure
         """
 
     def __init__(self, file_path, options=None):
@@ -61,7 +81,11 @@ class CliHandler:
         style.use('ggplot')
         self.__data_manager = None
         self.__file_path = file_path
+        self.__options = options
         self.read_data(file_path, options)
+        if self.__options.get('output'):
+            # headless mode: the figures are only saved
+            plt.switch_backend('Agg')
 
     def read_data(self, file_path, options=None):
         """ Read data from file_path with csv options
@@ -75,13 +99,16 @@ class CliHandler:
         """
         logger.log(logging.INFO, "[CliHandler] Read data from " + file_path)
         if options is None:
-            options = {'delimiter': ';', 'unit': 1}
+            options = {'delimiter': ';', 'unit': 1, 'cache': 1, 'lazy': 1}
+        self.__options = options
 
         if self.__file_path:
             self.__data_manager = DataManager()
-            self.__data_manager.read_csv_file(file_path, options)
+            if not self.__options.get('chunk_size'):
+                self.__data_manager.read_csv_file(file_path, options)
 
-    def show_from_function(self, function, xmin, xmax, discr, xlabel="", ylabel=""):
+    def show_from_function(self, function, xmin, xmax, discr, xlabel="", ylabel="", figure_name=None, marker=".",
+                           title=None):
         """ Plot mathematic function
 
         Parameters
@@ -98,14 +125,26 @@ class CliHandler:
             the name of the x label
         ylabel : str
             the name of the y label
+        figure_name : str
+            the name of the saved figure file without extension (None for a name made of the function)
+        marker : string
+            the style of the marker to plot
+        title : str
+            the title of the graph (None for no title)
+
+        Returns
+        ------
+        str
+            the path of the saved figure (None if the figure is shown)
         """
         logger.log(logging.INFO, "[CliHandler] Plot function " + function)
         fig, ax = plt.subplots()
         graph_clear(ax)
-        graph_from_function(ax, function, xmin, xmax, discr, xlabel, ylabel)
-        plt.show()
+        graph_from_function(ax, function, xmin, xmax, discr, xlabel, ylabel, marker)
+        return self.__show(fig, figure_name or "function_" + function, title)
 
-    def show_from_fieldname(self, x_fieldname, y_fieldname):
+    def show_from_fieldname(self, x_fieldname, y_fieldname, x_range=None, where=None, figure_name=None, marker=".",
+                            title=None):
         """ Plot data from fieldname in a plt matplotlib object
 
         Parameters
@@ -114,17 +153,45 @@ class CliHandler:
             the fieldname of the x-axis variable to plot
         y_fieldname : str
             the fieldname of the y-axis variable to plot
+        x_range : tuple(float, float)
+            the range (min, max) of the x values to plot (None to plot all the values)
+        where : str
+            the filter expression of the rows to plot (ex: phase == 2 and P > 1e5, None to plot all the rows)
+        figure_name : str
+            the name of the saved figure file without extension (None for a name made of the file and field names)
+        marker : string
+            the style of the marker to plot
+        title : str
+            the title of the graph (None for no title)
+
+        Returns
+        ------
+        str
+            the path of the saved figure (None if the figure is shown or if there is no data)
         """
         if self.__data_manager is not None:
             logger.log(logging.INFO, "[CliHandler] Show from field name " + x_fieldname + " " + y_fieldname)
             fig, ax = plt.subplots()
             graph_clear(ax)
-            graph_from_fieldname(ax, self.__data_manager, x_fieldname, y_fieldname)
-            plt.show()
-        else:
-            logger.log(logging.INFO, "[CliHandler] No data to show")
+            try:
+                if self.__options.get('chunk_size'):
+                    graph_from_chunks(ax, self.__data_manager, self.__read_chunks(where, x_fieldname, x_range),
+                                      x_fieldname, [y_fieldname], marker, decimation=self.__decimation())
+                else:
+                    self.__data_manager.load_fields([x_fieldname, y_fieldname])
+                    graph_from_fieldname(ax, self.__data_manager, x_fieldname, y_fieldname, marker, x_range=x_range,
+                                         where=where, decimation=self.__decimation())
+            except ValueError as error:
+                # invalid filter expression
+                logger.log(logging.ERROR, "[CliHandler] " + str(error))
+                plt.close(fig)
+                return None
+            return self.__show(fig, figure_name or self.__figure_name(x_fieldname, [y_fieldname]), title)
+        logger.log(logging.INFO, "[CliHandler] No data to show")
+        return None
 
-    def show_from_fieldnames(self, x_fieldname, y_fieldnames):
+    def show_from_fieldnames(self, x_fieldname, y_fieldnames, x_range=None, where=None, figure_name=None, marker=".",
+                             title=None):
         """ Plot multiple data from fieldnames in a plt matplotlib object
 
         Parameters
@@ -133,17 +200,45 @@ class CliHandler:
             the fieldname of the x-axis variable to plot
         y_fieldnames : list(str)
             the list of fieldname of the y-axis variable to plot
+        x_range : tuple(float, float)
+            the range (min, max) of the x values to plot (None to plot all the values)
+        where : str
+            the filter expression of the rows to plot (ex: phase == 2 and P > 1e5, None to plot all the rows)
+        figure_name : str
+            the name of the saved figure file without extension (None for a name made of the file and field names)
+        marker : string
+            the style of the marker to plot
+        title : str
+            the title of the graph (None for no title)
+
+        Returns
+        ------
+        str
+            the path of the saved figure (None if the figure is shown or if there is no data)
         """
         if self.__data_manager is not None:
             logger.log(logging.INFO, "[CliHandler] Show from field names " + x_fieldname + " " + str(y_fieldnames))
             fig, ax = plt.subplots()
             graph_clear(ax)
-            graph_from_fieldnames(ax, self.__data_manager, x_fieldname, y_fieldnames)
-            plt.show()
-        else:
-            logger.log(logging.INFO, "[CliHandler] No data to show")
+            try:
+                if self.__options.get('chunk_size'):
+                    graph_from_chunks(ax, self.__data_manager, self.__read_chunks(where, x_fieldname, x_range),
+                                      x_fieldname, y_fieldnames, marker, decimation=self.__decimation())
+                else:
+                    self.__data_manager.load_fields([x_fieldname] + y_fieldnames)
+                    graph_from_fieldnames(ax, self.__data_manager, x_fieldname, y_fieldnames, marker, x_range=x_range,
+                                          where=where, decimation=self.__decimation())
+            except ValueError as error:
+                # invalid filter expression
+                logger.log(logging.ERROR, "[CliHandler] " + str(error))
+                plt.close(fig)
+                return None
+            return self.__show(fig, figure_name or self.__figure_name(x_fieldname, y_fieldnames), title)
+        logger.log(logging.INFO, "[CliHandler] No data to show")
+        return None
 
-    def show_diff_from_fieldnames(self, x_fieldname, y_fieldnames, values=False):
+    def show_diff_from_fieldnames(self, x_fieldname, y_fieldnames, values=False, figure_name=None, marker=".",
+                                  title=None, diff_graph=False):
         """ Plot difference between two graph from fieldnames in a plt matplotlib object
 
         Parameters
@@ -154,14 +249,196 @@ class CliHandler:
             the list of fieldname of the y-axis variable for the two plot to compare
         values : boolean
             display the diff values on the graph
+        figure_name : str
+            the name of the saved figure file without extension (None for a name made of the file and field names)
+        marker : string
+            the style of the marker to plot
+        title : str
+            the title of the graph (None for no title)
+        diff_graph : boolean
+            plot the difference as a graph instead of filling between the two plots
+
+        Returns
+        ------
+        str
+            the path of the saved figure (None if the figure is shown or if there is no data)
         """
         if self.__data_manager is not None:
             logger.log(logging.INFO, "[CliHandler] Show from field names " + x_fieldname + " " + str(y_fieldnames))
             fig, ax = plt.subplots()
             graph_clear(ax)
-            graph_compare_plot_from_fieldnames(ax, self.__data_manager, x_fieldname, y_fieldnames)
-            if values:
-                graph_compare_plot_values_from_fieldnames(ax, self.__data_manager, x_fieldname, y_fieldnames, 0.1, True)
-            plt.show()
+            if self.__options.get('chunk_size'):
+                graph_compare_plot_diff_from_chunks(ax, self.__read_chunks(), x_fieldname, y_fieldnames, marker,
+                                                    decimation=self.__decimation())
+            else:
+                self.__data_manager.load_fields([x_fieldname] + y_fieldnames)
+                if diff_graph:
+                    graph_compare_plot_diff_from_fieldnames(ax, self.__data_manager, x_fieldname, y_fieldnames, marker)
+                else:
+                    graph_compare_plot_from_fieldnames(ax, self.__data_manager, x_fieldname, y_fieldnames, marker)
+                if values:
+                    graph_compare_plot_values_from_fieldnames(ax, self.__data_manager, x_fieldname, y_fieldnames,
+                                                              0.1, True)
+            suffix = "diff" if diff_graph else "compare"
+            return self.__show(fig, figure_name or self.__figure_name(x_fieldname, y_fieldnames, suffix), title)
+        logger.log(logging.INFO, "[CliHandler] No data to show")
+        return None
+
+    def convert_data(self, filename, compression=None):
+        """ Convert the data file into a column file
+
+        Parameters
+        ----------
+        filename : str
+            the file name of the column file
+        compression : str
+            the compression of the columns ('zlib', 'lzma' or None)
+        """
+        if self.__data_manager is not None and self.__data_manager.manager_have_data():
+            logger.log(logging.INFO, "[CliHandler] Convert " + self.__file_path + " into " + filename)
+            self.__data_manager.export_column_file(filename, compression)
+        else:
+            logger.log(logging.INFO, "[CliHandler] No data to convert")
+
+    def close(self):
+        """ Remove the queue handler from the logger (the handler is not used anymore) """
+        logger.removeHandler(self.queue_handler)
+
+    @staticmethod
+    def get_figure_path(output, figure_name, output_format="png"):
+        """ Get the path of a saved figure
+
+        Parameters
+        ----------
+        output : str
+            the output directory
+        figure_name : str
+            the name of the figure file without extension
+        output_format : str
+            the format of the figure ('png', 'svg' or 'pdf')
+
+        Returns
+        ------
+        str
+            the path of the figure
+        """
+        return os.path.join(output, re.sub(r'[^\w.+-]+', '_', figure_name) + "." + output_format)
+
+    def __show(self, fig, figure_name, title=None):
+        """ Show a figure or save it in the output directory (headless mode), then close it
+
+        Parameters
+        ----------
+        fig : Figure
+            the matplotlib figure
+        figure_name : str
+            the name of the figure file without extension
+        title : str
+            the title of the graph (None for no title)
+
+        Returns
+        ------
+        str
+            the path of the saved figure (None if the figure is shown)
+        """
+        path = None
+        if title:
+            graph_add_title(fig.axes[0], title)
+        if self.__options.get('output'):
+            output_format = self.__options.get('format', 'png')
+            os.makedirs(self.__options['output'], exist_ok=True)
+            path = self.get_figure_path(self.__options['output'], figure_name, output_format)
+            fig.savefig(path, format=output_format, bbox_inches='tight')
+            logger.log(logging.INFO, "[CliHandler] Figure saved in " + path)
         else:
-            logger.log(logging.INFO, "[CliHandler] No data to show")
+            plt.show()
+        plt.close(fig)
+        return path
+
+    def __figure_name(self, x_fieldname, y_fieldnames, suffix=""):
+        """ Get the default name of a figure file (the csv file name, a short hash of its path and the field names)
+
+        The hash keeps the names of the figures of files with the same name in different directories distinct.
+
+        Parameters
+        ----------
+        x_fieldname : str
+            the fieldname of the x-axis variable
+        y_fieldnames : list(str)
+            the list of fieldname of the y-axis variable
+        suffix : str
+            the suffix of the name ("" for no suffix)
+
+        Returns
+        ------
+        str
+            the name of the figure file without extension
+        """
+        path_hash = hashlib.sha1(os.path.abspath(self.__file_path).encode('utf-8')).hexdigest()[:8]
+        name = "_".join([os.path.splitext(os.path.basename(self.__file_path))[0], path_hash, x_fieldname]
+                        + list(y_fieldnames))
+        return name + "_" + suffix if suffix else name
+
+    def __decimation(self):
+        """ Get the decimation of the series to plot
+
+        Returns
+        ------
+        str
+            the decimation method ('minmax', 'lttb' or None)
+        """
+        return self.__options.get('decimation', 'minmax')
+
+    def __read_chunks(self, where=None, x_fieldname=None, x_range=None):
+        """ Read the csv file chunk by chunk (streaming mode)
+
+        Parameters
+        ----------
+        where : str
+            the filter expression of the rows of the chunks (None to keep all the rows)
+        x_fieldname : str
+            the fieldname of the x-axis variable (filtered by the x range)
+        x_range : tuple(float, float)
+            the range (min, max) of the x values of the rows of the chunks (None to keep all the rows)
+
+        Returns
+        ------
+        generator(dict)
+            the chunks of data ({field name : numpy array})
+        """
+        chunks = self.__data_manager.read_csv_chunks(self.__file_path, self.__options, self.__options['chunk_size'])
+        if not where and x_range is None:
+            return chunks
+        return self.__filter_chunks(chunks, where, x_fieldname, x_range)
+
+    @staticmethod
+    def __filter_chunks(chunks, where, x_fieldname=None, x_range=None):
+        """ Filter the rows of the chunks with a filter expression and a range of x values
+
+        Parameters
+        ----------
+        chunks : generator(dict)
+            the chunks of data ({field name : numpy array})
+        where : str
+            the filter expression (None to keep all the rows)
+        x_fieldname : str
+            the fieldname of the x-axis variable
+        x_range : tuple(float, float)
+            the range (min, max) of the x values (None to keep all the rows)
+
+        Returns
+        ------
+        generator(dict)
+            the filtered chunks of data
+        """
+        row_filter = None
+        for chunk in chunks:
+            row_count = len(next(iter(chunk.values()))) if chunk else 0
+            mask = np.ones(row_count, dtype=bool)
+            if where:
+                if row_filter is None:
+                    row_filter = RowFilter(where, list(chunk.keys()))
+                mask &= row_filter.evaluate(chunk.get, lambda field_name: None, row_count)
+            if x_range is not None and x_fieldname in chunk:
+                mask &= (chunk[x_fieldname] >= x_range[0]) & (chunk[x_fieldname] <= x_range[1])
+            yield {header: column[mask] for header, column in chunk.items()}
@@ -0,0 +1,305 @@
+#!/usr/bin/python
+# coding: utf-8
+
+""" This file can be imported as a module and contains the batch job functions :
+
+    * read_job_file - read a job file (json or toml) listing inputs, reading options, plots, styles and outputs
+    * group_jobs - group the plots of a job file by input csv file
+    * run_job_group - run the plots of a csv file (the file is parsed once)
+    * run_job_file - run the plots of a job file in parallel processes and report the timing and the failures
+
+    A job file (json or toml) contains:
+
+    * "inputs" - the csv files ({name : file path} or {name : {"file": file path, "options": reading options}})
+    * "options" - the reading options of the csv files (ex: {"delimiter": ";", "unit": 1})
+    * "output" - the output directory of the figures, "format" - the format of the figures ('png', 'svg' or 'pdf')
+    * "style" - the matplotlib style of the figures, "marker" - the style of the marker
+    * "processes" - the number of processes
+    * "render_cache" - keep the figures in a render cache (true or {"dir": cache directory, "size": maximum size in MB}),
+      a figure whose csv file and parameters did not change is copied from the cache without parsing nor drawing
+    * "plots" - the list of the plots, each one with a "type" ('fieldname', 'fieldnames', 'function', 'compare' or
+      'diff'), an "input" (name or file path) and the parameters of its type ("x", "y", "where", "x_range", "function",
+      "xmin", "xmax", "discr", "xlabel", "ylabel", "values"), a "name" (the name of the figure file) and a "title",
+      a "style" and a "marker" replacing the ones of the job file
+
+    The paths of the inputs and of the output are relative to the directory of the job file.
+"""
+
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib.pyplot as plt
+
+from ranalysis.cli.batchrenderer import use_headless_backend, RENDER_FORMATS
+from ranalysis.cli.clihandler import CliHandler
+from ranalysis.cli.rendercache import RenderCache, DEFAULT_RENDER_CACHE_DIR, DEFAULT_RENDER_CACHE_SIZE
+from ranalysis.log.loghandler import logger
+
+try:
+    import tomllib
+except ImportError:
+    tomllib = None
+
+PLOT_TYPES = ('fieldname', 'fieldnames', 'function', 'compare', 'diff')
+DEFAULT_OPTIONS = {'delimiter': ';', 'unit': 1, 'cache': 1, 'lazy': 1}
+DEFAULT_STYLE = 'ggplot'
+
+
+def read_job_file(filename):
+    """ Read a job file (json or toml, from its extension) and check it
+
+    Parameters
+    ----------
+    filename : str
+        the file name of the job file
+
+    Returns
+    ------
+    dict
+        the job description (the paths of the inputs and of the output are absolute)
+
+    Raises
+    ------
+    ValueError
+        if the job file is not valid
+    """
+    logger.log(logging.INFO, "[JobFile] Read job file " + filename)
+    if filename.lower().endswith(".toml"):
+        if tomllib is None:
+            raise ValueError("Reading a toml job file needs python 3.11 (tomllib)")
+        with open(filename, 'rb') as infile:
+            job = tomllib.load(infile)
+    else:
+        with open(filename, 'r', encoding='utf-8') as infile:
+            job = json.load(infile)
+
+    directory = os.path.dirname(os.path.abspath(filename))
+    inputs = {}
+    for name, job_input in job.get('inputs', {}).items():
+        if isinstance(job_input, str):
+            job_input = {'file': job_input}
+        if 'file' not in job_input:
+            raise ValueError('The input "{}" has no file'.format(name))
+        inputs[name] = {'file': os.path.join(directory, job_input['file']),
+                        'options': {**DEFAULT_OPTIONS, **job.get('options', {}), **job_input.get('options', {})}}
+    job['inputs'] = inputs
+    job['output'] = os.path.join(directory, job.get('output', "."))
+    if job.setdefault('format', 'png') not in RENDER_FORMATS:
+        raise ValueError('Unknown figure format "{}"'.format(job['format']))
+    render_cache = job.get('render_cache')
+    if render_cache:
+        render_cache = render_cache if isinstance(render_cache, dict) else {}
+        job['render_cache'] = {'dir': os.path.join(directory, render_cache.get('dir', DEFAULT_RENDER_CACHE_DIR)),
+                               'size': int(render_cache['size'] * 1024 ** 2) if 'size' in render_cache
+                               else DEFAULT_RENDER_CACHE_SIZE}
+    else:
+        job['render_cache'] = None
+
+    for index, job_plot in enumerate(job.setdefault('plots', [])):
+        job_plot.setdefault('name', "plot_" + str(index))
+        if job_plot.get('type') not in PLOT_TYPES:
+            raise ValueError('Unknown type "{}" of the plot "{}"'.format(job_plot.get('type'), job_plot['name']))
+        if job_plot['type'] == 'function':
+            missing = [key for key in ('function', 'xmin', 'xmax', 'discr') if key not in job_plot]
+        else:
+            missing = [key for key in ('input', 'x', 'y') if key not in job_plot]
+        if missing:
+            raise ValueError('The plot "{}" has no {}'.format(job_plot['name'], ", ".join(missing)))
+        if job_plot['type'] in ('compare', 'diff') and len(job_plot['y']) != 2:
+            raise ValueError('The plot "{}" must compare two fields'.format(job_plot['name']))
+        if 'input' in job_plot and job_plot['input'] not in inputs:
+            # a file path instead of an input name
+            path = os.path.join(directory, job_plot['input'])
+            inputs.setdefault(path, {'file': path, 'options': {**DEFAULT_OPTIONS, **job.get('options', {})}})
+            job_plot['input'] = path
+    return job
+
+
+def group_jobs(job):
+    """ Group the plots of a job by input csv file
+
+    Parameters
+    ----------
+    job : dict
+        the job description (from read_job_file)
+
+    Returns
+    ------
+    list(tuple(str, dict, list(dict)))
+        the groups (file path (None for the function plots), reading options, plots), the largest groups first
+    """
+    groups = {}
+    for job_plot in job['plots']:
+        groups.setdefault(job_plot.get('input'), []).append(job_plot)
+    result = []
+    for name, job_plots in groups.items():
+        if name is None:
+            result.append((None, dict(DEFAULT_OPTIONS), job_plots))
+        else:
+            result.append((job['inputs'][name]['file'], dict(job['inputs'][name]['options']), job_plots))
+    return sorted(result, key=lambda group: len(group[2]), reverse=True)
+
+
+def run_job_group(file_path, options, job_plots, settings):
+    """ Run the plots of a csv file (the file is parsed once, the figures are saved)
+
+    Parameters
+    ----------
+    file_path : str
+        the file path to the csv file (None for the function plots)
+    options : dict
+        the options to read the csv file
+    job_plots : list(dict)
+        the plots
+    settings : dict
+        the output directory ('output'), the format ('format'), the style ('style'), the marker ('marker') of the
+        figures and the render cache ('render_cache', None if the figures are not cached)
+
+    Returns
+    ------
+    list(dict)
+        the result of each plot ({'name', 'input', 'path', 'time' (in seconds), 'error' (None if the plot succeeded),
+        'cached' (True if the figure was copied from the render cache)})
+    """
+    options = dict(options, output=settings['output'], format=settings.get('format', 'png'))
+    render_cache = None
+    if settings.get('render_cache'):
+        render_cache = RenderCache(settings['render_cache']['dir'], settings['render_cache']['size'])
+    # the csv file is parsed only if a figure is not in the render cache
+    cli_handler = None
+    results = []
+    for job_plot in job_plots:
+        start = time.perf_counter()
+        style = job_plot.get('style', settings.get('style', DEFAULT_STYLE))
+        marker = job_plot.get('marker', settings.get('marker', "."))
+        path = None
+        key = None
+        error_message = None
+        try:
+            if render_cache is not None:
+                path = CliHandler.get_figure_path(options['output'], job_plot['name'], options['format'])
+                parameters = dict(job_plot, style=style, marker=marker, format=options['format'])
+                key = render_cache.get_key(file_path, options, parameters)
+                if render_cache.load(key, path):
+                    results.append({'name': job_plot['name'], 'input': file_path, 'path': path,
+                                    'time': time.perf_counter() - start, 'error': None, 'cached': True})
+                    continue
+            if cli_handler is None:
+                cli_handler = CliHandler(file_path or "", options)
+            with plt.style.context(style):
+                path = _run_plot(cli_handler, job_plot, marker)
+            if render_cache is not None:
+                render_cache.store(key, path)
+        except Exception as error:
+            path = None
+            error_message = str(error) or type(error).__name__
+            # the figure of the failed plot is not closed by the handler
+            plt.close('all')
+        results.append({'name': job_plot['name'], 'input': file_path, 'path': path,
+                        'time': time.perf_counter() - start, 'error': error_message, 'cached': False})
+    if cli_handler is not None:
+        cli_handler.close()
+    return results
+
+
+def run_job_file(filename, processes=None):
+    """ Run the plots of a job file (the plots of a csv file are done in the same process, the files in parallel
+    processes) and report the timing and the failures of each plot
+
+    Parameters
+    ----------
+    filename : str
+        the file name of the job file
+    processes : int
+        the number of processes (None for the "processes" of the job file or the number of processors)
+
+    Returns
+    ------
+    list(dict)
+        the result of each plot ({'name', 'input', 'path', 'time' (in seconds), 'error' (None if the plot succeeded),
+        'cached' (True if the figure was copied from the render cache)})
+    """
+    job = read_job_file(filename)
+    groups = group_jobs(job)
+    processes = processes or job.get('processes') or os.cpu_count() or 1
+    settings = {key: job[key] for key in ('output', 'format', 'style', 'marker', 'render_cache') if key in job}
+    logger.log(logging.INFO, "[JobFile] Run " + str(len(job['plots'])) + " plots of " + str(len(groups))
+               + " inputs in " + str(processes) + " processes")
+
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=min(processes, max(len(groups), 1)),
+                             initializer=use_headless_backend) as executor:
+        futures = {executor.submit(run_job_group, file_path, options, job_plots, settings): (file_path, job_plots)
+                   for file_path, options, job_plots in groups}
+        for future in as_completed(futures):
+            file_path, job_plots = futures[future]
+            try:
+                results.extend(future.result())
+            except Exception as error:
+                # the process of the input failed (killed, data not picklable, ...): its plots are reported as failed
+                logger.log(logging.ERROR, "[JobFile] Input " + str(file_path) + " failed: " + str(error))
+                results.extend({'name': job_plot['name'], 'input': file_path, 'path': None, 'time': 0.0,
+                                'error': str(error) or type(error).__name__, 'cached': False} for job_plot in job_plots)
+
+    for result in results:
+        if result['error'] is None:
+            logger.log(logging.INFO, "[JobFile] " + result['name'] + " done in " + "{:.3f}".format(result['time'])
+                       + " s (" + result['path'] + (", from the render cache)" if result['cached'] else ")"))
+        else:
+            logger.log(logging.ERROR, "[JobFile] " + result['name'] + " failed in " + "{:.3f}".format(result['time'])
+                       + " s: " + result['error'])
+    failures = sum(result['error'] is not None for result in results)
+    logger.log(logging.INFO, "[JobFile] " + str(len(results) - failures) + " plots done, " + str(failures)
+               + " failed in " + "{:.3f}".format(time.perf_counter() - start) + " s")
+    if job['render_cache']:
+        statistics = RenderCache(job['render_cache']['dir'], job['render_cache']['size']).get_statistics()
+        hits = sum(result['cached'] for result in results)
+        logger.log(logging.INFO, "[JobFile] Render cache: " + str(hits) + " hits, " + str(len(results) - hits)
+                   + " misses, " + str(statistics['entries']) + " entries (" + str(statistics['size'] // 1024 ** 2)
+                   + " MB)")
+    return results
+
+
+def _run_plot(cli_handler, job_plot, marker):
+    """ Run a plot of a job file
+
+    Parameters
+    ----------
+    cli_handler : CliHandler
+        the handler of the csv file of the plot (in headless mode)
+    job_plot : dict
+        the plot
+    marker : string
+        the style of the marker to plot
+
+    Returns
+    ------
+    str
+        the path of the saved figure
+    """
+    plot_type = job_plot['type']
+    name = job_plot['name']
+    title = job_plot.get('title')
+    if plot_type == 'function':
+        return cli_handler.show_from_function(job_plot['function'], job_plot['xmin'], job_plot['xmax'],
+                                              job_plot['discr'], job_plot.get('xlabel', "x"),
+                                              job_plot.get('ylabel', job_plot['function']), name, marker, title)
+
+    x_range = tuple(job_plot['x_range']) if job_plot.get('x_range') else None
+    y_fieldnames = [job_plot['y']] if isinstance(job_plot['y'], str) else list(job_plot['y'])
+    if plot_type == 'fieldname':
+        path = cli_handler.show_from_fieldname(job_plot['x'], y_fieldnames[0], x_range, job_plot.get('where'), name,
+                                               marker, title)
+    elif plot_type == 'fieldnames':
+        path = cli_handler.show_from_fieldnames(job_plot['x'], y_fieldnames, x_range, job_plot.get('where'), name,
+                                                marker, title)
+    else:
+        path = cli_handler.show_diff_from_fieldnames(job_plot['x'], y_fieldnames, job_plot.get('values', False), name,
+                                                     marker, title, plot_type == 'diff')
+    if path is None:
+        raise ValueError("no data to plot")
+    return path
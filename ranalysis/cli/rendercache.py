@@ -0,0 +1,278 @@
+#!/usr/bin/python
+# coding: utf-8
+
+""" This file contains the RenderCache class """
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+
+import matplotlib
+
+from ranalysis.data.datacache import DataCache
+from ranalysis.log.loghandler import logger
+
+DEFAULT_RENDER_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".ranalysis", "renders")
+DEFAULT_RENDER_CACHE_SIZE = 1024 ** 3
+
+
+class RenderCache:
+    """ A class used to store the rendered figures (one image file per figure)
+
+    An entry is keyed by the fingerprint of the content of the input csv file, the reading options, the parameters of
+    the plot (fields, function, marker, style, title, ...) and the version of matplotlib. A figure found in the cache is
+    copied without parsing the csv file nor drawing the figure. The fingerprints of the csv files are kept with their
+    size and modification time (an unchanged file is not read again). The least recently used entries are removed when
+    the size of the cache exceeds its maximum size.
+
+    Attributes
+    ----------
+    __cache_dir : str
+        the directory of the cache
+    __max_size : int
+        the maximum size of the cache (bytes)
+    __hits : int
+        the number of figures found in the cache
+    __misses : int
+        the number of figures not found in the cache
+    __fingerprints : dict
+        the fingerprints of the csv files already computed ({(file path, size, modification time) : fingerprint})
+
+    Methods
+    -------
+    get_key(file_path, options, parameters)
+        return the key of a figure in the cache
+    load(key, path)
+        copy a figure from the cache
+    store(key, path)
+        store a figure in the cache
+    get_statistics()
+        return the hits, the misses, the number of entries and the size of the cache
+    evict()
+        remove the least recently used entries until the cache size is below its maximum size
+    clear()
+        remove all the entries of the cache
+    """
+
+    __FINGERPRINT_FILE = "fingerprints.json"
+    __READ_SIZE = 1024 ** 2
+
+    def __init__(self, cache_dir=DEFAULT_RENDER_CACHE_DIR, max_size=DEFAULT_RENDER_CACHE_SIZE):
+        """ RenderCache constructor
+
+        Parameters
+        ----------
+        cache_dir : str
+            the directory of the cache
+        max_size : int
+            the maximum size of the cache (bytes)
+        """
+        self.__cache_dir = cache_dir
+        self.__max_size = int(max_size)
+        self.__hits = 0
+        self.__misses = 0
+        self.__fingerprints = {}
+
+    def get_key(self, file_path, options, parameters):
+        """ Get the key of a figure in the cache
+
+        Parameters
+        ----------
+        file_path : str
+            the file path to the csv file (None for a figure without csv file)
+        options : dict
+            the reading options of the csv file
+        parameters : dict
+            the parameters of the plot (fields, function, marker, style, title, format, ...)
+
+        Returns
+        ------
+        str
+            the key of the figure
+        """
+        key = [matplotlib.__version__, parameters]
+        if file_path:
+            # the options changing the parsed data (the same as in the data cache) or the drawn series
+            key += [self.__fingerprint(file_path), DataCache.get_data_options(options),
+                    options.get('decimation', 'minmax'), options.get('chunk_size')]
+        return hashlib.sha1(json.dumps(key, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def load(self, key, path):
+        """ Copy a figure from the cache
+
+        Parameters
+        ----------
+        key : str
+            the key of the figure
+        path : str
+            the path of the copy of the figure
+
+        Returns
+        ------
+        bool
+            True if the figure was found in the cache, False otherwise
+        """
+        entry = self.__entry_path(key, path)
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            shutil.copyfile(entry, path)
+            # the modification time of the entry is its last access time
+            os.utime(entry)
+        except OSError:
+            self.__misses += 1
+            return False
+
+        self.__hits += 1
+        logger.log(logging.INFO, "[RenderCache] Copy " + path + " from " + entry)
+        return True
+
+    def store(self, key, path):
+        """ Store a figure in the cache
+
+        Parameters
+        ----------
+        key : str
+            the key of the figure
+        path : str
+            the path of the figure
+        """
+        entry = self.__entry_path(key, path)
+        if os.path.isfile(entry):
+            return
+
+        # the entry is written in a temporary file then renamed to never expose a partial entry
+        temp_entry = entry + ".tmp" + str(os.getpid())
+        try:
+            os.makedirs(self.__cache_dir, exist_ok=True)
+            shutil.copyfile(path, temp_entry)
+            os.replace(temp_entry, entry)
+            logger.log(logging.INFO, "[RenderCache] Store " + path + " in " + entry)
+        except OSError as error:
+            logger.log(logging.ERROR, "[RenderCache] Cannot store " + path + " in the cache: " + str(error))
+            if os.path.exists(temp_entry):
+                os.remove(temp_entry)
+            return
+
+        self.evict()
+
+    def get_statistics(self):
+        """ Get the statistics of the cache
+
+        Returns
+        ------
+        dict
+            the number of figures found ('hits') and not found ('misses') in the cache by this object, the number of
+            entries ('entries') and the size of the cache in bytes ('size')
+        """
+        entries = self.__list_entries()
+        return {'hits': self.__hits, 'misses': self.__misses, 'entries': len(entries),
+                'size': sum(size for _, size, _ in entries)}
+
+    def evict(self):
+        """ Remove the least recently used entries until the cache size is below its maximum size """
+        entries = self.__list_entries()
+        cache_size = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if cache_size <= self.__max_size:
+                break
+            logger.log(logging.INFO, "[RenderCache] Evict " + entry)
+            try:
+                os.remove(entry)
+            except OSError:
+                # the entry may have been removed by another process
+                pass
+            cache_size -= size
+
+    def clear(self):
+        """ Remove all the entries of the cache """
+        logger.log(logging.INFO, "[RenderCache] Clear cache " + self.__cache_dir)
+        for _, _, entry in self.__list_entries():
+            try:
+                os.remove(entry)
+            except OSError:
+                pass
+
+    def __entry_path(self, key, path):
+        """ Get the path of an entry (the extension of the figure is kept)
+
+        Parameters
+        ----------
+        key : str
+            the key of the figure
+        path : str
+            the path of the figure
+
+        Returns
+        ------
+        str
+            the path of the entry
+        """
+        return os.path.join(self.__cache_dir, key + os.path.splitext(path)[1])
+
+    def __list_entries(self):
+        """ List the entries of the cache
+
+        Returns
+        ------
+        list(tuple(float, int, str))
+            the last access time, the size and the path of each entry
+        """
+        if not os.path.isdir(self.__cache_dir):
+            return []
+        entries = []
+        for name in os.listdir(self.__cache_dir):
+            entry = os.path.join(self.__cache_dir, name)
+            if ".tmp" in name or name == self.__FINGERPRINT_FILE or not os.path.isfile(entry):
+                continue
+            try:
+                entries.append((os.path.getmtime(entry), os.path.getsize(entry), entry))
+            except OSError:
+                continue
+        return entries
+
+    def __fingerprint(self, file_path):
+        """ Get the fingerprint of the content of a file (computed again only if its size or modification time changed)
+
+        Parameters
+        ----------
+        file_path : str
+            the file path
+
+        Returns
+        ------
+        str
+            the fingerprint of the content of the file
+        """
+        file_path = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        if (file_path, stat.st_size, stat.st_mtime_ns) in self.__fingerprints:
+            return self.__fingerprints[(file_path, stat.st_size, stat.st_mtime_ns)]
+        fingerprint_file = os.path.join(self.__cache_dir, self.__FINGERPRINT_FILE)
+        try:
+            with open(fingerprint_file, 'r') as infile:
+                fingerprints = json.load(infile)
+        except (OSError, ValueError):
+            fingerprints = {}
+        known = fingerprints.get(file_path)
+        if known is not None and known[0] == stat.st_size and known[1] == stat.st_mtime_ns:
+            self.__fingerprints[(file_path, stat.st_size, stat.st_mtime_ns)] = known[2]
+            return known[2]
+
+        digest = hashlib.blake2b(digest_size=20)
+        with open(file_path, 'rb') as infile:
+            for block in iter(lambda: infile.read(self.__READ_SIZE), b""):
+                digest.update(block)
+        fingerprints[file_path] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+        self.__fingerprints[(file_path, stat.st_size, stat.st_mtime_ns)] = digest.hexdigest()
+
+        temp_file = fingerprint_file + ".tmp" + str(os.getpid())
+        try:
+            os.makedirs(self.__cache_dir, exist_ok=True)
+            with open(temp_file, 'w') as outfile:
+                json.dump(fingerprints, outfile)
+            os.replace(temp_file, fingerprint_file)
+        except OSError as error:
+            logger.log(logging.ERROR, "[RenderCache] Cannot store the fingerprint of " + file_path + ": " + str(error))
+        return digest.hexdigest()
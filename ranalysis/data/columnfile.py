@@ -0,0 +1,350 @@
+#!/usr/bin/python
+# coding: utf-8
+
+""" This file contains the ColumnFile class (columnar binary data file)
+
+    A column file contains the columns of a data file stored by blocks of rows. Each block of a column is stored as
+    raw bytes (optionally compressed with zlib or lzma) and the meta data (field names, units, types, sortedness,
+    categories of the text fields and offset, size, min, max and count of each block) is stored as json at the end of
+    the file:
+
+        MAGIC | blocks of column 1 | blocks of column 2 | ... | json meta data | size of the meta data | MAGIC
+
+    Only the meta data is read when a column file is opened, the blocks of a column are read when the column is asked.
+"""
+
+import json
+import logging
+import lzma
+import os
+import struct
+import zlib
+
+import numpy as np
+
+from ranalysis.data.zonemap import column_sortedness
+from ranalysis.log.loghandler import logger
+
+MAGIC = b"RCOL"
+VERSION = 1
+BLOCK_ROWS = 1 << 16
+COMPRESSIONS = {
+    'zlib': (zlib.compress, zlib.decompress),
+    'lzma': (lzma.compress, lzma.decompress)
+}
+_FOOTER = struct.Struct("<Q4s")
+_ALIGNMENT = 8
+
+
+class ColumnFile:
+    """ A class used to read a column file (columnar binary data file)
+
+    Attributes
+    ----------
+    __filename : str
+        the path to the column file
+    __meta : dict
+        the meta data of the column file (field names, units, rows and the description of each column)
+
+    Methods
+    -------
+    get_field_names()
+        get the list of field names
+    get_units()
+        get the list of units
+    get_row_count()
+        get the number of rows
+    get_block_rows()
+        get the number of rows of a block
+    get_dtype(field_name)
+        get the type of a column
+    get_categories(field_name)
+        get the categories of a text field
+    get_sortedness(field_name)
+        get the sortedness of a column
+    get_blocks(field_name)
+        get the description of the blocks of a column (offset, size, rows, count, min, max)
+    read_block(field_name, index)
+        read a block of a column
+    read_column(field_name)
+        read a column
+    """
+
+    def __init__(self, filename):
+        """ ColumnFile constructor (only the meta data is read)
+
+        Parameters
+        ----------
+        filename : str
+            the path to the column file
+        """
+        self.__filename = filename
+        with open(filename, 'rb') as infile:
+            infile.seek(-_FOOTER.size, os.SEEK_END)
+            meta_size, magic = _FOOTER.unpack(infile.read(_FOOTER.size))
+            if magic != MAGIC:
+                raise ValueError(filename + " is not a column file")
+            infile.seek(-_FOOTER.size - meta_size, os.SEEK_END)
+            self.__meta = json.loads(infile.read(meta_size).decode('utf-8'))
+        logger.log(logging.INFO, "[ColumnFile] Open " + filename + " (" + str(self.__meta['rows']) + " rows)")
+
+    def get_field_names(self):
+        """ Get the list of field names
+
+        Returns
+        ------
+        list(str)
+            the list of field names
+        """
+        return [column['name'] for column in self.__meta['columns']]
+
+    def get_units(self):
+        """ Get the list of units
+
+        Returns
+        ------
+        list(str)
+            the list of units (one per field)
+        """
+        return [column['unit'] for column in self.__meta['columns']]
+
+    def get_row_count(self):
+        """ Get the number of rows
+
+        Returns
+        ------
+        int
+            the number of rows
+        """
+        return self.__meta['rows']
+
+    def get_block_rows(self):
+        """ Get the number of rows of a block
+
+        Returns
+        ------
+        int
+            the number of rows of a block (the last block of a column can be smaller)
+        """
+        return self.__meta['block_rows']
+
+    def get_dtype(self, field_name):
+        """ Get the type of a column
+
+        Parameters
+        ----------
+        field_name : str
+            the field name
+
+        Returns
+        ------
+        numpy.dtype
+            the type of the column
+        """
+        return np.dtype(self.__column(field_name)['dtype'])
+
+    def get_categories(self, field_name):
+        """ Get the categories of a text field
+
+        Parameters
+        ----------
+        field_name : str
+            the field name
+
+        Returns
+        ------
+        numpy.ndarray
+            the categories of the text field (None if the field is not a text field)
+        """
+        categories = self.__column(field_name).get('categories')
+        return None if categories is None else np.array(categories, dtype=str)
+
+    def get_sortedness(self, field_name):
+        """ Get the sortedness of a column
+
+        Parameters
+        ----------
+        field_name : str
+            the field name
+
+        Returns
+        ------
+        int
+            the sortedness of the column (see zonemap: ASCENDING, DESCENDING or UNSORTED)
+        """
+        return self.__column(field_name).get('sorted', 0)
+
+    def get_blocks(self, field_name):
+        """ Get the description of the blocks of a column
+
+        Parameters
+        ----------
+        field_name : str
+            the field name
+
+        Returns
+        ------
+        list(dict)
+            the blocks ('offset' and 'size' in bytes, 'rows', 'count' of non nan values, 'min' and 'max' values)
+        """
+        return self.__column(field_name)['blocks']
+
+    def read_block(self, field_name, index):
+        """ Read a block of a column
+
+        Parameters
+        ----------
+        field_name : str
+            the field name
+        index : int
+            the index of the block
+
+        Returns
+        ------
+        numpy.ndarray
+            the values of the block
+        """
+        column = self.__column(field_name)
+        block = column['blocks'][index]
+        with open(self.__filename, 'rb') as infile:
+            infile.seek(block['offset'])
+            data = infile.read(block['size'])
+        if column['compression'] is not None:
+            data = COMPRESSIONS[column['compression']][1](data)
+        return np.frombuffer(data, dtype=np.dtype(column['dtype'])).copy()
+
+    def read_column(self, field_name):
+        """ Read a column (an uncompressed column is memory mapped)
+
+        Parameters
+        ----------
+        field_name : str
+            the field name
+
+        Returns
+        ------
+        numpy.ndarray
+            the values of the column
+        """
+        column = self.__column(field_name)
+        dtype = np.dtype(column['dtype'])
+        if not column['blocks']:
+            return np.empty(0, dtype=dtype)
+        if column['compression'] is None:
+            # the blocks of a column are contiguous when they are not compressed
+            return np.memmap(self.__filename, dtype=dtype, mode='r', offset=column['blocks'][0]['offset'],
+                             shape=(self.__meta['rows'],))
+        return np.concatenate([self.read_block(field_name, index) for index in range(len(column['blocks']))])
+
+    def __column(self, field_name):
+        """ Get the description of a column
+
+        Parameters
+        ----------
+        field_name : str
+            the field name
+
+        Returns
+        ------
+        dict
+            the description of the column (name, unit, dtype, compression, categories, sorted, blocks)
+        """
+        for column in self.__meta['columns']:
+            if column['name'] == field_name:
+                return column
+        raise KeyError(field_name)
+
+
+def is_column_file(filename):
+    """ Check if a file is a column file from its first bytes
+
+    Parameters
+    ----------
+    filename : str
+        the path to the file
+
+    Returns
+    ------
+    bool
+        true if the file is a column file, false otherwise
+    """
+    with open(filename, 'rb') as infile:
+        return infile.read(len(MAGIC)) == MAGIC
+
+
+def write_column_file(filename, fieldnames, units, columns, categories=None, compression=None,
+                      block_rows=BLOCK_ROWS):
+    """ Write columns in a column file
+
+    Parameters
+    ----------
+    filename : str
+        the path to the column file
+    fieldnames : list(str)
+        the field names of the columns
+    units : list(str)
+        the units of the columns (empty if there is no unit)
+    columns : list(numpy.ndarray)
+        the columns (same length)
+    categories : dict
+        the categories of the text fields ({field name : numpy array})
+    compression : str
+        the compression of the blocks ('zlib', 'lzma' or None)
+    block_rows : int
+        the number of rows of a block
+    """
+    if compression is not None and compression not in COMPRESSIONS:
+        raise ValueError("Unknown compression " + str(compression))
+    categories = categories or {}
+    logger.log(logging.INFO, "[ColumnFile] Write " + filename + " (compression " + str(compression) + ")")
+
+    meta = {'version': VERSION, 'rows': len(columns[0]) if columns else 0, 'block_rows': block_rows, 'columns': []}
+    temp_filename = filename + ".tmp" + str(os.getpid())
+    with open(temp_filename, 'wb') as outfile:
+        outfile.write(MAGIC)
+        for index, (header, column) in enumerate(zip(fieldnames, columns)):
+            column = np.ascontiguousarray(column)
+            description = {
+                'name': header,
+                'unit': units[index] if units else "",
+                'dtype': column.dtype.str,
+                'compression': compression,
+                'categories': categories[header].tolist() if header in categories else None,
+                'sorted': column_sortedness(column),
+                'blocks': []
+            }
+            # the blocks are aligned so that an uncompressed column can be memory mapped
+            outfile.write(b"\0" * (-outfile.tell() % _ALIGNMENT))
+            for start in range(0, len(column), block_rows):
+                block = column[start:start + block_rows]
+                data = block.tobytes()
+                if compression is not None:
+                    data = COMPRESSIONS[compression][0](data)
+                description['blocks'].append(dict(offset=outfile.tell(), size=len(data), rows=len(block),
+                                                  **_block_statistics(block)))
+                outfile.write(data)
+            meta['columns'].append(description)
+        meta_data = json.dumps(meta).encode('utf-8')
+        outfile.write(meta_data)
+        outfile.write(_FOOTER.pack(len(meta_data), MAGIC))
+    os.replace(temp_filename, filename)
+
+
+def _block_statistics(block):
+    """ Compute the statistics of a block (zone map)
+
+    Parameters
+    ----------
+    block : numpy.ndarray
+        the values of the block
+
+    Returns
+    ------
+    dict
+        the number of non nan values ('count') and the minimum and maximum values ('min' and 'max', None if the block
+        has no value)
+    """
+    values = block[~np.isnan(block)] if block.dtype.kind == 'f' else block
+    if values.size == 0:
+        return {'count': 0, 'min': None, 'max': None}
+    return {'count': int(values.size), 'min': values.min().item(), 'max': values.max().item()}
@@ -0,0 +1,172 @@
+#!/usr/bin/python
+# coding: utf-8
+
+""" This file can be imported as a module and contains the column type functions :
+
+    * infer_column - convert a parsed column into its most compact type
+    * join_categorical - join columns into one dictionary encoded (categorical) column
+    * decode_column - get the text values of a dictionary encoded column
+    * append_column - append a block of rows to a converted column (the type of the column is kept or inferred again)
+
+    A parsed column is a float64 array (numeric field) or a str array (text field). Numeric columns become bool, int32,
+    int64, float32 or float64 arrays. Text columns become dictionary encoded columns: the codes (int8, int16 or int32
+    array) index the sorted list of the distinct values of the column (categories).
+"""
+
+import numpy as np
+
+_TRUE_FALSE = ('true', 'false')
+
+
+def infer_column(column, float32=False):
+    """ Convert a parsed column into its most compact type
+
+    Parameters
+    ----------
+    column : numpy.ndarray
+        the parsed column (float64 or str array)
+    float32 : bool
+        downcast the float columns to float32
+
+    Returns
+    ------
+    tuple(numpy.ndarray, numpy.ndarray)
+        the converted column and its categories (None if the column is not dictionary encoded)
+    """
+    if column.dtype.kind == 'U':
+        lowered = np.char.lower(np.char.strip(column))
+        if column.size > 0 and np.isin(lowered, _TRUE_FALSE).all():
+            return lowered == 'true', None
+        categories, codes = np.unique(column, return_inverse=True)
+        return codes.astype(_code_dtype(len(categories))), categories
+
+    if column.dtype == np.float64 and column.size > 0:
+        if np.isfinite(column).all() and (column == np.trunc(column)).all():
+            info = np.iinfo(np.int32)
+            if info.min <= column.min() and column.max() <= info.max:
+                return column.astype(np.int32), None
+            info = np.iinfo(np.int64)
+            if info.min <= column.min() and column.max() < info.max:
+                return column.astype(np.int64), None
+        if float32:
+            return column.astype(np.float32), None
+    return column, None
+
+
+def join_categorical(columns, categories):
+    """ Join columns into one dictionary encoded column (the categories are merged)
+
+    Parameters
+    ----------
+    columns : list(numpy.ndarray)
+        the columns to join
+    categories : list(numpy.ndarray)
+        the categories of the columns (None for a column which is not dictionary encoded)
+
+    Returns
+    ------
+    tuple(numpy.ndarray, numpy.ndarray)
+        the joined codes and their categories
+    """
+    encoded_columns = []
+    for column, column_categories in zip(columns, categories):
+        if column_categories is None:
+            # a column which is not encoded is encoded from its values as text
+            column_categories, column = np.unique(column.astype(str), return_inverse=True)
+        encoded_columns.append((column, np.asarray(column_categories, dtype=str)))
+
+    joined_categories = np.unique(np.concatenate([column_categories for _, column_categories in encoded_columns]))
+    code_dtype = _code_dtype(len(joined_categories))
+    codes = [np.searchsorted(joined_categories, column_categories).astype(code_dtype)[column]
+             for column, column_categories in encoded_columns]
+    return np.concatenate(codes) if codes else np.empty(0, dtype=code_dtype), joined_categories
+
+
+def decode_column(column, categories):
+    """ Get the text values of a dictionary encoded column
+
+    Parameters
+    ----------
+    column : numpy.ndarray
+        the codes of the column
+    categories : numpy.ndarray
+        the categories of the column
+
+    Returns
+    ------
+    numpy.ndarray
+        the text values (str array)
+    """
+    return np.asarray(categories, dtype=str)[column]
+
+
+def append_column(column, categories, block, block_categories, float32=False):
+    """ Append a block of rows to a converted column
+
+    The result has the type the column would have if all its rows were parsed at once: a numeric block is cast to the
+    type of the column when no value is lost, otherwise the type of the column is inferred again, text values appended
+    to a numeric column are nan (as in the parser) and the categories of text columns are merged. A block without any
+    value (empty cells) is appended as nan values, or as empty texts to a text column.
+
+    Parameters
+    ----------
+    column : numpy.ndarray
+        the converted column
+    categories : numpy.ndarray
+        the categories of the column (None if the column is not dictionary encoded)
+    block : numpy.ndarray
+        the converted block of rows
+    block_categories : numpy.ndarray
+        the categories of the block (None if the block is not dictionary encoded)
+    float32 : bool
+        downcast the float columns to float32
+
+    Returns
+    ------
+    tuple(numpy.ndarray, numpy.ndarray)
+        the joined column and its categories (None if the column is not dictionary encoded)
+    """
+    if block.size == 0:
+        return column, categories
+    # the true/false columns are text columns
+    text_column = categories is not None or column.dtype.kind == 'b'
+    text_block = block_categories is not None or block.dtype.kind == 'b'
+    empty_block = not text_block and block.dtype.kind == 'f' and np.isnan(block).all()
+    if text_column and (text_block or empty_block):
+        if empty_block:
+            block, block_categories = np.zeros(len(block), dtype=np.int8), np.array([""])
+        if column.dtype.kind == 'b' and block.dtype.kind == 'b':
+            return np.concatenate((column, block)), None
+        return join_categorical([np.where(column, 'true', 'false') if column.dtype.kind == 'b' else column,
+                                 np.where(block, 'true', 'false') if block.dtype.kind == 'b' else block],
+                                [categories, block_categories])
+
+    if text_column:
+        # numbers appended to a text column: the column becomes numeric, its text values are nan
+        column = np.full(len(column), np.nan)
+    elif text_block:
+        # text values appended to a numeric column are nan
+        block = np.full(len(block), np.nan)
+    if np.can_cast(block.dtype, column.dtype, 'safe'):
+        return np.concatenate((column, block.astype(column.dtype, copy=False))), None
+    joined, _ = infer_column(np.concatenate((column.astype(np.float64), block.astype(np.float64))), float32)
+    return joined, None
+
+
+def _code_dtype(count):
+    """ Get the smallest integer type of the codes of a dictionary encoded column
+
+    Parameters
+    ----------
+    count : int
+        the number of categories
+
+    Returns
+    ------
+    numpy.dtype
+        the type of the codes
+    """
+    for dtype in (np.int8, np.int16):
+        if count <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int32)
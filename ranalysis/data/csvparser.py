@@ -0,0 +1,416 @@
+#!/usr/bin/python
+# coding: utf-8
+
+""" This file can be imported as a module and contains csv parsing functions :
+
+    * detect_compression - detect the compression of a csv file from its first bytes
+    * open_csv_file - open a csv file (plain or compressed) as a binary stream
+    * read_header - read the field names (and the units) of a csv file
+    * read_blocks - read the data lines of a csv file by blocks
+    * read_line_blocks - read the data lines of a csv file by blocks of a fixed number of lines
+    * parse_block - convert a block of csv lines into columns
+    * join_blocks - join the parsed blocks of a column
+    * split_ranges - split a part of a csv file into ranges of bytes aligned on the lines
+    * parse_range - convert the lines of a range of bytes of a csv file into columns
+
+    The data lines are read by large blocks of bytes and each block is converted at once by the numpy text parser.
+    Blocks which cannot be parsed as a numeric table (text cells, missing cells, ...) are converted column by column.
+    Compressed files (gzip, bz2 and xz) are decompressed as a stream while they are read, the positions in bytes are
+    then positions in the decompressed data.
+"""
+
+import bz2
+import csv
+import gzip
+import io
+import itertools
+import logging
+import lzma
+
+import numpy as np
+
+from ranalysis.log.loghandler import logger
+
+BLOCK_SIZE = 1 << 24
+MIN_RANGE_SIZE = 1 << 22
+STREAM_BUFFER_SIZE = 1 << 16
+COMPRESSIONS = {'gzip': (b'\x1f\x8b', gzip), 'bz2': (b'BZh', bz2), 'xz': (b'\xfd7zXZ\x00', lzma)}
+_NAN_TOKENS = ('nan', '+nan', '-nan')
+
+
+def detect_compression(filename):
+    """ Detect the compression of a csv file from its first bytes (magic number)
+
+    Parameters
+    ----------
+    filename : str
+        the file name of the csv file
+
+    Returns
+    ------
+    str
+        the compression of the file ('gzip', 'bz2' or 'xz'), None if the file is not compressed
+    """
+    with open(filename, 'rb') as infile:
+        magic = infile.read(6)
+    for compression, (signature, _) in COMPRESSIONS.items():
+        if magic.startswith(signature):
+            return compression
+    return None
+
+
+def open_csv_file(filename):
+    """ Open a csv file as a binary stream (compressed files are decompressed while they are read)
+
+    Parameters
+    ----------
+    filename : str
+        the file name of the csv file
+
+    Returns
+    ------
+    file
+        the csv file opened in binary mode
+    """
+    compression = detect_compression(filename)
+    if compression is None:
+        return open(filename, 'rb')
+    logger.log(logging.DEBUG, "[CsvParser] Decompress " + filename + " (" + compression + ")")
+    # the decompressed lines are read through a larger buffer than the default one of the decompressors
+    return io.BufferedReader(COMPRESSIONS[compression][1].open(filename, 'rb'), buffer_size=STREAM_BUFFER_SIZE)
+
+
+def read_header(infile, delimiter, unit, encoding):
+    """ Read the field names and the units (if any) of a csv file
+
+    Parameters
+    ----------
+    infile : file
+        the csv file opened in binary mode
+    delimiter : str
+        the delimiter of the csv file
+    unit : int
+        1 if the second line of the csv file contains the units, 0 otherwise
+    encoding : str
+        the encoding of the csv file
+
+    Returns
+    ------
+    tuple(list(str), list(str))
+        the field names and the units
+    """
+    fieldnames = _split_line(infile.readline().decode(encoding), delimiter)
+    units = []
+    if unit == 1:
+        units = _split_line(infile.readline().decode(encoding), delimiter)
+        units = (units + [""] * len(fieldnames))[:len(fieldnames)]
+    return fieldnames, units
+
+
+def read_blocks(infile, block_size=BLOCK_SIZE, limit=None):
+    """ Read the lines of a csv file by blocks
+
+    Parameters
+    ----------
+    infile : file
+        the csv file opened in binary mode
+    block_size : int
+        the approximate size in bytes of a block
+    limit : int
+        the position in bytes where the reading stops (None to read until the end of the file)
+
+    Returns
+    ------
+    generator(list(bytes))
+        the blocks of lines
+    """
+    while limit is None or infile.tell() < limit:
+        position = infile.tell()
+        lines = infile.readlines(block_size)
+        if not lines:
+            break
+        if limit is not None and position + sum(len(line) for line in lines) > limit:
+            lines = _cut_lines(lines, limit - position)
+        yield lines
+
+
+def read_line_blocks(infile, line_count):
+    """ Read the lines of a csv file by blocks of a fixed number of lines
+
+    Parameters
+    ----------
+    infile : file
+        the csv file opened in binary mode
+    line_count : int
+        the number of lines of a block
+
+    Returns
+    ------
+    generator(list(bytes))
+        the blocks of lines
+    """
+    while True:
+        lines = list(itertools.islice(infile, line_count))
+        if not lines:
+            break
+        yield lines
+
+
+def parse_block(lines, delimiter, field_count, encoding, usecols=None):
+    """ Convert a block of csv lines into columns
+
+    Decimal commas are converted into decimal points and non numeric values are replaced by nan. A field without any
+    numeric value is kept as text.
+
+    Parameters
+    ----------
+    lines : list(bytes)
+        the lines of the block
+    delimiter : str
+        the delimiter of the csv file
+    field_count : int
+        the number of fields in the csv file
+    encoding : str
+        the encoding of the csv file
+    usecols : list(int)
+        the indexes of the fields to convert (None to convert all the fields)
+
+    Returns
+    ------
+    list(numpy.ndarray)
+        the columns of the block (one float64 or str array per converted field)
+    """
+    text = b"".join(lines).decode(encoding)
+    decimal_comma = delimiter != ','
+    if usecols is None:
+        usecols = list(range(field_count))
+    if not text.strip():
+        return [np.empty(0) for _ in usecols]
+
+    try:
+        numeric_text = text.replace(',', '.') if decimal_comma else text
+        values = np.loadtxt(io.StringIO(numeric_text), dtype=np.float64, delimiter=delimiter, comments=None,
+                            quotechar='"', ndmin=2, usecols=None if usecols == list(range(field_count)) else usecols)
+        if values.shape[1] == len(usecols):
+            return list(np.ascontiguousarray(values.T))
+    except ValueError:
+        pass
+
+    logger.log(logging.DEBUG, "[CsvParser] Irregular block, converting columns one by one")
+    rows = [row for row in text.splitlines() if row]
+    tokens = delimiter.join(rows).split(delimiter)
+    if '"' in text or len(tokens) != len(rows) * field_count:
+        # quoted or ragged lines: let the csv module split the cells
+        tokens = []
+        for cells in csv.reader(rows, delimiter=delimiter):
+            tokens.extend((cells + [""] * field_count)[:field_count])
+
+    return [_to_column(tokens[index::field_count], decimal_comma) for index in usecols]
+
+
+def join_blocks(blocks):
+    """ Join the parsed blocks of a column
+
+    A text block is converted into numbers (nan for the text values) if another block of the column is numeric.
+
+    Parameters
+    ----------
+    blocks : list(numpy.ndarray)
+        the blocks of the column (float64 or str arrays)
+
+    Returns
+    ------
+    numpy.ndarray
+        the column
+    """
+    if not blocks:
+        return np.empty(0)
+    if any(block.dtype.kind == 'U' for block in blocks) and any(block.dtype.kind == 'f' and block.size > 0
+                                                                for block in blocks):
+        blocks = [_to_float_column(block.tolist()) if block.dtype.kind == 'U' else block for block in blocks]
+    elif any(block.dtype.kind == 'U' for block in blocks):
+        blocks = [block for block in blocks if block.dtype.kind == 'U']
+    return np.concatenate(blocks)
+
+
+def split_ranges(infile, start, end, count):
+    """ Split a part of a csv file into ranges of bytes aligned on the lines
+
+    Parameters
+    ----------
+    infile : file
+        the csv file opened in binary mode
+    start : int
+        the position in bytes of the first line to split
+    end : int
+        the position in bytes of the end of the part to split
+    count : int
+        the maximum number of ranges (ranges are at least MIN_RANGE_SIZE bytes)
+
+    Returns
+    ------
+    list(tuple(int, int))
+        the ranges (start, end) in the order of the file
+    """
+    count = max(1, min(count, (end - start) // MIN_RANGE_SIZE))
+    bounds = [start]
+    for index in range(1, count):
+        # a range starts at the beginning of the line following the split position
+        infile.seek(start + (end - start) * index // count - 1)
+        infile.readline()
+        bounds.append(min(max(infile.tell(), bounds[-1]), end))
+    bounds.append(end)
+    ranges = [(bounds[index], bounds[index + 1]) for index in range(count) if bounds[index] < bounds[index + 1]]
+    return ranges or [(start, end)]
+
+
+def parse_range(filename, start, end, delimiter, field_count, encoding, usecols=None):
+    """ Convert the lines of a range of bytes of a csv file into columns (can be run in another process)
+
+    Parameters
+    ----------
+    filename : str
+        the file name of the csv file
+    start : int
+        the position in bytes of the first line of the range
+    end : int
+        the position in bytes of the end of the range (None to parse until the end of the file)
+    delimiter : str
+        the delimiter of the csv file
+    field_count : int
+        the number of fields in the csv file
+    encoding : str
+        the encoding of the csv file
+    usecols : list(int)
+        the indexes of the fields to convert (None to convert all the fields)
+
+    Returns
+    ------
+    tuple(list(numpy.ndarray), int, bytes, bool, int)
+        the columns, the position of the end of the last complete line (None if there is no complete line), the last
+        complete line, true if the last line is incomplete and the position of the end of the parsed bytes
+    """
+    if usecols is None:
+        usecols = list(range(field_count))
+    blocks = [[] for _ in usecols]
+    offset = None
+    last_line = b""
+    partial = False
+    with open_csv_file(filename) as infile:
+        infile.seek(start)
+        position = start
+        for lines in read_blocks(infile, limit=end):
+            partial = not lines[-1].endswith(b'\n') and bool(lines[-1].strip())
+            complete_lines = lines[:-1] if partial else lines
+            position += sum(len(line) for line in lines)
+            if complete_lines:
+                offset = position - (len(lines[-1]) if partial else 0)
+                last_line = complete_lines[-1]
+            for column_blocks, column in zip(blocks, parse_block(lines, delimiter, field_count, encoding, usecols)):
+                column_blocks.append(column)
+
+    columns = [join_blocks(column_blocks) for column_blocks in blocks]
+    return columns, offset, last_line, partial, position
+
+
+def _cut_lines(lines, size):
+    """ Cut a block of lines to a size in bytes
+
+    Parameters
+    ----------
+    lines : list(bytes)
+        the lines of the block
+    size : int
+        the size in bytes of the cut block
+
+    Returns
+    ------
+    list(bytes)
+        the cut block of lines
+    """
+    cut_lines = []
+    for line in lines:
+        if size <= 0:
+            break
+        cut_lines.append(line[:size])
+        size -= len(line)
+    return cut_lines
+
+
+def _split_line(line, delimiter):
+    """ Split a csv line into cells
+
+    Parameters
+    ----------
+    line : str
+        the csv line
+    delimiter : str
+        the delimiter of the csv file
+
+    Returns
+    ------
+    list(str)
+        the cells of the line
+    """
+    return next(csv.reader([line.rstrip('\r\n')], delimiter=delimiter), [])
+
+
+def _to_column(tokens, decimal_comma):
+    """ Convert a list of strings into a float64 column (or a str column if no value is numeric)
+
+    Parameters
+    ----------
+    tokens : list(str)
+        the values of the column
+    decimal_comma : bool
+        the values use decimal commas
+
+    Returns
+    ------
+    numpy.ndarray
+        the column (non numeric values are replaced by nan in a numeric column)
+    """
+    column = _to_float_column([token.replace(',', '.') for token in tokens] if decimal_comma else tokens)
+    # the nan values written as text (nan, NaN, ...) are numeric values
+    if np.isnan(column).all() and any(token.strip() and token.strip().lower() not in _NAN_TOKENS
+                                      for token in tokens):
+        return np.array(tokens, dtype=str)
+    return column
+
+
+def _to_float_column(tokens):
+    """ Convert a list of strings into a float64 column
+
+    Parameters
+    ----------
+    tokens : list(str)
+        the values of the column
+
+    Returns
+    ------
+    numpy.ndarray
+        the column (non numeric values are replaced by nan)
+    """
+    try:
+        return np.fromiter(map(float, tokens), dtype=np.float64, count=len(tokens))
+    except ValueError:
+        return np.fromiter(map(_to_float, tokens), dtype=np.float64, count=len(tokens))
+
+
+def _to_float(token):
+    """ Convert a string into a float
+
+    Parameters
+    ----------
+    token : str
+        the value to convert
+
+    Returns
+    ------
+    float
+        the value (nan if the value is not numeric)
+    """
+    try:
+        return float(token)
+    except ValueError:
+        return np.nan
@@ -0,0 +1,287 @@
+#!/usr/bin/python
+# coding: utf-8
+
+""" This file contains the DataCache class """
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+
+import numpy as np
+
+from ranalysis.log.loghandler import logger
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".ranalysis", "cache")
+DEFAULT_CACHE_SIZE = 4 * 1024 ** 3
+
+
+class DataCache:
+    """ A class used to store parsed csv files as binary columns (one raw file per column)
+
+    An entry is keyed by the path, the size and the modification time of the csv file and by the reading options.
+    The categories of the text fields (dictionary encoded columns) are stored with the meta data of the entry.
+    An entry can hold only some columns of the file (the fields parsed in lazy mode), the other columns are added to
+    the entry when they are parsed. The columns of an entry are memory mapped when they are loaded. The least recently
+    used entries are removed when the size of the cache exceeds its maximum size.
+
+    Attributes
+    ----------
+    __cache_dir : str
+        the directory of the cache
+    __max_size : int
+        the maximum size of the cache (bytes)
+
+    Methods
+    -------
+    get_key(filename, options)
+        return the key of a csv file in the cache
+    get_data_options(options)
+        return the reading options changing the parsed data
+    load(filename, options)
+        load the columns of a csv file from the cache
+    store(filename, options, fieldnames, units, columns, read_state, categories)
+        store the columns of a csv file in the cache
+    evict()
+        remove the least recently used entries until the cache size is below its maximum size
+    clear()
+        remove all the entries of the cache
+    """
+
+    __META_FILE = "meta.json"
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_size=DEFAULT_CACHE_SIZE):
+        """ DataCache constructor
+
+        Parameters
+        ----------
+        cache_dir : str
+            the directory of the cache
+        max_size : int
+            the maximum size of the cache (bytes)
+        """
+        self.__cache_dir = cache_dir
+        self.__max_size = int(max_size)
+
+    def get_key(self, filename, options):
+        """ Get the key of a csv file in the cache
+
+        Parameters
+        ----------
+        filename : str
+            the file name of the csv file
+        options : dict
+            the reading options of the csv file
+
+        Returns
+        ------
+        str
+            the key of the csv file
+        """
+        stat = os.stat(filename)
+        key = [os.path.abspath(filename), stat.st_size, stat.st_mtime_ns] + self.get_data_options(options)
+        return hashlib.sha1(json.dumps(key).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def get_data_options(options):
+        """ Get the reading options changing the parsed data (the other options only change how it is read)
+
+        Parameters
+        ----------
+        options : dict
+            the reading options of the csv file
+
+        Returns
+        ------
+        list
+            the delimiter, the unit row, the encoding and the float32 options
+        """
+        return [options['delimiter'], int(options['unit']), options.get('encoding', ""), int(options.get('float32', 0))]
+
+    def load(self, filename, options):
+        """ Load the columns of a csv file from the cache
+
+        Parameters
+        ----------
+        filename : str
+            the file name of the csv file
+        options : dict
+            the reading options of the csv file
+
+        Returns
+        ------
+        tuple(list(str), list(str), list(numpy.ndarray), dict, dict)
+            the field names, the units, the (memory mapped) columns (None for a field which is not in the entry), the
+            read state and the categories of the text fields of the csv file, None if the file is not in the cache
+        """
+        entry_dir = os.path.join(self.__cache_dir, self.get_key(filename, options))
+        meta_file = os.path.join(entry_dir, self.__META_FILE)
+        try:
+            with open(meta_file, 'r') as infile:
+                meta = json.load(infile)
+            columns = []
+            for index, dtype in enumerate(meta['dtypes']):
+                if dtype is None:
+                    columns.append(None)
+                elif meta['rows'] > 0:
+                    columns.append(np.memmap(os.path.join(entry_dir, str(index) + ".bin"), dtype=np.dtype(dtype),
+                                             mode='r', shape=(meta['rows'],)))
+                else:
+                    columns.append(np.empty(0, dtype=np.dtype(dtype)))
+            # the modification time of the meta file is the last access time of the entry
+            os.utime(meta_file)
+        except (OSError, ValueError, KeyError):
+            return None
+
+        logger.log(logging.INFO, "[DataCache] Load " + filename + " from " + entry_dir)
+        categories = {header: np.array(values, dtype=str) for header, values in meta.get('categories', {}).items()}
+        return meta['fieldnames'], meta['units'], columns, meta.get('read_state', {}), categories
+
+    def store(self, filename, options, fieldnames, units, columns, read_state=None, categories=None):
+        """ Store the columns of a csv file in the cache
+
+        Parameters
+        ----------
+        filename : str
+            the file name of the csv file
+        options : dict
+            the reading options of the csv file
+        fieldnames : list(str)
+            the field names of the csv file
+        units : list(str)
+            the units of the csv file
+        columns : list(numpy.ndarray)
+            the columns of the csv file (None for a field which is not parsed, the parsed columns are added to the
+            entry if it already exists)
+        read_state : dict
+            the state of the read of the csv file (see DataManager)
+        categories : dict
+            the categories of the text fields ({field name : numpy array})
+        """
+        key = self.get_key(filename, options)
+        entry_dir = os.path.join(self.__cache_dir, key)
+        if os.path.isdir(entry_dir):
+            self.__add_columns(entry_dir, filename, fieldnames, columns, categories)
+            return
+
+        # the entry is written in a temporary directory then renamed to never expose a partial entry
+        temp_dir = os.path.join(self.__cache_dir, key + ".tmp" + str(os.getpid()))
+        try:
+            os.makedirs(temp_dir, exist_ok=True)
+            for index, column in enumerate(columns):
+                if column is not None:
+                    column.tofile(os.path.join(temp_dir, str(index) + ".bin"))
+            meta = {
+                'filename': os.path.abspath(filename),
+                'fieldnames': fieldnames,
+                'units': units,
+                'dtypes': [None if column is None else column.dtype.str for column in columns],
+                'rows': next((len(column) for column in columns if column is not None), 0),
+                'read_state': read_state or {},
+                'categories': {header: values.tolist() for header, values in (categories or {}).items()}
+            }
+            with open(os.path.join(temp_dir, self.__META_FILE), 'w') as outfile:
+                json.dump(meta, outfile)
+            os.rename(temp_dir, entry_dir)
+            logger.log(logging.INFO, "[DataCache] Store " + filename + " in " + entry_dir)
+        except OSError as error:
+            logger.log(logging.ERROR, "[DataCache] Cannot store " + filename + " in the cache: " + str(error))
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            return
+
+        self.evict()
+
+    def evict(self):
+        """ Remove the least recently used entries until the cache size is below its maximum size """
+        entries = []
+        for entry in self.__list_entries():
+            meta_file = os.path.join(entry, self.__META_FILE)
+            try:
+                size = sum(os.path.getsize(os.path.join(entry, name)) for name in os.listdir(entry))
+                entries.append((os.path.getmtime(meta_file), size, entry))
+            except OSError:
+                continue
+
+        cache_size = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if cache_size <= self.__max_size:
+                break
+            logger.log(logging.INFO, "[DataCache] Evict " + entry)
+            try:
+                shutil.rmtree(entry)
+                cache_size -= size
+            except OSError:
+                # the entry may still be memory mapped (Windows)
+                logger.log(logging.ERROR, "[DataCache] Cannot evict " + entry)
+
+    def clear(self):
+        """ Remove all the entries of the cache """
+        logger.log(logging.INFO, "[DataCache] Clear cache " + self.__cache_dir)
+        for entry in self.__list_entries():
+            shutil.rmtree(entry, ignore_errors=True)
+
+    def __add_columns(self, entry_dir, filename, fieldnames, columns, categories):
+        """ Add the columns which are not in an entry yet
+
+        Parameters
+        ----------
+        entry_dir : str
+            the directory of the entry
+        filename : str
+            the file name of the csv file
+        fieldnames : list(str)
+            the field names of the csv file
+        columns : list(numpy.ndarray)
+            the columns of the csv file (None for a field which is not parsed)
+        categories : dict
+            the categories of the text fields ({field name : numpy array})
+        """
+        meta_file = os.path.join(entry_dir, self.__META_FILE)
+        try:
+            with open(meta_file, 'r') as infile:
+                meta = json.load(infile)
+        except (OSError, ValueError):
+            return
+        if meta.get('fieldnames') != fieldnames:
+            return
+        added = [index for index, column in enumerate(columns)
+                 if column is not None and meta['dtypes'][index] is None and len(column) == meta['rows']]
+        if not added:
+            return
+
+        # the files are written then renamed to never expose a partial column or meta data (a column added by another
+        # process at the same time may be missing from the meta data: it is parsed again the next time)
+        suffix = ".tmp" + str(os.getpid())
+        try:
+            for index in added:
+                column_file = os.path.join(entry_dir, str(index) + ".bin")
+                columns[index].tofile(column_file + suffix)
+                os.replace(column_file + suffix, column_file)
+                meta['dtypes'][index] = columns[index].dtype.str
+                if fieldnames[index] in (categories or {}):
+                    meta['categories'][fieldnames[index]] = categories[fieldnames[index]].tolist()
+            with open(meta_file + suffix, 'w') as outfile:
+                json.dump(meta, outfile)
+            os.replace(meta_file + suffix, meta_file)
+            logger.log(logging.INFO, "[DataCache] Add " + str(len(added)) + " columns of " + filename + " in "
+                       + entry_dir)
+        except OSError as error:
+            logger.log(logging.ERROR, "[DataCache] Cannot add the columns of " + filename + " in the cache: "
+                       + str(error))
+            return
+
+        self.evict()
+
+    def __list_entries(self):
+        """ List the entry directories of the cache
+
+        Returns
+        ------
+        list(str)
+            the entry directories
+        """
+        if not os.path.isdir(self.__cache_dir):
+            return []
+        return [os.path.join(self.__cache_dir, name) for name in os.listdir(self.__cache_dir)
+                if ".tmp" not in name and os.path.isdir(os.path.join(self.__cache_dir, name))]
@@ -3,11 +3,25 @@
 
 """ This file contains the DataManager class """
 
-import csv
+import locale
 import logging
-
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ranalysis.data.columnfile import ColumnFile, is_column_file, write_column_file
+from ranalysis.data.columntypes import infer_column, decode_column, append_column
+from ranalysis.data.csvparser import detect_compression, open_csv_file, read_header, read_line_blocks, parse_block, \
+    join_blocks, split_ranges, parse_range
+from ranalysis.data.datacache import DataCache, DEFAULT_CACHE_DIR, DEFAULT_CACHE_SIZE
+from ranalysis.data.datarows import DataRows
+from ranalysis.data.rowfilter import RowFilter
+from ranalysis.data.zonemap import build_zone_map, zone_map_from_blocks, select_range, select_range_from_blocks
 from ranalysis.log.loghandler import logger
 
+DEFAULT_CHUNK_SIZE = 1000000
+
 
 class DataManager:
     """ A class used to manage data from a csv file
@@ -17,36 +31,67 @@ class DataManager:
         __filename : str
             the path to the data file
         __reading_options : dict
-            the reding options of the csv file
+            the reding options of the csv file ('delimiter', 'unit', 'clear', 'encoding', 'cache', 'cache_dir',
+            'cache_size')
         __fieldnames : list(str)
             list of fieldnames (name of the data variables)
         __data_unit : list(str)
             list of data unit
         __data : dict
-            the read csv data
+            the read csv data ({field name : numpy array}, one contiguous array per column, its type is inferred: bool,
+            int32, int64, float32 (option 'float32') or float64, codes of a dictionary encoded column for text)
+        __categories : dict
+            the categories of the text fields ({field name : numpy array of the distinct values})
+        __read_state : dict
+            the state of the last read of the csv file (size, modification time, offset of the end of the last
+            complete line, ...) used to only read the appended lines when refreshing the data
+        __lazy_fields : list(str)
+            the field names which are not parsed yet (lazy mode)
+        __column_file : ColumnFile
+            the opened column file (None if the data file is a csv file), its columns are read when they are asked
+        __zone_maps : dict
+            the zone maps of the fields ({field name : zone map}, min/max of the blocks of rows and sortedness) built
+            the first time a range of values of a field is selected (read from the column file for its fields)
+        __masks : dict
+            the masks of the filter expressions ({expression : bool array}) kept until the data changes
+
+        The reading option 'workers' sets the number of processes used to parse the csv file (by ranges of lines).
+        Compressed csv files (gzip, bz2 or xz, detected from their first bytes) are decompressed as a stream.
 
         Methods
         -------
         read_csv_file(filename, options)
             put the record in the log queue
-        dict_to_list_tuple()
-            convert dictionary values into list of tuple
+        read_csv_chunks(filename, options, chunk_size)
+            read a csv file by chunks of rows (streaming mode)
+        read_column_file(filename, options)
+            open a column file (its columns are read when they are asked)
+        export_column_file(filename, compression)
+            export the data in a column file
+        load_fields(fieldnames)
+            parse the fields which are not parsed yet (lazy mode)
         get_data_tuple()
-            get the data as a list of tuple
+            get the data as a lazy list of tuple (rows)
         get_field_names()
             get list of data field names
         get_unit_from_field_name(field_name)
             get unit from data field name
         get_data_from_field_name(field_name)
             get data from data field name
+        get_categories_from_field_name(field_name)
+            get the categories of a text field
+        get_labels_from_field_name(field_name)
+            get data from data field name (text values for a text field)
+        select_range(field_name, lo, hi)
+            get the rows whose values of a field are in a range
+        filter_rows(expression)
+            get the mask of the rows matching a filter expression
         refresh_data()
-            refresh the data
+            refresh the data (only the lines appended to the csv file are read)
         clear_data()
             clear the data
         reset_manager()
             reset the data manager
-        __copy_and_adapt_data(data)
-            correct and return a list of data
         """
 
     def __init__(self):
@@ -57,7 +102,12 @@ class DataManager:
         self.__fieldnames = []
         self.__data_unit = []
         self.__data = {}
-        self.__data_values_as_list_tuple = []
+        self.__categories = {}
+        self.__read_state = {}
+        self.__lazy_fields = []
+        self.__column_file = None
+        self.__zone_maps = {}
+        self.__masks = {}
 
     def manager_have_data(self):
         """ Does the manager contains data read from csv file ?
@@ -67,7 +117,7 @@ class DataManager:
         bool
             true if manager has data, false otherwise
         """
-        return bool(self.__data)
+        return bool(self.__data) or bool(self.__lazy_fields)
 
     def read_csv_file(self, filename, options):
         """ Read a csv file from its file name and options and fill data in dictionary
@@ -77,41 +127,202 @@ class DataManager:
         filename : str
             the file name of the csv file
         options : dict
-            the reading options of the csv file
+            the reading options of the csv file (with 'lazy', only the header is read and each field is parsed the
+            first time its data is asked, with 'cache' each parsed field is stored in the cache)
         """
         self.__filename = filename
         self.__reading_options = options
         logger.log(logging.INFO, "[DataManager] " + self.__filename + " " + str(self.__reading_options))
 
-        if self.__reading_options['clear']:
+        if self.__reading_options.get('clear', 0):
             self.clear_data()
 
-        counter = 0
-        with open(self.__filename, 'rU') as infile:
-            # read the file as a dictionary for each row ({header : value})
-            reader = csv.DictReader(infile, delimiter=self.__reading_options['delimiter'])
-            for row in reader:
-                for header, value in row.items():
-                    if header not in self.__fieldnames:
-                        self.__fieldnames.append(header)
-
-                    if self.__reading_options['unit'] == 1 and counter == 0:
-                        self.__data_unit.insert(self.__fieldnames.index(header), value)
-
-                    else:
-                        try:
-                            value_temp = float(value.replace(',', '.'))
-                            try:
-                                self.__data[header].append(value_temp)
-                            except KeyError:
-                                logger.log(logging.INFO, "[DataManager] Key error:" + header + " " + value)
-                                self.__data[header] = [value]
-                        except ValueError:
-                            print("test")
-
-                counter += 1
-
-        self.dict_to_list_tuple()
+        if is_column_file(self.__filename):
+            self.read_column_file(self.__filename, self.__reading_options)
+            return
+
+        cache = None
+        if self.__reading_options.get('cache', 0):
+            cache = DataCache(self.__reading_options.get('cache_dir', DEFAULT_CACHE_DIR),
+                              self.__reading_options.get('cache_size', DEFAULT_CACHE_SIZE))
+            cached = cache.load(self.__filename, self.__reading_options)
+            if cached is not None and all(column is not None for column in cached[2]):
+                fieldnames, units, columns, self.__read_state, categories = cached
+                self.__append_columns(fieldnames, units, columns, categories)
+                return
+            if cached is not None and self.__reading_options.get('lazy', 0) and not self.manager_have_data():
+                # the fields which are not in the cache yet are parsed the first time their data is asked
+                fieldnames, units, columns, self.__read_state, categories = cached
+                self.__append_header(fieldnames, units)
+                self.__lazy_fields = [header for header, column in zip(fieldnames, columns) if column is None]
+                self.__append_columns([header for header, column in zip(fieldnames, columns) if column is not None],
+                                      [], [column for column in columns if column is not None], categories)
+                return
+
+        if self.__reading_options.get('lazy', 0) and not self.manager_have_data():
+            delimiter = self.__reading_options['delimiter']
+            with open_csv_file(self.__filename) as infile:
+                fieldnames, units = read_header(infile, delimiter, self.__reading_options['unit'], self.__encoding())
+            self.__append_header(fieldnames, units)
+            self.__lazy_fields = list(fieldnames)
+            self.__read_state = {'fieldnames': fieldnames}
+            return
+
+        fieldnames, units, columns, self.__read_state = self.__parse_csv_file()
+        columns, categories = self.__infer_columns(fieldnames, columns)
+        if cache is not None:
+            cache.store(self.__filename, self.__reading_options, fieldnames, units, columns, self.__read_state,
+                        categories)
+        self.__append_columns(fieldnames, units, columns, categories)
+
+    def read_csv_chunks(self, filename, options, chunk_size=DEFAULT_CHUNK_SIZE):
+        """ Read a csv file by chunks of rows (streaming mode)
+
+        Only the field names and the units are kept in the manager (its data is cleared), so the memory used depends on
+        the chunk size and not on the size of the file.
+
+        Parameters
+        ----------
+        filename : str
+            the file name of the csv file
+        options : dict
+            the reading options of the csv file
+        chunk_size : int
+            the number of rows of a chunk
+
+        Returns
+        ------
+        generator(dict)
+            the chunks ({field name : numpy array}, float64 arrays or str arrays for the text fields, arrays of the
+            inferred types if the file is in the cache)
+        """
+        self.__filename = filename
+        self.__reading_options = options
+        logger.log(logging.INFO, "[DataManager] Stream " + self.__filename + " " + str(self.__reading_options))
+        self.clear_data()
+
+        if is_column_file(self.__filename):
+            # the blocks of the column file are the chunks, the text fields are decoded as in the parsed chunks
+            column_file = ColumnFile(self.__filename)
+            fieldnames = column_file.get_field_names()
+            self.__append_header(fieldnames, column_file.get_units())
+            categories = {header: column_file.get_categories(header) for header in fieldnames
+                          if column_file.get_categories(header) is not None}
+            for index in range(len(column_file.get_blocks(fieldnames[0])) if fieldnames else 0):
+                yield {header: decode_column(column_file.read_block(header, index), categories[header])
+                       if header in categories else column_file.read_block(header, index) for header in fieldnames}
+            return
+
+        if self.__reading_options.get('cache', 0):
+            cache = DataCache(self.__reading_options.get('cache_dir', DEFAULT_CACHE_DIR),
+                              self.__reading_options.get('cache_size', DEFAULT_CACHE_SIZE))
+            cached = cache.load(self.__filename, self.__reading_options)
+            if cached is not None and all(column is not None for column in cached[2]):
+                fieldnames, units, columns, _, categories = cached
+                self.__append_header(fieldnames, units)
+                row_count = len(columns[0]) if columns else 0
+                for start in range(0, row_count, chunk_size):
+                    # the text fields are decoded to give the same chunks as the parsed ones
+                    yield {header: decode_column(column[start:start + chunk_size], categories[header])
+                           if header in categories else column[start:start + chunk_size]
+                           for header, column in zip(fieldnames, columns)}
+                return
+
+        delimiter = self.__reading_options['delimiter']
+        encoding = self.__encoding()
+        with open_csv_file(self.__filename) as infile:
+            fieldnames, units = read_header(infile, delimiter, self.__reading_options['unit'], encoding)
+            self.__append_header(fieldnames, units)
+            for lines in read_line_blocks(infile, chunk_size):
+                columns = parse_block(lines, delimiter, len(fieldnames), encoding)
+                # copy the columns so that a kept column does not keep the whole parsed block in memory
+                yield {header: column.copy() for header, column in zip(fieldnames, columns)}
+
+    def read_column_file(self, filename, options=None):
+        """ Open a column file: only its meta data is read, each column is read the first time its data is asked
+
+        Parameters
+        ----------
+        filename : str
+            the file name of the column file
+        options : dict
+            the reading options ('clear')
+        """
+        self.__filename = filename
+        self.__reading_options = options if options is not None else {}
+        logger.log(logging.INFO, "[DataManager] Open column file " + self.__filename)
+
+        if self.__reading_options.get('clear', 0):
+            self.clear_data()
+
+        column_file = ColumnFile(self.__filename)
+        stat = os.stat(self.__filename)
+        fieldnames = column_file.get_field_names()
+        if self.manager_have_data():
+            # the columns are appended to the existing data
+            columns = [column_file.read_column(header) for header in fieldnames]
+            categories = {header: column_file.get_categories(header) for header in fieldnames
+                          if column_file.get_categories(header) is not None}
+            self.__append_columns(fieldnames, column_file.get_units(), columns, categories)
+        else:
+            self.__column_file = column_file
+            self.__append_header(fieldnames, column_file.get_units())
+            self.__lazy_fields = list(fieldnames)
+            # the zone maps are the statistics of the blocks of the column file
+            for header in fieldnames:
+                self.__zone_maps[header] = zone_map_from_blocks(column_file.get_blocks(header),
+                                                                column_file.get_block_rows(),
+                                                                column_file.get_sortedness(header))
+        self.__read_state = {'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'fieldnames': fieldnames}
+
+    def export_column_file(self, filename, compression=None):
+        """ Export the data in a column file
+
+        Parameters
+        ----------
+        filename : str
+            the file name of the column file
+        compression : str
+            the compression of the blocks of the columns ('zlib', 'lzma' or None)
+        """
+        logger.log(logging.INFO, "[DataManager] Export data in " + filename)
+        if self.__lazy_fields:
+            self.load_fields(self.__lazy_fields)
+        fieldnames = [header for header in self.__fieldnames if header in self.__data]
+        units = [self.get_unit_from_field_name(header) for header in fieldnames]
+        write_column_file(filename, fieldnames, units, [self.__data[header] for header in fieldnames],
+                          self.__categories, compression)
+
+    def load_fields(self, fieldnames):
+        """ Parse the fields which are not parsed yet in one pass over the csv file (lazy mode) or read them from the
+        column file
+
+        Parameters
+        ----------
+        fieldnames : list(str)
+            the field names to parse
+        """
+        fields = [header for header in self.__lazy_fields if header in fieldnames]
+        if fields and self.__column_file is not None:
+            logger.log(logging.INFO, "[DataManager] Read columns " + str(fields))
+            self.__lazy_fields = [header for header in self.__lazy_fields if header not in fields]
+            columns = [self.__column_file.read_column(header) for header in fields]
+            categories = {header: self.__column_file.get_categories(header) for header in fields
+                          if self.__column_file.get_categories(header) is not None}
+            self.__append_columns(fields, [], columns, categories)
+        elif fields:
+            logger.log(logging.INFO, "[DataManager] Parse fields " + str(fields))
+            # the fields are parsed up to the end of the first parse to keep the same number of rows in all fields
+            state = self.__read_state if 'end' in self.__read_state else None
+            usecols = [self.__read_state['fieldnames'].index(header) for header in fields]
+            fields, _, columns, read_state = self.__parse_csv_file(None, usecols, state and state['end'])
+            if state is None:
+                self.__read_state = read_state
+            self.__lazy_fields = [header for header in self.__lazy_fields if header not in fields]
+            columns, categories = self.__infer_columns(fields, columns)
+            self.__append_columns(fields, [], columns, categories)
+            if self.__reading_options.get('cache', 0):
+                self.__store_fields(fields, columns, categories)
 
     def add_data(self):
         # TODO faire l'ajout de données dans la structure du DataManager !!
@@ -119,34 +330,23 @@ class DataManager:
 
         pass
 
-    def dict_to_list_tuple(self):
-        """ Convert dictionary values into list of tuple """
-        self.__data_values_as_list_tuple = []
-        dict_values_to_list = list(self.__data.values())
-
-        # Test len of each list (must be equal)
-        it = iter(dict_values_to_list)
-        the_len = len(next(it))
-        if not all(len(iter_list) == the_len for iter_list in it):
-            logger.log(logging.ERROR, "[DataManager] Not all lists have same length")
-        else:
-            # Convert to tuple
-            logger.log(logging.INFO, "[DataManager] Converting dict data to list of tuple")
-            for i in range(the_len):
-                temp_list = []
-                for j in dict_values_to_list:
-                    temp_list.append(j[i])
-                self.__data_values_as_list_tuple.append(tuple(temp_list))
-
     def get_data_tuple(self):
         """ Get the data as a list of tuple
 
         Returns
         ------
-        list(tuple)
-            the data values as a list of tuple
+        DataRows
+            the data values as a lazy list of tuple (the rows are built when they are accessed)
         """
-        return self.__data_values_as_list_tuple
+        if self.__lazy_fields:
+            self.load_fields(self.__lazy_fields)
+
+        headers = [header for header in self.__fieldnames if header in self.__data]
+        columns = [self.__data[header] for header in headers]
+        if any(len(column) != len(columns[0]) for column in columns):
+            logger.log(logging.ERROR, "[DataManager] Not all lists have same length")
+            return DataRows([])
+        return DataRows(columns, [self.__categories.get(header) for header in headers])
 
     def get_field_names(self):
         """ Get the list of data field names
@@ -172,10 +372,7 @@ class DataManager:
             the unit of data field name
         """
         if field_name in self.__fieldnames:
-            if self.__reading_options['unit'] == 1:
-                return self.__data_unit[self.__fieldnames.index(field_name)]
-            else:
-                return ""
+            return self.__data_unit[self.__fieldnames.index(field_name)]
         else:
             logger.log(logging.ERROR, "[DataManager] Error field name does not exist (get unit)")
             return ""
@@ -190,57 +387,400 @@ class DataManager:
 
         Returns
         ------
-        list(float, int, ...)
-            the data of data field name
+        numpy.ndarray
+            a read-only view on the data of data field name
         """
+        if field_name in self.__lazy_fields:
+            self.load_fields([field_name])
+
         if field_name in self.__data:
-            return copy_and_adapt_data(self.__data[field_name])
+            return read_only_view(self.__data[field_name])
         else:
             logger.log(logging.ERROR, "[DataManager] Error field name does not exist (get data)")
-            return list()
+            return read_only_view(np.empty(0))
+
+    def select_range(self, field_name, lo, hi):
+        """ Get the rows whose values of a field are in a range (lo <= value <= hi)
+
+        The blocks of rows which cannot contain values of the range are skipped (zone map) and the rows are found by
+        binary search if the field is sorted.
+
+        Parameters
+        ----------
+        field_name : str
+            the data field name
+        lo : float
+            the lower bound of the range
+        hi : float
+            the upper bound of the range
+
+        Returns
+        ------
+        slice or numpy.ndarray
+            a slice of the rows if the field is sorted, the indexes of the rows otherwise (to index the data of the
+            fields)
+        """
+        if field_name in self.__lazy_fields and self.__column_file is not None:
+            # only the blocks of the column file which can contain values of the range are read
+            rows = select_range_from_blocks(lambda index: self.__column_file.read_block(field_name, index),
+                                            self.__zone_maps[field_name], lo, hi)
+        else:
+            column = self.get_data_from_field_name(field_name)
+            if field_name not in self.__zone_maps:
+                self.__zone_maps[field_name] = build_zone_map(column)
+            rows = select_range(column, self.__zone_maps[field_name], lo, hi)
+        logger.log(logging.INFO, "[DataManager] Select range [" + str(lo) + ", " + str(hi) + "] of " + field_name)
+        return rows
+
+    def filter_rows(self, expression):
+        """ Get the mask of the rows matching a filter expression (ex: phase == 2 and P > 1e5)
+
+        The expression is evaluated on the whole columns (see RowFilter) and its mask is kept until the data changes.
+
+        Parameters
+        ----------
+        expression : str
+            the filter expression
+
+        Returns
+        ------
+        numpy.ndarray
+            a read-only bool array (True for the rows matching the expression)
+
+        Raises
+        ------
+        ValueError
+            if the expression is not valid
+        """
+        if expression not in self.__masks:
+            row_filter = RowFilter(expression, self.__fieldnames)
+            self.load_fields([header for header in row_filter.get_field_names() if header in self.__lazy_fields])
+            row_count = len(next(iter(self.__data.values()))) if self.__data else 0
+            mask = row_filter.evaluate(self.get_data_from_field_name, self.__categories.get, row_count)
+            self.__masks[expression] = mask
+            logger.log(logging.INFO, "[DataManager] Filter rows with " + expression + " (" + str(np.count_nonzero(mask))
+                       + " rows)")
+        return read_only_view(self.__masks[expression])
+
+    def get_categories_from_field_name(self, field_name):
+        """ Get the categories of a text field (the data of the field are the indexes of its values in the categories)
+
+        Parameters
+        ----------
+        field_name : str
+            the data field name
+
+        Returns
+        ------
+        list(str)
+            the distinct values of the text field (None if the field is not a text field)
+        """
+        if field_name in self.__lazy_fields:
+            self.load_fields([field_name])
+
+        if field_name in self.__categories:
+            return self.__categories[field_name].tolist()
+        return None
+
+    def get_labels_from_field_name(self, field_name):
+        """ Get data from data field name, the text values are decoded for a text field (to use them as labels)
+
+        Parameters
+        ----------
+        field_name : str
+            the data field name
+
+        Returns
+        ------
+        numpy.ndarray
+            the data of data field name (str array for a text field)
+        """
+        data = self.get_data_from_field_name(field_name)
+        if field_name in self.__categories:
+            return decode_column(data, self.__categories[field_name])
+        return data
 
     def clear_data(self):
         """ Clear data """
         logger.log(logging.INFO, "[DataManager] Clear data")
         self.__fieldnames = []
+        self.__data_unit = []
         self.__data = {}
-        self.__data_values_as_list_tuple = []
+        self.__categories = {}
+        self.__read_state = {}
+        self.__lazy_fields = []
+        self.__column_file = None
+        self.__zone_maps = {}
+        self.__masks = {}
 
     def refresh_data(self):
-        """ Refresh data from the same data file """
+        """ Refresh data from the same data file
+
+        Only the lines appended since the last read are parsed. Nothing is done if the size and the modification time
+        of the file are unchanged and the file is fully read again if it was truncated or rewritten (or if it is
+        compressed).
+        """
         if self.__filename != "":
             logger.log(logging.INFO, "[DataManager] Refresh data")
-            self.clear_data()
-            self.read_csv_file(self.__filename, self.__reading_options)
+            stat = os.stat(self.__filename)
+            state = self.__read_state
+            if 'size' not in state and self.__lazy_fields:
+                logger.log(logging.INFO, "[DataManager] No field parsed yet")
+                self.clear_data()
+                self.read_csv_file(self.__filename, self.__reading_options)
+            elif state and stat.st_size == state['size'] and stat.st_mtime_ns == state['mtime']:
+                logger.log(logging.INFO, "[DataManager] Data file is unchanged")
+            elif 'offset' in state and not state.get('compression') and stat.st_size >= state['offset'] \
+                    and self.__same_file_start(state):
+                logger.log(logging.INFO, "[DataManager] Read lines appended from byte " + str(state['offset']))
+                self.__masks = {}
+                if state['partial']:
+                    # the last line was incomplete: it is read again
+                    for header in state['fieldnames']:
+                        if header in self.__data:
+                            self.__data[header] = self.__data[header][:-1]
+                usecols = [index for index, header in enumerate(state['fieldnames'])
+                           if header not in self.__lazy_fields]
+                fieldnames, _, columns, self.__read_state = self.__parse_csv_file(state, usecols)
+                columns, categories = self.__infer_columns(fieldnames, columns)
+                self.__append_columns(fieldnames, [], columns, categories)
+            else:
+                self.clear_data()
+                self.read_csv_file(self.__filename, self.__reading_options)
         else:
             logger.log(logging.INFO, "[DataManager] Cannot refresh data because no data file is defined")
 
+    def __same_file_start(self, state):
+        """ Check that the data file still starts with the lines read previously
+
+        Parameters
+        ----------
+        state : dict
+            the state of the last read of the data file
+
+        Returns
+        ------
+        bool
+            true if the last read line is unchanged, false if the file was rewritten
+        """
+        signature = bytes.fromhex(state['signature'])
+        with open(self.__filename, 'rb') as infile:
+            infile.seek(state['offset'] - len(signature))
+            return infile.read(len(signature)) == signature
+
+    def __parse_csv_file(self, state=None, usecols=None, limit=None):
+        """ Parse the csv file by blocks
+
+        Parameters
+        ----------
+        state : dict
+            the state of the last read of the csv file to only parse the appended lines (None to parse the whole file)
+        usecols : list(int)
+            the indexes of the fields to parse (None to parse all the fields)
+        limit : int
+            the position in bytes where the parsing stops (None to parse until the end of the file)
+
+        Returns
+        ------
+        tuple(list(str), list(str), list(numpy.ndarray), dict)
+            the field names, the units, the columns of the parsed fields and the state of the read
+        """
+        delimiter = self.__reading_options['delimiter']
+        encoding = self.__encoding()
+        stat = os.stat(self.__filename)
+        compression = detect_compression(self.__filename)
+        with open_csv_file(self.__filename) as infile:
+            if state is None:
+                file_fieldnames, units = read_header(infile, delimiter, self.__reading_options['unit'], encoding)
+                offset = infile.tell()
+                infile.seek(0)
+                signature = infile.read(offset)
+            else:
+                file_fieldnames, units = state['fieldnames'], []
+                offset = state['offset']
+                infile.seek(offset)
+                signature = bytes.fromhex(state['signature'])
+
+            if usecols is None:
+                usecols = list(range(len(file_fieldnames)))
+            fieldnames = [file_fieldnames[index] for index in usecols]
+            units = [units[index] for index in usecols] if units else units
+
+            workers = int(self.__reading_options.get('workers', 1))
+            ranges = [(offset, limit)]
+            if workers > 1 and compression is not None:
+                # a compressed stream cannot be read from the middle: each range would decompress the file again
+                logger.log(logging.INFO, "[DataManager] Compressed file (" + compression + "), parsed in one process")
+            elif workers > 1:
+                ranges = split_ranges(infile, offset, stat.st_size if limit is None else limit, workers)
+
+        arguments = [(self.__filename, start, end, delimiter, len(file_fieldnames), encoding, usecols)
+                     for start, end in ranges]
+        if len(ranges) > 1:
+            logger.log(logging.INFO, "[DataManager] Parse " + str(len(ranges)) + " ranges in parallel")
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(parse_range, *zip(*arguments)))
+        else:
+            results = [parse_range(*range_arguments) for range_arguments in arguments]
+
+        # join the ranges in the order of the file
+        partial = False
+        end = offset
+        for _, range_offset, last_line, partial, end in results:
+            if range_offset is not None:
+                offset = range_offset
+                signature = last_line
+        columns = [join_blocks([result[0][index] for result in results]) for index in range(len(usecols))]
+
+        state = {
+            'size': stat.st_size,
+            'mtime': stat.st_mtime_ns,
+            'offset': offset,
+            'end': end,
+            'partial': partial,
+            'fieldnames': file_fieldnames,
+            'signature': signature.hex(),
+            'compression': compression
+        }
+        return fieldnames, units, columns, state
+
+    def __store_fields(self, fieldnames, columns, categories):
+        """ Store the columns of fields parsed in lazy mode in the cache (added to the entry of the csv file)
+
+        Parameters
+        ----------
+        fieldnames : list(str)
+            the field names of the parsed columns
+        columns : list(numpy.ndarray)
+            the parsed columns
+        categories : dict
+            the categories of the text fields ({field name : numpy array})
+        """
+        stat = os.stat(self.__filename)
+        if stat.st_size != self.__read_state.get('size') or stat.st_mtime_ns != self.__read_state.get('mtime'):
+            # the columns do not match the current content of the file
+            return
+        file_fieldnames = self.__read_state['fieldnames']
+        file_columns = [columns[fieldnames.index(header)] if header in fieldnames else None
+                        for header in file_fieldnames]
+        cache = DataCache(self.__reading_options.get('cache_dir', DEFAULT_CACHE_DIR),
+                          self.__reading_options.get('cache_size', DEFAULT_CACHE_SIZE))
+        cache.store(self.__filename, self.__reading_options, file_fieldnames,
+                    [self.get_unit_from_field_name(header) for header in file_fieldnames], file_columns,
+                    self.__read_state, categories)
+
+    def __encoding(self):
+        """ Get the encoding of the csv file
+
+        Returns
+        ------
+        str
+            the encoding option or the preferred encoding of the system
+        """
+        return self.__reading_options.get('encoding', locale.getpreferredencoding(False))
+
+    def __append_header(self, fieldnames, units):
+        """ Append the new field names and their units
+
+        Parameters
+        ----------
+        fieldnames : list(str)
+            the field names
+        units : list(str)
+            the units (empty if the file has no unit)
+        """
+        for index, header in enumerate(fieldnames):
+            if header not in self.__fieldnames:
+                self.__fieldnames.append(header)
+                self.__data_unit.append(units[index] if units else "")
+
+    def __infer_columns(self, fieldnames, columns):
+        """ Convert the parsed columns into their most compact type
+
+        Parameters
+        ----------
+        fieldnames : list(str)
+            the field names of the parsed columns
+        columns : list(numpy.ndarray)
+            the parsed columns (float64 or str arrays)
+
+        Returns
+        ------
+        tuple(list(numpy.ndarray), dict)
+            the converted columns and the categories of the text fields ({field name : numpy array})
+        """
+        float32 = bool(self.__reading_options.get('float32', 0))
+        typed_columns = []
+        categories = {}
+        for header, column in zip(fieldnames, columns):
+            column, column_categories = infer_column(column, float32)
+            typed_columns.append(column)
+            if column_categories is not None:
+                categories[header] = column_categories
+        return typed_columns, categories
+
+    def __append_columns(self, fieldnames, units, columns, categories=None):
+        """ Append read columns to the data (new fields are added, existing fields are extended)
+
+        Parameters
+        ----------
+        fieldnames : list(str)
+            the field names of the read columns
+        units : list(str)
+            the units of the read columns (empty if the file has no unit)
+        columns : list(numpy.ndarray)
+            the read columns
+        categories : dict
+            the categories of the read text fields ({field name : numpy array})
+        """
+        categories = categories or {}
+        self.__append_header(fieldnames, units)
+        for header, column in zip(fieldnames, columns):
+            if header in self.__data:
+                # the type of the existing field is kept (or inferred again) and the categories are merged
+                self.__data[header], header_categories = append_column(
+                    self.__data[header], self.__categories.get(header), column, categories.get(header),
+                    bool(self.__reading_options.get('float32', 0)))
+                if header_categories is None:
+                    self.__categories.pop(header, None)
+                else:
+                    self.__categories[header] = header_categories
+                self.__zone_maps.pop(header, None)
+                self.__masks = {}
+            else:
+                self.__data[header] = column
+                if header in categories:
+                    self.__categories[header] = np.asarray(categories[header], dtype=str)
+
     def reset_manager(self):
         """ Reset the data manager """
         logger.log(logging.INFO, "[DataManager] Reset data manager")
         self.__filename = ""
         self.__reading_options = {}
         self.__fieldnames = []
+        self.__data_unit = []
         self.__data = {}
-        self.__data_values_as_list_tuple = []
+        self.__categories = {}
+        self.__read_state = {}
+        self.__lazy_fields = []
+        self.__column_file = None
+        self.__zone_maps = {}
+        self.__masks = {}
 
 
-def copy_and_adapt_data(data):
-    """ Correct and return a list of data
+def read_only_view(data):
+    """ Return a read-only view on a column (no copy)
 
     Parameters
     ----------
-    data : list(float, int, ...)
-        the list of data
+    data : numpy.ndarray
+        the column data
 
     Returns
     ------
-    list(float, int, ...)
-        the copied and corrected data
+    numpy.ndarray
+        the read-only view on the column data
     """
-    try:
-        data_temp = list(map(float, data))
-        return data_temp
-    except ValueError:
-        logger.log(logging.ERROR, "[DataManager] Error when converting data (string to number)")
-        return list()
+    view = data.view()
+    view.flags.writeable = False
+    return view
@@ -0,0 +1,106 @@
+#!/usr/bin/python
+# coding: utf-8
+
+""" This file contains the DataRows class """
+
+
+class DataRows:
+    """ A class used to access the rows of the data columns without copying them
+
+    The rows are built as tuples only when they are accessed (indexing, slicing or iterating).
+
+    Attributes
+    ----------
+    __columns : list(numpy.ndarray)
+        the data columns (same length)
+    __categories : list(numpy.ndarray)
+        the categories of the dictionary encoded columns (None for the other columns), the text values are in the rows
+
+    Methods
+    -------
+    __len__()
+        return the number of rows
+    __getitem__(index)
+        return a row (tuple) or a list of rows (slice)
+    __iter__()
+        iterate over the rows
+    """
+
+    __ITER_BLOCK_SIZE = 10000
+
+    def __init__(self, columns, categories=None):
+        """ DataRows constructor
+
+        Parameters
+        ----------
+        columns : list(numpy.ndarray)
+            the data columns (same length)
+        categories : list(numpy.ndarray)
+            the categories of the dictionary encoded columns (None for the other columns)
+        """
+        self.__columns = columns
+        self.__categories = categories or [None] * len(columns)
+
+    def __len__(self):
+        """ Get the number of rows
+
+        Returns
+        ------
+        int
+            the number of rows
+        """
+        return len(self.__columns[0]) if self.__columns else 0
+
+    def __getitem__(self, index):
+        """ Get a row or a list of rows
+
+        Parameters
+        ----------
+        index : int or slice
+            the index of the row or the slice of rows
+
+        Returns
+        ------
+        tuple or list(tuple)
+            the row or the list of rows
+        """
+        if isinstance(index, slice):
+            return list(zip(*(self.__values(column, categories, index).tolist()
+                              for column, categories in zip(self.__columns, self.__categories))))
+        if index < -len(self) or index >= len(self):
+            raise IndexError("row index out of range")
+        return tuple(self.__values(column, categories, index).item()
+                     for column, categories in zip(self.__columns, self.__categories))
+
+    def __iter__(self):
+        """ Iterate over the rows (built by blocks)
+
+        Returns
+        ------
+        generator(tuple)
+            the rows
+        """
+        for start in range(0, len(self), self.__ITER_BLOCK_SIZE):
+            yield from self[start:start + self.__ITER_BLOCK_SIZE]
+
+    @staticmethod
+    def __values(column, categories, index):
+        """ Get the values of a column (text values for a dictionary encoded column)
+
+        Parameters
+        ----------
+        column : numpy.ndarray
+            the data column
+        categories : numpy.ndarray
+            the categories of the column (None if the column is not dictionary encoded)
+        index : int or slice
+            the index of the row or the slice of rows
+
+        Returns
+        ------
+        numpy.ndarray
+            the values
+        """
+        if categories is None:
+            return column[index]
+        return categories[column[index]]
@@ -0,0 +1,259 @@
+#!/usr/bin/python
+# coding: utf-8
+
+""" This file contains the DataSet class """
+
+import glob
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+import numpy as np
+
+from ranalysis.data.columntypes import join_categorical, decode_column
+from ranalysis.data.datamanager import DataManager, read_only_view
+from ranalysis.log.loghandler import logger
+
+SOURCE_FIELD = "source"
+
+
+class DataSet:
+    """ A class used to manage data from several csv files with the same fields (runs)
+
+    The files are read concurrently, each one in its own DataManager. The data set is also one table made of the rows
+    of all the files with a source field (index of the file of each row).
+
+    Attributes
+    ----------
+    __managers : dict
+        the data managers of the files ({file name : DataManager}, in the order of the files)
+    __columns : dict
+        the concatenated columns already built ({field name : numpy array})
+    __categories : dict
+        the merged categories of the text fields of the concatenated columns ({field name : numpy array})
+
+    Methods
+    -------
+    read_csv_files(filenames, options, workers, processes)
+        read csv files (list of file names or glob pattern) concurrently
+    manager_have_data()
+        does the data set contains data ?
+    get_filenames()
+        get the list of file names
+    get_manager(filename)
+        get the data manager of a file
+    get_field_names()
+        get the list of field names common to all the files
+    get_unit_from_field_name(field_name)
+        get unit from data field name
+    get_data_from_field_name(field_name)
+        get the data of all the files from data field name
+    get_categories_from_field_name(field_name)
+        get the categories of a text field of all the files
+    get_labels_from_field_name(field_name)
+        get the data of all the files from data field name (text values for a text field)
+    clear_data()
+        clear the data
+    """
+
+    def __init__(self):
+        """ DataSet constructor """
+        self.__managers = {}
+        self.__columns = {}
+        self.__categories = {}
+
+    def read_csv_files(self, filenames, options, workers=None, processes=False):
+        """ Read csv files concurrently
+
+        Parameters
+        ----------
+        filenames : str or list(str)
+            the glob pattern or the list of the file names of the csv files
+        options : dict
+            the reading options of the csv files
+        workers : int
+            the number of threads (or processes) reading the files (None for the default of concurrent.futures)
+        processes : bool
+            read the files in processes instead of threads
+        """
+        if isinstance(filenames, str):
+            filenames = sorted(glob.glob(filenames))
+        filenames = [filename for filename in filenames if filename not in self.__managers]
+        logger.log(logging.INFO, "[DataSet] Read " + str(len(filenames)) + " files")
+
+        options = dict(options, clear=1)
+        if processes:
+            # the parsed data is sent back to this process: lazy fields would be parsed again in each file
+            options['lazy'] = 0
+        executor_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        with executor_class(max_workers=workers) as executor:
+            managers = list(executor.map(read_csv_file, filenames, [options] * len(filenames)))
+
+        for filename, manager in zip(filenames, managers):
+            self.__managers[filename] = manager
+        self.__columns = {}
+        self.__categories = {}
+
+    def manager_have_data(self):
+        """ Does the data set contains data read from csv files ?
+
+        Returns
+        ------
+        bool
+            true if the data set has data, false otherwise
+        """
+        return any(manager.manager_have_data() for manager in self.__managers.values())
+
+    def get_filenames(self):
+        """ Get the list of file names (the index of a file name is its source value)
+
+        Returns
+        ------
+        list(str)
+            the list of file names
+        """
+        return list(self.__managers)
+
+    def get_manager(self, filename):
+        """ Get the data manager of a file
+
+        Parameters
+        ----------
+        filename : str
+            the file name
+
+        Returns
+        ------
+        DataManager
+            the data manager of the file
+        """
+        return self.__managers[filename]
+
+    def get_field_names(self):
+        """ Get the list of field names common to all the files
+
+        Returns
+        ------
+        list(str)
+            the list of field names (and the source field)
+        """
+        managers = list(self.__managers.values())
+        if not managers:
+            return []
+        fieldnames = [field_name for field_name in managers[0].get_field_names()
+                      if all(field_name in manager.get_field_names() for manager in managers[1:])]
+        return fieldnames + [SOURCE_FIELD]
+
+    def get_unit_from_field_name(self, field_name):
+        """ Get unit from data field name
+
+        Parameters
+        ----------
+        field_name : str
+            the data field name
+
+        Returns
+        ------
+        str
+            the unit of data field name (unit of the first file)
+        """
+        if field_name == SOURCE_FIELD or not self.__managers:
+            return ""
+        return next(iter(self.__managers.values())).get_unit_from_field_name(field_name)
+
+    def get_data_from_field_name(self, field_name):
+        """ Get the data of all the files from data field name (rows in the order of the files)
+
+        Parameters
+        ----------
+        field_name : str
+            the data field name (or the source field to get the index of the file of each row)
+
+        Returns
+        ------
+        numpy.ndarray
+            a read-only view on the data of data field name
+        """
+        if field_name not in self.__columns:
+            if field_name == SOURCE_FIELD:
+                # the number of rows of each file is the length of its first common field
+                common_field = self.get_field_names()[0]
+                lengths = [len(manager.get_data_from_field_name(common_field)) if common_field != SOURCE_FIELD else 0
+                           for manager in self.__managers.values()]
+                self.__columns[field_name] = np.repeat(np.arange(len(lengths), dtype=np.int32), lengths)
+            elif field_name in self.get_field_names():
+                columns = [manager.get_data_from_field_name(field_name) for manager in self.__managers.values()]
+                categories = [manager.get_categories_from_field_name(field_name)
+                              for manager in self.__managers.values()]
+                if any(column_categories is not None for column_categories in categories):
+                    # the codes of a text field are different in each file
+                    self.__columns[field_name], self.__categories[field_name] = join_categorical(columns, categories)
+                else:
+                    self.__columns[field_name] = np.concatenate(columns)
+            else:
+                logger.log(logging.ERROR, "[DataSet] Error field name does not exist (get data)")
+                return read_only_view(np.empty(0))
+        return read_only_view(self.__columns[field_name])
+
+    def get_categories_from_field_name(self, field_name):
+        """ Get the categories of a text field of all the files
+
+        Parameters
+        ----------
+        field_name : str
+            the data field name
+
+        Returns
+        ------
+        list(str)
+            the distinct values of the text field in all the files (None if the field is not a text field)
+        """
+        self.get_data_from_field_name(field_name)
+        if field_name in self.__categories:
+            return self.__categories[field_name].tolist()
+        return None
+
+    def get_labels_from_field_name(self, field_name):
+        """ Get the data of all the files from data field name (text values for a text field)
+
+        Parameters
+        ----------
+        field_name : str
+            the data field name
+
+        Returns
+        ------
+        numpy.ndarray
+            the data of data field name (str array for a text field)
+        """
+        data = self.get_data_from_field_name(field_name)
+        if field_name in self.__categories:
+            return decode_column(data, self.__categories[field_name])
+        return data
+
+    def clear_data(self):
+        """ Clear data """
+        logger.log(logging.INFO, "[DataSet] Clear data")
+        self.__managers = {}
+        self.__columns = {}
+        self.__categories = {}
+
+
+def read_csv_file(filename, options):
+    """ Read a csv file in a new data manager (can be run in another thread or process)
+
+    Parameters
+    ----------
+    filename : str
+        the file name of the csv file
+    options : dict
+        the reading options of the csv file
+
+    Returns
+    ------
+    DataManager
+        the data manager of the csv file
+    """
+    manager = DataManager()
+    manager.read_csv_file(os.path.abspath(filename), options)
+    return manager
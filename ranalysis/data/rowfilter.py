@@ -0,0 +1,274 @@
+#!/usr/bin/python
+# coding: utf-8
+
+""" This file contains the RowFilter class """
+
+import ast
+import re
+
+import numpy as np
+
+_PLACEHOLDER = "__field_{}__"
+
+_FUNCTIONS = {
+    'sin': np.sin,
+    'cos': np.cos,
+    'tan': np.tan,
+    'arcsin': np.arcsin,
+    'arccos': np.arccos,
+    'arctan': np.arctan,
+    'exp': np.exp,
+    'ln': np.log,
+    'sqrt': np.sqrt,
+    'mod': np.mod,
+    'round': np.round,
+    'abs': np.abs,
+    'isnan': np.isnan
+}
+
+_CONSTANTS = {
+    'pi': np.pi,
+    'true': True,
+    'false': False,
+    'True': True,
+    'False': False
+}
+
+_BINARY_OPERATORS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.true_divide,
+    ast.Mod: np.mod,
+    ast.Pow: np.power,
+    ast.BitAnd: np.logical_and,
+    ast.BitOr: np.logical_or
+}
+
+_UNARY_OPERATORS = {
+    ast.USub: np.negative,
+    ast.UAdd: np.positive,
+    ast.Not: np.logical_not,
+    ast.Invert: np.logical_not
+}
+
+_COMPARISONS = {
+    ast.Eq: np.equal,
+    ast.NotEq: np.not_equal,
+    ast.Lt: np.less,
+    ast.LtE: np.less_equal,
+    ast.Gt: np.greater,
+    ast.GtE: np.greater_equal
+}
+
+
+class RowFilter:
+    """ A class used to filter the rows of data with a condition on the fields (ex: phase == 2 and P > 1e5)
+
+    The expression is parsed once and only the allowed words (field names, math functions, constants, and, or, not)
+    can be used. It is evaluated as numpy boolean masks over the columns (no evaluation row by row). A field name which
+    is not a python name is written between backquotes (ex: `T (K)` > 300). A text field can be compared (== or !=)
+    with a string.
+
+    Attributes
+    ----------
+    __expression : str
+        the filter expression
+    __tree : ast.Expression
+        the parsed expression
+    __fields : dict
+        the field names used in the expression ({name in the expression : field name})
+
+    Methods
+    -------
+    get_expression()
+        get the filter expression
+    get_field_names()
+        get the field names used in the expression
+    evaluate(get_column, get_categories, row_count)
+        evaluate the filter on columns
+    """
+
+    def __init__(self, expression, fieldnames):
+        """ RowFilter constructor
+
+        Parameters
+        ----------
+        expression : str
+            the filter expression
+        fieldnames : list(str)
+            the field names which can be used in the expression
+
+        Raises
+        ------
+        ValueError
+            if the expression is not valid or uses forbidden words
+        """
+        self.__expression = expression
+        self.__fields = {}
+
+        # the quoted field names are replaced by python names
+        def replace_quoted(match):
+            if match.group(1) not in fieldnames:
+                raise ValueError('"{}" is not a field name'.format(match.group(1)))
+            name = _PLACEHOLDER.format(len(self.__fields))
+            self.__fields[name] = match.group(1)
+            return name
+        python_expression = re.sub('`([^`]*)`', replace_quoted, expression)
+
+        try:
+            self.__tree = ast.parse(python_expression.strip(), mode='eval')
+        except SyntaxError as error:
+            raise ValueError('Invalid filter expression "{}": {}'.format(expression, error.msg))
+        for node in ast.walk(self.__tree):
+            if isinstance(node, ast.Name) and node.id not in self.__fields:
+                if node.id in fieldnames:
+                    self.__fields[node.id] = node.id
+                elif node.id not in _FUNCTIONS and node.id not in _CONSTANTS:
+                    raise ValueError('"{}" is forbidden to use in filter expression'.format(node.id))
+            elif not isinstance(node, (ast.Expression, ast.BoolOp, ast.BinOp, ast.UnaryOp, ast.Compare, ast.Call,
+                                       ast.Name, ast.Constant, ast.Load, ast.And, ast.Or, ast.cmpop, ast.operator,
+                                       ast.unaryop)):
+                raise ValueError('"{}" is forbidden to use in filter expression'.format(type(node).__name__))
+
+    def get_expression(self):
+        """ Get the filter expression
+
+        Returns
+        ------
+        str
+            the filter expression
+        """
+        return self.__expression
+
+    def get_field_names(self):
+        """ Get the field names used in the expression
+
+        Returns
+        ------
+        list(str)
+            the field names
+        """
+        return list(self.__fields.values())
+
+    def evaluate(self, get_column, get_categories, row_count):
+        """ Evaluate the filter on columns
+
+        Parameters
+        ----------
+        get_column : function
+            the function returning the column of a field name (numpy array)
+        get_categories : function
+            the function returning the categories of a text field (None if the field is not dictionary encoded)
+        row_count : int
+            the number of rows
+
+        Returns
+        ------
+        numpy.ndarray
+            the mask of the rows (bool array, True for the kept rows)
+
+        Raises
+        ------
+        ValueError
+            if the expression is not a condition
+        """
+        mask = self.__evaluate(self.__tree.body, get_column, get_categories)
+        mask = np.asarray(mask)
+        if mask.dtype != np.bool_:
+            raise ValueError('Filter expression "{}" is not a condition'.format(self.__expression))
+        return np.broadcast_to(mask, (row_count,)).copy() if mask.ndim == 0 else mask
+
+    def __evaluate(self, node, get_column, get_categories):
+        """ Evaluate a node of the parsed expression
+
+        Parameters
+        ----------
+        node : ast.AST
+            the node
+        get_column : function
+            the function returning the column of a field name
+        get_categories : function
+            the function returning the categories of a text field
+
+        Returns
+        ------
+        numpy.ndarray or scalar
+            the value of the node
+        """
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.Name):
+            if node.id in self.__fields:
+                return get_column(self.__fields[node.id])
+            if node.id not in _CONSTANTS:
+                raise ValueError('Function "{}" is not called in filter expression'.format(node.id))
+            return _CONSTANTS[node.id]
+        if isinstance(node, ast.BoolOp):
+            operator = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            values = [self.__evaluate(value, get_column, get_categories) for value in node.values]
+            return operator.reduce(np.broadcast_arrays(*values)) if len(values) > 1 else values[0]
+        if isinstance(node, ast.UnaryOp):
+            return _UNARY_OPERATORS[type(node.op)](self.__evaluate(node.operand, get_column, get_categories))
+        if isinstance(node, ast.BinOp):
+            if type(node.op) not in _BINARY_OPERATORS:
+                raise ValueError('"{}" is forbidden to use in filter expression'.format(type(node.op).__name__))
+            return _BINARY_OPERATORS[type(node.op)](self.__evaluate(node.left, get_column, get_categories),
+                                                    self.__evaluate(node.right, get_column, get_categories))
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in _FUNCTIONS or node.keywords:
+                raise ValueError('Invalid function call in filter expression "{}"'.format(self.__expression))
+            return _FUNCTIONS[node.func.id](*[self.__evaluate(argument, get_column, get_categories)
+                                              for argument in node.args])
+        if isinstance(node, ast.Compare):
+            # a chained comparison (a < b < c) is a conjunction of comparisons
+            mask = True
+            left_node = node.left
+            for operator, right_node in zip(node.ops, node.comparators):
+                mask = np.logical_and(mask, self.__compare(operator, left_node, right_node, get_column,
+                                                           get_categories))
+                left_node = right_node
+            return mask
+        raise ValueError('"{}" is forbidden to use in filter expression'.format(type(node).__name__))
+
+    def __compare(self, operator, left_node, right_node, get_column, get_categories):
+        """ Evaluate a comparison (a text field is compared with a string through its categories)
+
+        Parameters
+        ----------
+        operator : ast.cmpop
+            the comparison operator
+        left_node : ast.AST
+            the left operand
+        right_node : ast.AST
+            the right operand
+        get_column : function
+            the function returning the column of a field name
+        get_categories : function
+            the function returning the categories of a text field
+
+        Returns
+        ------
+        numpy.ndarray or bool
+            the result of the comparison
+        """
+        if type(operator) not in _COMPARISONS:
+            raise ValueError('"{}" is forbidden to use in filter expression'.format(type(operator).__name__))
+        left = self.__evaluate(left_node, get_column, get_categories)
+        right = self.__evaluate(right_node, get_column, get_categories)
+        for text_node, text, other in ((right_node, right, left), (left_node, left, right)):
+            if isinstance(text, str) and isinstance(other, np.ndarray) and other.dtype.kind != 'U':
+                if not isinstance(operator, (ast.Eq, ast.NotEq)):
+                    raise ValueError('A text field can only be compared with == or != in filter expression')
+                categories = None
+                if isinstance(text_node, ast.Constant):
+                    other_node = left_node if text_node is right_node else right_node
+                    if isinstance(other_node, ast.Name) and other_node.id in self.__fields:
+                        categories = get_categories(self.__fields[other_node.id])
+                if categories is None:
+                    raise ValueError('Only a text field can be compared with "{}" in filter expression'.format(text))
+                # the string is replaced by its code in the categories (-1 if it is not a category)
+                codes = np.flatnonzero(np.asarray(categories) == text)
+                code = codes[0] if codes.size else -1
+                return _COMPARISONS[type(operator)](other, code)
+        return _COMPARISONS[type(operator)](left, right)
@@ -0,0 +1,167 @@
+#!/usr/bin/python
+# coding: utf-8
+
+""" This file can be imported as a module and contains the zone map functions :
+
+    * build_zone_map - build the zone map of a column
+    * zone_map_from_blocks - build the zone map of a column from the blocks of a column file
+    * select_range - get the rows of a column whose values are in a range
+    * select_range_from_blocks - get the rows of a column whose values are in a range, reading only the blocks which
+      can contain values of the range
+    * column_sortedness - detect if a column is sorted
+
+    A zone map stores the minimum and the maximum values of each block of rows of a column and the sortedness of the
+    column. The blocks which cannot contain values of a range are skipped and the rows of a sorted column are found by
+    binary search.
+"""
+
+import numpy as np
+
+ZONE_ROWS = 1 << 16
+
+ASCENDING = 1
+DESCENDING = -1
+UNSORTED = 0
+
+
+def build_zone_map(column, block_rows=ZONE_ROWS):
+    """ Build the zone map of a column
+
+    Parameters
+    ----------
+    column : numpy.ndarray
+        the numeric column
+    block_rows : int
+        the number of rows of a block
+
+    Returns
+    ------
+    dict
+        the zone map ('block_rows', 'min' and 'max' arrays of the blocks and 'sorted' flag: ASCENDING, DESCENDING or
+        UNSORTED)
+    """
+    if len(column) > 0:
+        # the minimum and maximum values of each block (nan values are ignored)
+        starts = np.arange(0, len(column), block_rows)
+        minimums = np.fmin.reduceat(column, starts).astype(np.float64)
+        maximums = np.fmax.reduceat(column, starts).astype(np.float64)
+    else:
+        minimums = np.empty(0)
+        maximums = np.empty(0)
+    # the blocks without value never match a range
+    empty = np.isnan(minimums)
+    minimums[empty] = np.inf
+    maximums[empty] = -np.inf
+
+    return {'block_rows': block_rows, 'min': minimums, 'max': maximums, 'sorted': column_sortedness(column)}
+
+
+def zone_map_from_blocks(blocks, block_rows, sortedness=UNSORTED):
+    """ Build the zone map of a column from the statistics of the blocks of a column file (without reading them)
+
+    Parameters
+    ----------
+    blocks : list(dict)
+        the blocks of the column ('min' and 'max' values, None if the block has no value)
+    block_rows : int
+        the number of rows of a block
+    sortedness : int
+        the sortedness of the column (ASCENDING, DESCENDING or UNSORTED)
+
+    Returns
+    ------
+    dict
+        the zone map
+    """
+    minimums = np.array([np.inf if block['min'] is None else float(block['min']) for block in blocks])
+    maximums = np.array([-np.inf if block['max'] is None else float(block['max']) for block in blocks])
+    return {'block_rows': block_rows, 'min': minimums, 'max': maximums, 'sorted': sortedness}
+
+
+def select_range(column, zone_map, lo, hi):
+    """ Get the rows of a column whose values are in a range (lo <= value <= hi)
+
+    Parameters
+    ----------
+    column : numpy.ndarray
+        the numeric column
+    zone_map : dict
+        the zone map of the column
+    lo : float
+        the lower bound of the range
+    hi : float
+        the upper bound of the range
+
+    Returns
+    ------
+    slice or numpy.ndarray
+        a slice of the rows if the column is sorted, the indexes of the rows otherwise
+    """
+    if zone_map['sorted'] == ASCENDING:
+        return slice(int(np.searchsorted(column, lo, 'left')), int(np.searchsorted(column, hi, 'right')))
+    if zone_map['sorted'] == DESCENDING:
+        reversed_column = column[::-1]
+        start = len(column) - int(np.searchsorted(reversed_column, hi, 'right'))
+        return slice(start, len(column) - int(np.searchsorted(reversed_column, lo, 'left')))
+
+    block_rows = zone_map['block_rows']
+    return select_range_from_blocks(lambda block: column[block * block_rows:(block + 1) * block_rows], zone_map, lo, hi)
+
+
+def select_range_from_blocks(read_block, zone_map, lo, hi):
+    """ Get the rows of a column whose values are in a range (lo <= value <= hi), only the blocks whose minimum and
+    maximum values overlap the range are read
+
+    Parameters
+    ----------
+    read_block : function
+        the function returning the values of a block of the column from its index
+    zone_map : dict
+        the zone map of the column
+    lo : float
+        the lower bound of the range
+    hi : float
+        the upper bound of the range
+
+    Returns
+    ------
+    slice or numpy.ndarray
+        a slice of the rows if the column is sorted, the indexes of the rows otherwise
+    """
+    block_rows = zone_map['block_rows']
+    rows = []
+    for block in np.flatnonzero((zone_map['max'] >= lo) & (zone_map['min'] <= hi)):
+        start = block * block_rows
+        values = read_block(block)
+        if lo <= zone_map['min'][block] and zone_map['max'][block] <= hi:
+            # all the values of the block are in the range (nan values excepted)
+            rows.append(start + np.flatnonzero(~np.isnan(values)) if values.dtype.kind == 'f'
+                        else np.arange(start, start + len(values)))
+        else:
+            rows.append(start + np.flatnonzero((values >= lo) & (values <= hi)))
+    rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+    if zone_map['sorted'] != UNSORTED and len(rows) > 0:
+        # the rows of a sorted column are contiguous
+        return slice(int(rows[0]), int(rows[-1]) + 1)
+    return rows
+
+
+def column_sortedness(column):
+    """ Detect if a column is sorted
+
+    Parameters
+    ----------
+    column : numpy.ndarray
+        the numeric column
+
+    Returns
+    ------
+    int
+        ASCENDING or DESCENDING if the column is sorted, UNSORTED otherwise (or if it contains nan values)
+    """
+    if len(column) > 0 and not (column.dtype.kind == 'f' and np.isnan(column).any()):
+        if (column[1:] >= column[:-1]).all():
+            return ASCENDING
+        if (column[1:] <= column[:-1]).all():
+            return DESCENDING
+    return UNSORTED
@@ -22,12 +22,18 @@ class CsvFrame:
 
     Methods
     -------
+    fill_data()
+        fill the first rows in the Treeview
+    on_tree_scroll(first, last)
+        fill the next rows when the end of the Treeview is displayed
     on_tree_select(event)
         action when item in tree is selected
     quit()
         destroy the frame
     """
 
+    __PAGE_SIZE = 500
+
     def __init__(self, parent, manager, canvas=None, graph=None):
         """ CsvFrame constructor """
         top = self.top = tkinter.Toplevel(parent)
@@ -35,6 +41,8 @@ class CsvFrame:
         self.__manager = manager
         self.__associated_canvas = canvas
         self.__associated_graph = graph
+        self.__rows = []
+        self.__filled_rows = 0
 
         action_frame = tkinter.Frame(top, borderwidth=2, relief=tkinter.GROOVE)
         action_frame.pack(side=tkinter.TOP, fill=tkinter.X, padx=10, pady=10)
@@ -66,12 +74,12 @@ class CsvFrame:
         table_frame = Frame(top)
         table_frame.pack(side=tkinter.BOTTOM, expand=True, fill=tkinter.BOTH)
         scrollbar_x = Scrollbar(table_frame, orient=tkinter.HORIZONTAL)
-        scrollbar_y = Scrollbar(table_frame, orient=tkinter.VERTICAL)
+        self.__scrollbar_y = Scrollbar(table_frame, orient=tkinter.VERTICAL)
         self.tree = Treeview(table_frame, columns=manager.get_field_names(), show="headings", selectmode="extended",
-                             yscrollcommand=scrollbar_y.set, xscrollcommand=scrollbar_x.set)
+                             yscrollcommand=self.on_tree_scroll, xscrollcommand=scrollbar_x.set)
         self.tree.bind("<<TreeviewSelect>>", self.on_tree_select)
-        scrollbar_y.config(command=self.tree.yview)
-        scrollbar_y.pack(side=tkinter.RIGHT, fill=tkinter.Y)
+        self.__scrollbar_y.config(command=self.tree.yview)
+        self.__scrollbar_y.pack(side=tkinter.RIGHT, fill=tkinter.Y)
         scrollbar_x.config(command=self.tree.xview)
         scrollbar_x.pack(side=tkinter.BOTTOM, fill=tkinter.X)
 
@@ -87,7 +95,7 @@ class CsvFrame:
             self.tree.delete(i)
 
     def fill_data(self):
-        """ Fill data in Treeview """
+        """ Fill the first rows of data in Treeview (the next rows are filled when scrolling) """
         logger.log(logging.INFO, "[CsvFrame] Fill data in TreeView")
 
         self.clear_data()
@@ -96,8 +104,30 @@ class CsvFrame:
             self.tree.heading(field_name, text=field_name, anchor=tkinter.W)
             self.tree.column(field_name, stretch=tkinter.YES)
 
-        for entry in self.__manager.get_data_tuple():
-            self.tree.insert("", 'end', values=entry)
+        self.__rows = self.__manager.get_data_tuple()
+        self.__filled_rows = 0
+        self.__fill_next_rows()
+
+    def on_tree_scroll(self, first, last):
+        """ Event when the Treeview is scrolled: fill the next rows when its end is displayed
+
+        Parameters
+        ----------
+        first : str
+            the position of the top of the displayed rows (fraction)
+        last : str
+            the position of the bottom of the displayed rows (fraction)
+        """
+        self.__scrollbar_y.set(first, last)
+        if float(last) >= 0.9 and self.__filled_rows < len(self.__rows):
+            self.__fill_next_rows()
+
+    def __fill_next_rows(self):
+        """ Fill the next page of rows in Treeview """
+        rows = self.__rows[self.__filled_rows:self.__filled_rows + self.__PAGE_SIZE]
+        for row, entry in enumerate(rows, self.__filled_rows):
+            self.tree.insert("", 'end', iid=str(row), values=entry)
+        self.__filled_rows += len(rows)
 
     def transform_data(self):
         """ Transform data and add in Treeview """
@@ -105,19 +135,8 @@ class CsvFrame:
 
     def on_tree_select(self, event):
         """ Event when selecting data in Treeview """
-        list_values = self.tree.item(self.tree.selection())['values']
-        if self.combo_x.get() != "" and self.combo_y.get() != "":
-            index_x = self.__manager.get_field_names().index(self.combo_x.get())
-            index_y = self.__manager.get_field_names().index(self.combo_y.get())
+        if self.combo_x.get() != "" and self.combo_y.get() != "" and self.tree.selection():
             if self.__associated_canvas is not None and self.__associated_graph is not None:
-                value_x = list_values[index_x]
-                if not isinstance(value_x, int):
-                    value_x = value_x.replace(',', '.')
-
-                value_y = list_values[index_y]
-                if not isinstance(value_y, int):
-                    value_y = value_y.replace(',', '.')
-
                 marker = self.__parent.get_marker()
                 if marker == "" or marker == "None" or marker is None:
                     marker = '.'
@@ -126,10 +145,14 @@ class CsvFrame:
                 if color == "":
                     color = 'red'
                 try:
-                    self.__associated_graph.plot(float(value_x), float(value_y), marker=marker, markersize=3,
+                    # the item id is the row index in the data manager columns
+                    rows = [int(item) for item in self.tree.selection()]
+                    value_x = self.__manager.get_labels_from_field_name(self.combo_x.get())[rows]
+                    value_y = self.__manager.get_labels_from_field_name(self.combo_y.get())[rows]
+                    self.__associated_graph.plot(value_x, value_y, linestyle='None', marker=marker, markersize=3,
                                                  color=color)
                     self.__associated_canvas.draw()
-                except ValueError:
+                except (ValueError, IndexError):
                     logger.log(logging.ERROR, "[CsvFrame] Error when plotting point (during conversion process)")
 
     def quit(self):
@@ -5,10 +5,11 @@
 
 import logging
 import tkinter
-from tkinter.ttk import Label, Entry, Button
+from tkinter.ttk import Label, Entry, Button, Checkbutton
 
 from ranalysis.log.loghandler import logger
 from ranalysis.plot.plotcreator import PlotCreator
+from ranalysis.plot.sampling import DEFAULT_TOLERANCE, DEFAULT_MAX_POINTS
 
 
 class FunctionDialog:
@@ -29,8 +30,10 @@ class FunctionDialog:
         exit tht dialog
     """
 
-    def __init__(self, parent, function="x*x", xmin=1.0, xmax=10.0, discr=100, xlabel="x", ylabel="x*x"):
-        """ FunctionDialog constructor """
+    def __init__(self, parent, function="x*x", xmin=1.0, xmax=10.0, discr=100, xlabel="x", ylabel="x*x",
+                 adaptive=False, tolerance=DEFAULT_TOLERANCE, max_points=DEFAULT_MAX_POINTS):
+        """ FunctionDialog constructor (the function is sampled with discr points or adaptively with at most
+        max_points points) """
         top = self.top = tkinter.Toplevel(parent)
         self.__entry_function_label = Label(top, text='Enter the function:', width=25)
         self.__entry_function_label.grid(row=2, column=1, columnspan=2, rowspan=1, padx=5, pady=5)
@@ -68,21 +71,48 @@ class FunctionDialog:
         self.__entry_ylabel.insert(tkinter.END, ylabel)
         self.__entry_ylabel.grid(row=4, column=4, columnspan=1, rowspan=1, padx=5, pady=5)
 
+        self.__adaptive = tkinter.IntVar(value=int(adaptive))
+        self.__adaptive_button = Checkbutton(top, text='Adaptive sampling', variable=self.__adaptive)
+        self.__adaptive_button.grid(row=5, column=1, columnspan=2, rowspan=1, padx=5, pady=5)
+
+        self.__entry_tolerance_label = Label(top, text='Tolerance:', width=10)
+        self.__entry_tolerance_label.grid(row=5, column=3, columnspan=1, rowspan=1, padx=5, pady=5)
+        self.__entry_tolerance = Entry(top, width=10)
+        self.__entry_tolerance.insert(tkinter.END, tolerance)
+        self.__entry_tolerance.grid(row=5, column=4, columnspan=1, rowspan=1, padx=5, pady=5)
+
+        self.__entry_max_points_label = Label(top, text='Max points:', width=10)
+        self.__entry_max_points_label.grid(row=5, column=5, columnspan=1, rowspan=1, padx=5, pady=5)
+        self.__entry_max_points = Entry(top, width=10)
+        self.__entry_max_points.insert(tkinter.END, max_points)
+        self.__entry_max_points.grid(row=5, column=6, columnspan=1, rowspan=1, padx=5, pady=5)
+
         self.__plot_button = Button(top, text='Plot', command=self.create_plot_from_function, width=35)
-        self.__plot_button.grid(row=5, column=1, columnspan=3, rowspan=1, padx=5, pady=5)
+        self.__plot_button.grid(row=6, column=1, columnspan=3, rowspan=1, padx=5, pady=5)
 
         self.__cancel_button = Button(top, text='Cancel', command=self.quit, width=35)
-        self.__cancel_button.grid(row=5, column=4, columnspan=3, rowspan=1, padx=5, pady=5)
+        self.__cancel_button.grid(row=6, column=4, columnspan=3, rowspan=1, padx=5, pady=5)
 
         self.__plot = None
 
     def create_plot_from_function(self):
         """ create plot from math functions """
         logger.log(logging.INFO, "[FunctionDialog] Creating plot from math function " + self.__entry_function.get())
-        self.__plot = PlotCreator.get_instance().plot_from_function(self.__entry_function.get(),
-                                                                    self.__entry_xmin.get(), self.__entry_xmax.get(),
-                                                                    self.__entry_discr.get(), self.__entry_xlabel.get(),
-                                                                    self.__entry_ylabel.get())
+        if self.__adaptive.get():
+            self.__plot = PlotCreator.get_instance().plot_from_function_adaptive(self.__entry_function.get(),
+                                                                                 self.__entry_xmin.get(),
+                                                                                 self.__entry_xmax.get(),
+                                                                                 self.__entry_tolerance.get(),
+                                                                                 self.__entry_max_points.get(),
+                                                                                 self.__entry_xlabel.get(),
+                                                                                 self.__entry_ylabel.get())
+        else:
+            self.__plot = PlotCreator.get_instance().plot_from_function(self.__entry_function.get(),
+                                                                        self.__entry_xmin.get(),
+                                                                        self.__entry_xmax.get(),
+                                                                        self.__entry_discr.get(),
+                                                                        self.__entry_xlabel.get(),
+                                                                        self.__entry_ylabel.get())
 
         self.__plot.set_function(str(self.__entry_function.get()))
 
@@ -41,12 +41,30 @@ class InputDialog:
         self.__checkbox_var_clear.set(1)
         self.__check_button_clear = Checkbutton(top, text="Clear the data?", variable=self.__checkbox_var_clear)
         self.__check_button_clear.grid(row=2, column=2, rowspan=1, padx=5, pady=5)
+        self.__checkbox_var_cache = tkinter.IntVar()
+        self.__checkbox_var_cache.set(1)
+        self.__check_button_cache = Checkbutton(top, text="Use the cache?", variable=self.__checkbox_var_cache)
+        self.__check_button_cache.grid(row=3, column=1, rowspan=1, padx=5, pady=5)
+        self.__checkbox_var_float32 = tkinter.IntVar()
+        self.__checkbox_var_float32.set(0)
+        self.__check_button_float32 = Checkbutton(top, text="Store floats in float32?",
+                                                  variable=self.__checkbox_var_float32)
+        self.__check_button_float32.grid(row=3, column=2, rowspan=1, padx=5, pady=5)
+        self.__workers_label = Label(top, text='Parsing processes:')
+        self.__workers_label.grid(row=4, column=1, rowspan=1, padx=5, pady=5)
+        self.__workers_box = Entry(top)
+        self.__workers_box.insert(tkinter.END, '1')
+        self.__workers_box.grid(row=4, column=2, rowspan=1, padx=5, pady=5)
         self.__submit_button = Button(top, text='Submit', command=self.submit, width=35)
-        self.__submit_button.grid(row=3, column=1, columnspan=2, padx=5, pady=5)
+        self.__submit_button.grid(row=5, column=1, columnspan=2, padx=5, pady=5)
         self.__input_options = {
             'delimiter': ';',
             'unit': 1,
-            'clear': 1
+            'clear': 1,
+            'cache': 1,
+            'lazy': 1,
+            'workers': 1,
+            'float32': 0
         }
 
     def submit(self):
@@ -55,6 +73,10 @@ class InputDialog:
             self.__input_options['delimiter'] = self.__entry_box.get()
         self.__input_options['unit'] = self.__checkbox_var_unit.get()
         self.__input_options['clear'] = self.__checkbox_var_clear.get()
+        self.__input_options['cache'] = self.__checkbox_var_cache.get()
+        self.__input_options['float32'] = self.__checkbox_var_float32.get()
+        if self.__workers_box.get().isdigit() and int(self.__workers_box.get()) > 0:
+            self.__input_options['workers'] = int(self.__workers_box.get())
         self.top.destroy()
         logger.log(logging.INFO, "[InputDialog] " + str(self.__input_options))
 
@@ -5,13 +5,14 @@
 
 import logging
 import tkinter
-from tkinter.ttk import Checkbutton, Button, Entry, Label
+from tkinter.ttk import Checkbutton, Button, Entry, Label, Combobox
 
 from matplotlib.backends.backend_tkagg import (
     FigureCanvasTkAgg, NavigationToolbar2Tk)
 from matplotlib.figure import Figure
 
 from ranalysis.log.loghandler import logger
+from ranalysis.plot.alignment import ALIGNMENT_METHODS
 from ranalysis.plot.graph import graph_compare_plot, graph_clear, graph_compare_plot_diff, graph_compare_plot_values
 
 
@@ -58,6 +59,17 @@ class PlotDialog:
         self.__entry_round.insert(tkinter.END, '2')
         self.__entry_round.grid(row=2, column=4, columnspan=1, rowspan=1, padx=5, pady=5)
 
+        label_alignment = Label(top_frame, text="Common x values:", anchor="w")
+        label_alignment.grid(row=3, column=1, padx=5, pady=5)
+        self.__alignment_combo = Combobox(top_frame, values=ALIGNMENT_METHODS, state='readonly', width=12)
+        self.__alignment_combo.current(0)
+        self.__alignment_combo.grid(row=3, column=2, padx=5, pady=5)
+
+        label_step = Label(top_frame, text="Grid step:", anchor="w")
+        label_step.grid(row=3, column=3, padx=5, pady=5)
+        self.__entry_step = Entry(top_frame, width=15)
+        self.__entry_step.grid(row=3, column=4, columnspan=1, rowspan=1, padx=5, pady=5)
+
         display_button = Button(top_frame, text="Display", command=self.display, width=15)
         display_button.grid(row=1, column=5, rowspan=1, padx=5, pady=5)
 
@@ -84,16 +96,20 @@ class PlotDialog:
         """ Display in the graph frame """
         graph_clear(self.__graph)
 
+        alignment = self.__alignment_combo.get()
+        step = float(self.__entry_step.get()) if self.__entry_step.get().strip() else None
+
         if self.__chkbx_g.get():
-            graph_compare_plot(self.__graph, self.__plots[0], self.__plots[1], self.__marker)
+            graph_compare_plot(self.__graph, self.__plots[0], self.__plots[1], self.__marker, alignment, step)
 
         if self.__chkbx_d.get():
-            graph_compare_plot_diff(self.__graph, self.__plots[0], self.__plots[1], self.__marker)
+            graph_compare_plot_diff(self.__graph, self.__plots[0], self.__plots[1], self.__marker,
+                                    alignment=alignment, step=step)
 
         if self.__chkbx_v.get():
             graph_compare_plot_values(self.__graph, self.__plots[0], self.__plots[1],
                                       float(self.__entry_threshold.get()), bool(self.__chkbx_d.get()),
-                                      int(self.__entry_round.get()))
+                                      int(self.__entry_round.get()), alignment=alignment, step=step)
         self.__canvas.draw()
 
     def clear(self):
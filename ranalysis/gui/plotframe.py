@@ -5,9 +5,10 @@
 
 import logging
 import tkinter
+import weakref
 from tkinter import simpledialog
 from tkinter.filedialog import askopenfilename
-from tkinter.ttk import Combobox, Button, Label
+from tkinter.ttk import Combobox, Button, Entry, Label
 
 from matplotlib import style
 from matplotlib.figure import Figure
@@ -19,8 +20,10 @@ from ranalysis.gui.csvframe import CsvFrame
 from ranalysis.gui.inputdialog import InputDialog
 from ranalysis.gui.plotdialog import PlotDialog
 from ranalysis.log.loghandler import logger
-from ranalysis.plot.graph import graph_from_plot_ids, graph_clear, graph_add_title
+from ranalysis.plot.graph import graph_clear, graph_add_title, graph_add_plot, graph_remove_plot, graph_unzoom_plot, \
+    graph_set_marker, graph_update_legend
 from ranalysis.plot.plotcreator import PlotCreator
+from ranalysis.plot.sampling import DEFAULT_TOLERANCE, DEFAULT_MAX_POINTS
 
 
 class PlotFrame(tkinter.Frame):
@@ -30,6 +33,12 @@ class PlotFrame(tkinter.Frame):
     ----------
     parent : tkinter.Frame
         the parent frame of the PlotFrame
+    __artists : dict
+        the lines of the plots drawn in the graph ({plot id : (line, id of its zoom callback)}), the lines of the
+        unselected plots are hidden
+    __plot_refs : list(weakref)
+        the weak references to the plots of the list (same order as the list), the plots are owned by the PlotFrame in
+        the registry of PlotCreator and released when they are removed from the list or when the tab is closed
 
     Methods
     -------
@@ -61,8 +70,18 @@ class PlotFrame(tkinter.Frame):
         display plots when plots are selected in the list (triggered by event on the list)
     add_title()
         add title to the matplotlib graph
+    release_plots()
+        release all the plots of the frame (when the tab is closed)
     __reset_plotframe()
         reset plot frame attributes
+    __insert_plot(index, plot)
+        insert a plot in the list
+    __delete_plot(index)
+        delete a plot from the list and release it
+    __get_plot(index)
+        get the plot of the list at an index
+    __remove_artists(plot_ids)
+        remove the lines of plots from the graph
     """
 
     def __init__(self, parent, **kw):
@@ -73,6 +92,7 @@ class PlotFrame(tkinter.Frame):
         self.__variable2_combo = None
         self.__style_combo = None
         self.__marker_combo = None
+        self.__where_entry = None
         self.__plot_list = None
         self.__data_manager = DataManager()
         self.__canvas = None
@@ -81,6 +101,8 @@ class PlotFrame(tkinter.Frame):
         self.__modify_button = None
         self.__compare_button = None
         self.__csv_frame = None
+        self.__artists = {}
+        self.__plot_refs = []
         self.initialize()
 
     def get_marker(self):
@@ -138,6 +160,8 @@ class PlotFrame(tkinter.Frame):
         label_x.grid(row=1, column=3, padx=5, pady=5)
         label_y = Label(action_frame, text="Choose y axis: ")
         label_y.grid(row=2, column=3, padx=5, pady=5)
+        label_where = Label(action_frame, text="Filter rows (where): ")
+        label_where.grid(row=3, column=3, padx=5, pady=5)
         label_style = Label(customize_frame, text="Choose style: ")
         label_style.grid(row=1, column=1, rowspan=1, padx=5, pady=5)
         label_style = Label(customize_frame, text="Choose marker: ")
@@ -162,6 +186,10 @@ class PlotFrame(tkinter.Frame):
                                           postcommand=lambda: self.__variable2_combo
                                           .configure(values=self.__data_manager.get_field_names()))
         self.__variable2_combo.grid(row=2, column=4, padx=5, pady=5)
+
+        # entry
+        self.__where_entry = Entry(action_frame)
+        self.__where_entry.grid(row=3, column=4, columnspan=5, sticky=tkinter.EW, padx=5, pady=5)
         style_select_combo3 = tkinter.StringVar()
         self.__style_combo = Combobox(customize_frame, textvariable=style_select_combo3, values=style.available,
                                       state='readonly')
@@ -187,7 +215,7 @@ class PlotFrame(tkinter.Frame):
         compare_dialog = FunctionDialog(self)
         self.wait_window(compare_dialog.top)
         if compare_dialog.get_plot() is not None:
-            self.__plot_list.insert(tkinter.END, compare_dialog.get_plot())
+            self.__insert_plot(tkinter.END, compare_dialog.get_plot())
 
     def create_plot(self, name_style='ggplot'):
         """ Create a matplotlib plot in a tkinter environment """
@@ -199,6 +227,7 @@ class PlotFrame(tkinter.Frame):
         self.__graph = None
         self.__canvas = None
         self.__graph_frame = None
+        self.__artists = {}
 
         self.__graph_frame = tkinter.Frame(self, borderwidth=2, relief=tkinter.GROOVE)
         self.__graph_frame.pack(side=tkinter.RIGHT, padx=10, pady=10, fill=tkinter.BOTH, expand=True)
@@ -219,7 +248,9 @@ class PlotFrame(tkinter.Frame):
     def load_data(self):
         """ Load data from a csv file """
 
-        filename = askopenfilename(title="Open data file", filetypes=[('csv files', '.csv'), ('all files', '.*')])
+        filename = askopenfilename(title="Open data file",
+                                   filetypes=[('csv files', '.csv'), ('compressed csv files', ('.gz', '.bz2', '.xz')),
+                                              ('column files', '.rcol'), ('all files', '.*')])
 
         if filename is not None and len(filename) > 0:
 
@@ -249,7 +280,8 @@ class PlotFrame(tkinter.Frame):
         """ Refresh data from the same csv file """
         if self.__data_manager.manager_have_data():
             self.__data_manager.refresh_data()
-            PlotCreator.get_instance().refresh_plots(self.__data_manager)
+            PlotCreator.get_instance().refresh_plots(self.__data_manager, str(self))
+            self.__remove_artists(list(self.__artists))
             self.on_list_select(None)
             if self.__csv_frame is not None:
                 self.__csv_frame.fill_data()
@@ -265,11 +297,17 @@ class PlotFrame(tkinter.Frame):
         """ Add_button action to add created plot in the list """
         if self.__variable1_combo.get() != "" and self.__variable2_combo.get() != "":
             if self.__data_manager.manager_have_data():
+                self.__data_manager.load_fields([self.__variable1_combo.get(), self.__variable2_combo.get()])
                 plot_f = PlotCreator.get_instance()
-                plot = plot_f.plot_from_fieldnames(self.__data_manager, self.__variable1_combo.get(),
-                                                   [self.__variable2_combo.get()])
+                try:
+                    plot = plot_f.plot_from_fieldnames(self.__data_manager, self.__variable1_combo.get(),
+                                                       [self.__variable2_combo.get()],
+                                                       where=self.__where_entry.get().strip())
+                except ValueError as error:
+                    logger.log(logging.ERROR, "[PlotFrame] " + str(error))
+                    return
                 logger.log(logging.INFO, "[PlotFrame] Add plot: " + str(plot[0]))
-                self.__plot_list.insert(tkinter.END, plot[0])
+                self.__insert_plot(tkinter.END, plot[0])
                 self.__variable1_combo["state"] = 'disabled'
             else:
                 logger.log(logging.ERROR, "[PlotFrame] Data manager does not have data")
@@ -283,16 +321,20 @@ class PlotFrame(tkinter.Frame):
             self.create_plot(self.__style_combo.get())
 
     def use_marker(self):
-        """ Change the marker used to plot graph """
-        self.on_list_select(None)
+        """ Change the marker used to plot graph (the lines are updated in place) """
+        graph_set_marker([line for line, _ in self.__artists.values()], self.__marker_combo.get())
+        self.__canvas.draw_idle()
 
     def remove_plot(self):
         """ Remove selected plot from the list """
         if self.__plot_list.size() > 0:
             logger.log(logging.INFO, "[PlotFrame] Remove plot")
             idxs = self.__plot_list.curselection()
-            for idx in idxs:
-                self.__plot_list.delete(idx)
+            plot_ids = [self.__get_plot(idx).get_plot_id() for idx in idxs]
+            for idx in reversed(idxs):
+                self.__delete_plot(idx)
+            self.__remove_artists(plot_ids)
+            self.on_list_select(None)
         else:
             logger.log(logging.ERROR, "[PlotFrame] No plot to remove")
 
@@ -301,23 +343,25 @@ class PlotFrame(tkinter.Frame):
 
     def modify_plot(self):
         """ Modify plot created by a math function """
-        plot_ids = []
-        for idx in self.__plot_list.curselection():
-            plot_ids.append(self.__plot_list.get(idx))
-        if len(plot_ids) == 1:
-            idxs = self.__plot_list.curselection()
-            plot1 = PlotCreator.get_instance().get_plot_from_stringify(plot_ids[0])
+        idxs = self.__plot_list.curselection()
+        if len(idxs) == 1:
+            plot1 = self.__get_plot(idxs[0])
             if plot1.use_function():
                 function = plot1.get_function()
-                xmin = plot1.get_x()[0]
-                discr = len(plot1.get_x())
-                xmax = plot1.get_x()[discr-1]
+                sampling = plot1.get_sampling()
+                if sampling is None:
+                    sampling = {'xmin': plot1.get_x()[0], 'xmax': plot1.get_x()[-1], 'discr': len(plot1.get_x()),
+                                'adaptive': False, 'tolerance': DEFAULT_TOLERANCE, 'max_points': DEFAULT_MAX_POINTS}
                 xlabel = plot1.get_x_axis()
                 ylabel = plot1.get_y_axis()
-                compare_dialog = FunctionDialog(self, function, xmin, xmax, discr, xlabel, ylabel)
+                compare_dialog = FunctionDialog(self, function, sampling['xmin'], sampling['xmax'], sampling['discr'],
+                                                xlabel, ylabel, sampling['adaptive'], sampling['tolerance'],
+                                                sampling['max_points'])
                 self.wait_window(compare_dialog.top)
                 if compare_dialog.get_plot() is not None:
                     plot1.update(compare_dialog.get_plot())
+                    PlotCreator.get_instance().release_plot(compare_dialog.get_plot().get_plot_id())
+                    self.__remove_artists([plot1.get_plot_id()])
                     self.__plot_list.delete(idxs)
                     self.__plot_list.insert(idxs, plot1)
                     self.__plot_list.selection_set(idxs)
@@ -329,16 +373,10 @@ class PlotFrame(tkinter.Frame):
 
     def compare_plots(self):
         """ Compare two plots in a graph """
-        plot_ids = []
-        for idx in self.__plot_list.curselection():
-            plot_ids.append(self.__plot_list.get(idx))
-        if len(plot_ids) == 2:
-            plot1 = PlotCreator.get_instance().get_plot_from_stringify(plot_ids[0])
-            plot2 = PlotCreator.get_instance().get_plot_from_stringify(plot_ids[1])
-            if len(plot1.get_x()) == len(plot2.get_x()):
-                PlotDialog(self, plot1, plot2, self.__marker_combo.get())
-            else:
-                logger.log(logging.ERROR, "[PlotFrame] Plots do not have the same x interval")
+        idxs = self.__plot_list.curselection()
+        if len(idxs) == 2:
+            # the plots are interpolated on common x values if they do not have the same x values
+            PlotDialog(self, self.__get_plot(idxs[0]), self.__get_plot(idxs[1]), self.__marker_combo.get())
         else:
             logger.log(logging.ERROR, "[PlotFrame] You can compare only two plots")
 
@@ -346,15 +384,18 @@ class PlotFrame(tkinter.Frame):
         """ Clear/reset the plot frame """
         logger.log(logging.INFO, "[PlotFrame] Clear all plots")
         graph_clear(self.__graph)
+        self.__artists = {}
         self.__plot_list.selection_clear(0, tkinter.END)
         self.__canvas.draw()
 
     def on_list_select(self, evt):
-        """ Display plots when plots are selected in the list (triggered by event on the list) """
-        graph_clear(self.__graph)
-        plot_ids = []
+        """ Display plots when plots are selected in the list (triggered by event on the list)
+
+        Only the lines of the plots whose selection changed are shown, hidden or added (the other lines are kept).
+        """
+        plots = []
         for idx in self.__plot_list.curselection():
-            plot_ids.append(self.__plot_list.get(idx))
+            plots.append(self.__get_plot(idx))
 
         if len(self.__plot_list.curselection()) == 1:
             self.__modify_button['state'] = 'normal'
@@ -366,9 +407,20 @@ class PlotFrame(tkinter.Frame):
             self.__modify_button['state'] = 'disabled'
             self.__compare_button['state'] = 'disabled'
 
-        if len(plot_ids) > 0:
-            graph_from_plot_ids(self.__graph, plot_ids, self.__marker_combo.get())
-            self.__canvas.draw()
+        if len(plots) > 0:
+            selected_ids = [plot.get_plot_id() for plot in plots]
+            for plot_id, (line, _) in self.__artists.items():
+                line.set_visible(plot_id in selected_ids)
+            for plot in plots:
+                if plot.get_plot_id() not in self.__artists:
+                    self.__artists[plot.get_plot_id()] = graph_add_plot(self.__graph, plot, self.__marker_combo.get())
+                elif self.__artists[plot.get_plot_id()][1] is not None:
+                    graph_unzoom_plot(self.__graph, self.__artists[plot.get_plot_id()][0], plot)
+            self.__graph.set_xlabel(plots[0].get_x_axis() + " [" + plots[0].get_x_unit() + "]")
+            graph_update_legend(self.__graph)
+            self.__graph.relim(visible_only=True)
+            self.__graph.autoscale(enable=True)
+            self.__canvas.draw_idle()
         else:
             self.clear_plot()
 
@@ -379,6 +431,12 @@ class PlotFrame(tkinter.Frame):
             graph_add_title(self.__graph, title)
             self.__canvas.draw()
 
+    def release_plots(self):
+        """ Release all the plots of the frame (when the tab is closed) """
+        self.__remove_artists(list(self.__artists))
+        self.__plot_refs = []
+        PlotCreator.get_instance().release_owner(str(self))
+
     def reset_csvframe(self):
         """ Reset csv frame """
         self.__csv_frame = None
@@ -388,4 +446,63 @@ class PlotFrame(tkinter.Frame):
         self.__variable1_combo.set('')
         self.__variable2_combo.set('')
         self.__plot_list.delete(0, tkinter.END)
+        self.release_plots()
         self.__variable1_combo["state"] = 'readonly'
+
+    def __remove_artists(self, plot_ids):
+        """ Remove the lines of plots from the graph (they are added again when the plots are selected)
+
+        Parameters
+        ----------
+        plot_ids : list(int)
+            the ids of the plots
+        """
+        for plot_id in plot_ids:
+            if plot_id in self.__artists:
+                line, callback_id = self.__artists.pop(plot_id)
+                graph_remove_plot(self.__graph, line, callback_id)
+
+    def __insert_plot(self, index, plot):
+        """ Insert a plot in the list (the plot is owned by the frame)
+
+        Parameters
+        ----------
+        index : int or str
+            the index of the plot in the list (tkinter.END to append it)
+        plot : Plot
+            the plot
+        """
+        PlotCreator.get_instance().set_owner(plot.get_plot_id(), str(self))
+        if index == tkinter.END:
+            self.__plot_refs.append(weakref.ref(plot))
+        else:
+            self.__plot_refs.insert(index, weakref.ref(plot))
+        self.__plot_list.insert(index, plot)
+
+    def __delete_plot(self, index):
+        """ Delete a plot from the list and release it
+
+        Parameters
+        ----------
+        index : int
+            the index of the plot in the list
+        """
+        plot = self.__plot_refs.pop(index)()
+        self.__plot_list.delete(index)
+        if plot is not None:
+            PlotCreator.get_instance().release_plot(plot.get_plot_id())
+
+    def __get_plot(self, index):
+        """ Get the plot of the list at an index
+
+        Parameters
+        ----------
+        index : int
+            the index of the plot in the list
+
+        Returns
+        ------
+        Plot
+            the plot (None if it is released)
+        """
+        return self.__plot_refs[index]()
@@ -28,7 +28,7 @@ class RAnalysisFrame(tkinter.Tk):
     add_tab_command(self)
         add_tab_command action of the menu creating new notebook tab
     remove_tab_command(self)
-        remove_tab_command action of the menu removing selected notebook tab
+        remove_tab_command action of the menu removing selected notebook tab (its plots are released)
     logger(self)
         display or hide the LoggerFrame
     how_to_command(self)
@@ -84,8 +84,12 @@ class RAnalysisFrame(tkinter.Tk):
 
     def remove_tab_command(self):
         """ Removing selected notebook tab """
-        self.__notebook.forget(self.__notebook.select())
-        logger.log(logging.INFO, "[MainFrame] Remove tab")
+        if self.__notebook.select():
+            tab = self.nametowidget(self.__notebook.select())
+            tab.release_plots()
+            self.__notebook.forget(tab)
+            tab.destroy()
+            logger.log(logging.INFO, "[MainFrame] Remove tab")
 
     def logger(self):
         """ Display or hide the LoggerFrame """
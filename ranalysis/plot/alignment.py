@@ -0,0 +1,141 @@
+#!/usr/bin/python
+# coding: utf-8
+
+""" This file can be imported as a module and contains the alignment functions of plots :
+
+    * common_grid - compute the common x values of two series
+    * interpolate - compute the values of a series on x values (linear interpolation)
+    * align_plots - compute the values of two plots on their common x values
+
+    Two plots read from different files or created from a function do not have the same x values. Before comparing
+    them, both series are interpolated on a common grid: the union of their x values, the x values in the range covered
+    by both series (intersection) or a grid with a fixed step in this range. The plots with unsorted x values are sorted
+    with their cached argsort.
+"""
+
+import numpy as np
+
+ALIGNMENT_METHODS = ('union', 'intersection', 'step')
+MAX_GRID_POINTS = 10000000
+
+
+def common_grid(x1, x2, method='union', step=None):
+    """ Compute the common x values of two series
+
+    Parameters
+    ----------
+    x1 : numpy.ndarray
+        the x data of the first series (sorted in ascending order, without nan)
+    x2 : numpy.ndarray
+        the x data of the second series (sorted in ascending order, without nan)
+    method : str
+        'union' (the x values of both series), 'intersection' (the x values of both series in the range covered by both
+        series) or 'step' (a grid with a fixed step in the range covered by both series)
+    step : float
+        the step of the grid (method 'step' only)
+
+    Returns
+    ------
+    numpy.ndarray
+        the common x values (sorted in ascending order)
+
+    Raises
+    ------
+    ValueError
+        if the method or the step is not valid
+    """
+    if method not in ALIGNMENT_METHODS:
+        raise ValueError("Unknown alignment method " + str(method))
+    if method == 'union':
+        return np.union1d(x1, x2)
+    if len(x1) == 0 or len(x2) == 0:
+        return np.empty(0)
+
+    x_min = max(x1[0], x2[0])
+    x_max = min(x1[-1], x2[-1])
+    if method == 'intersection':
+        grid = np.union1d(x1, x2)
+        return grid[(grid >= x_min) & (grid <= x_max)]
+
+    if step is None or not step > 0:
+        raise ValueError("The step of the grid must be positive (" + str(step) + " given)")
+    if x_max < x_min:
+        return np.empty(0)
+    if (x_max - x_min) / step > MAX_GRID_POINTS:
+        raise ValueError("The step " + str(step) + " gives more than " + str(MAX_GRID_POINTS) + " points")
+    # the last point is kept even if the range is not a multiple of the step
+    return np.arange(x_min, x_max + step / 2, step)
+
+
+def interpolate(x, y, grid):
+    """ Compute the values of a series on x values (linear interpolation)
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        the x data of the series (sorted in ascending order, without nan)
+    y : numpy.ndarray
+        the y data of the series
+    grid : numpy.ndarray
+        the x values
+
+    Returns
+    ------
+    numpy.ndarray
+        the values of the series on the x values (nan outside of the range of the series)
+    """
+    if len(x) == 0:
+        return np.full(len(grid), np.nan)
+    return np.interp(grid, x, y, left=np.nan, right=np.nan)
+
+
+def align_plots(plot1, plot2, method='union', step=None):
+    """ Compute the values of two plots on their common x values
+
+    Parameters
+    ----------
+    plot1 : Plot
+        the first plot
+    plot2 : Plot
+        the second plot
+    method : str
+        the common x values ('union', 'intersection' or 'step')
+    step : float
+        the step of the grid (method 'step' only)
+
+    Returns
+    ------
+    tuple(numpy.ndarray, numpy.ndarray, numpy.ndarray)
+        the common x values and the values of the two plots on these x values
+
+    Raises
+    ------
+    ValueError
+        if the data of a plot is not numeric or if the method or the step is not valid
+    """
+    if method not in ALIGNMENT_METHODS:
+        raise ValueError("Unknown alignment method " + str(method))
+    series = []
+    for plot_tm in (plot1, plot2):
+        x_data = np.asarray(plot_tm.get_x())
+        y_data = np.asarray(plot_tm.get_y())
+        if x_data.dtype.kind not in 'biuf' or y_data.dtype.kind not in 'biuf' or len(x_data) != len(y_data):
+            raise ValueError("The plot " + str(plot_tm) + " can not be compared (data not numeric)")
+        series.append((x_data, y_data.astype(np.float64, copy=False)))
+
+    (x1, y1), (x2, y2) = series
+    if method != 'step' and len(x1) == len(x2) and (x1 is x2 or np.array_equal(x1, x2)):
+        # the plots already have the same x values
+        return x1, y1, y2
+
+    for index, plot_tm in enumerate((plot1, plot2)):
+        x_data, y_data = plot_tm.get_sorted_data()
+        x_data = np.asarray(x_data, dtype=np.float64)
+        y_data = np.asarray(y_data, dtype=np.float64)
+        # the nan x values are sorted at the end
+        count = len(x_data) - int(np.count_nonzero(np.isnan(x_data)))
+        series[index] = (x_data[:count], y_data[:count])
+
+    (x1, y1), (x2, y2) = series
+    grid = common_grid(x1, x2, method, step)
+    return grid, interpolate(x1, y1, grid), interpolate(x2, y2, grid)
@@ -0,0 +1,168 @@
+#!/usr/bin/python
+# coding: utf-8
+
+""" This file can be imported as a module and contains the decimation functions :
+
+    * decimate - reduce the number of points of a series before plotting it
+    * minmax_decimate - keep the minimum and the maximum values of each bucket of points
+    * lttb_decimate - keep the point of each bucket forming the largest triangle (Largest-Triangle-Three-Buckets)
+    * minmax_bounds - get the values searched for the minimum and the maximum of a series (nan values ignored)
+    * axes_points - get the number of points to plot in a matplotlib axis (twice its width in pixels)
+
+    A series with more points than pixels is drawn with the same pixels as its decimated version: the min-max
+    decimation keeps every peak of the series (envelope), the LTTB decimation keeps its visual shape with fewer points.
+"""
+
+import numpy as np
+
+DECIMATION_METHODS = ('minmax', 'lttb')
+DEFAULT_POINTS = 4000
+
+
+def decimate(x, y, points=DEFAULT_POINTS, method='minmax'):
+    """ Reduce the number of points of a series before plotting it
+
+    Parameters
+    ----------
+    x : list or numpy.ndarray
+        the x data
+    y : list or numpy.ndarray
+        the y data
+    points : int
+        the maximum number of points to keep
+    method : str
+        the decimation method ('minmax' or 'lttb', None to keep all the points)
+
+    Returns
+    ------
+    tuple(numpy.ndarray, numpy.ndarray)
+        the decimated x and y data (unchanged if the series is small enough or is not numeric)
+    """
+    if method is not None and method not in DECIMATION_METHODS:
+        raise ValueError("Unknown decimation method " + str(method))
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if method is None or len(y) <= points or len(x) != len(y) \
+            or x.dtype.kind not in 'biuf' or y.dtype.kind not in 'biuf':
+        return x, y
+    if method == 'lttb':
+        return lttb_decimate(x, y, points)
+    return minmax_decimate(x, y, points)
+
+
+def minmax_decimate(x, y, points=DEFAULT_POINTS):
+    """ Keep the first and the last points and the minimum and the maximum values of each bucket of points
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        the x data
+    y : numpy.ndarray
+        the numeric y data
+    points : int
+        the maximum number of points to keep (two per bucket)
+
+    Returns
+    ------
+    tuple(numpy.ndarray, numpy.ndarray)
+        the decimated x and y data (in the order of the series)
+    """
+    count = len(y)
+    if count <= points:
+        return x, y
+    bucket_size = -(-count // max(points // 2 - 1, 1))
+    full = count // bucket_size * bucket_size
+    low, high = minmax_bounds(y)
+    starts = np.arange(0, full, bucket_size)
+    rows = [[0],
+            starts + np.argmin(low[:full].reshape(-1, bucket_size), axis=1),
+            starts + np.argmax(high[:full].reshape(-1, bucket_size), axis=1)]
+    if full < count:
+        rows.append([full + np.argmin(low[full:]), full + np.argmax(high[full:])])
+    rows.append([count - 1])
+    rows = np.unique(np.concatenate(rows))
+    return x[rows], y[rows]
+
+
+def lttb_decimate(x, y, points=DEFAULT_POINTS):
+    """ Keep the first and the last points and the point of each bucket forming the largest triangle with the point
+    kept in the previous bucket and the average point of the next bucket (Largest-Triangle-Three-Buckets)
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        the numeric x data
+    y : numpy.ndarray
+        the numeric y data
+    points : int
+        the number of points to keep
+
+    Returns
+    ------
+    tuple(numpy.ndarray, numpy.ndarray)
+        the decimated x and y data (in the order of the series)
+    """
+    count = len(y)
+    if count <= points or points < 3:
+        return x, y
+    x_values = x.astype(np.float64)
+    y_values = y.astype(np.float64)
+
+    # points - 2 buckets between the first and the last points (the last point is a bucket of its own)
+    edges = np.linspace(1, count - 1, points - 1).astype(np.int64)
+    finite = ~(np.isnan(x_values) | np.isnan(y_values))
+    sizes = np.add.reduceat(finite, edges)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x_means = np.add.reduceat(np.where(finite, x_values, 0.0), edges) / sizes
+        y_means = np.add.reduceat(np.where(finite, y_values, 0.0), edges) / sizes
+
+    rows = np.empty(points, dtype=np.int64)
+    rows[0] = 0
+    rows[-1] = count - 1
+    selected = 0
+    for bucket in range(points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        x_bucket = x_values[start:end]
+        y_bucket = y_values[start:end]
+        area = np.abs((x_values[selected] - x_means[bucket + 1]) * (y_bucket - y_values[selected])
+                      - (x_values[selected] - x_bucket) * (y_means[bucket + 1] - y_values[selected]))
+        selected = start + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        rows[bucket + 1] = selected
+    return x[rows], y[rows]
+
+
+def minmax_bounds(y):
+    """ Get the values searched for the minimum and the maximum of a series (the nan values are never the minimum or
+    the maximum of a bucket)
+
+    Parameters
+    ----------
+    y : numpy.ndarray
+        the numeric y data
+
+    Returns
+    ------
+    tuple(numpy.ndarray, numpy.ndarray)
+        the y data with the nan values replaced by +inf (for the minimum) and by -inf (for the maximum)
+    """
+    if y.dtype.kind == 'f':
+        nan = np.isnan(y)
+        if nan.any():
+            return np.where(nan, np.inf, y), np.where(nan, -np.inf, y)
+    return y, y
+
+
+def axes_points(ax):
+    """ Get the number of points to plot in a matplotlib axis (a minimum and a maximum value per pixel)
+
+    Parameters
+    ----------
+    ax : Axis
+        the matplotlib axis object
+
+    Returns
+    ------
+    int
+        twice the width of the axis in pixels
+    """
+    return 2 * max(int(ax.get_window_extent().width), 1)
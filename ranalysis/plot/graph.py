@@ -6,6 +6,8 @@
     * graph_from_function - create plot from math functions
     * graph_from_fieldname - plot data from fieldname in a matplotlib object
     * graph_from_fieldnames - plot multiple data from fieldnames in a matplotlib object
+    * graph_from_dataset - plot data from fieldnames for each file of a data set in a matplotlib object
+    * graph_from_groups - plot data from a fieldname for each value of a group field in a matplotlib object
     * graph_from_plots - plot list of plots objects in a matplotlib object
     * graph_from_plot_ids - plot list of plots from there ids in a matplotlib object
     * graph_from_data - plot data in a matplotlib object
@@ -17,17 +19,32 @@
     * graph_compare_plot - fill between two plots (compare two plots)
     * graph_compare_plot_diff - plot the diff between two plots
     * graph_compare_plot_values - plot the diff values between two plots
+    * graph_from_chunks - plot multiple data from fieldnames chunk by chunk (streaming mode)
+    * graph_compare_plot_diff_from_chunks - plot the diff between two fields chunk by chunk (streaming mode)
+    * statistics_from_chunks - compute the statistics of fields chunk by chunk (streaming mode)
     * graph_clear - clear matplotlib axis object
-    * plot - plot in matplotlib object
+    * graph_add_plot - add the line of a plot in a matplotlib object
+    * graph_remove_plot - remove the line of a plot from a matplotlib object
+    * graph_unzoom_plot - set the data of the line of a plot to the whole range of the plot
+    * graph_set_marker - change the marker of lines
+    * graph_update_legend - update the legend with the visible lines
+    * plot - plot in matplotlib object (the series are decimated to the width of the axis)
+    * graph_zoom_lines - update the lines of a matplotlib axis to the visible range of x values
 
 """
 
 import logging
-import re
+
+import numpy as np
 
 from ranalysis.log.loghandler import logger
+from ranalysis.plot.alignment import align_plots
+from ranalysis.plot.decimation import decimate, minmax_decimate, axes_points
 from ranalysis.plot.plotcreator import PlotCreator
 
+LABEL_SPACING = 40
+MAX_LABELS = 200
+
 
 def graph_from_function(ax, function_list, marker="."):
     """ Plot data from fieldname in a matplotlib object
@@ -72,9 +89,11 @@ def graph_from_function(ax, function, xmin, xmax, discr, xlabel="", ylabel="", m
     logger.log(logging.INFO, "[Graph] Graph from function")
     plots = [PlotCreator.get_instance().plot_from_function(function, xmin, xmax, discr, xlabel, ylabel)]
     plot(ax, plots, marker)
+    _release_plots(plots)
 
 
-def graph_from_fieldname(ax, manager, x_fieldname, y_fieldname, marker="."):
+def graph_from_fieldname(ax, manager, x_fieldname, y_fieldname, marker=".", x_range=None, where=None,
+                         decimation="minmax"):
     """ Plot data from fieldname in a matplotlib object
 
     Parameters
@@ -89,13 +108,21 @@ def graph_from_fieldname(ax, manager, x_fieldname, y_fieldname, marker="."):
         the fieldname of the y-axis variable to plot
     marker : string
         the style of the marker to plot
+    x_range : tuple(float, float)
+        the range (min, max) of the x values to plot (None to plot all the values)
+    where : str
+        the filter expression of the rows to plot (None to plot all the rows)
+    decimation : str
+        the decimation of the series with more points than pixels ('minmax', 'lttb' or None)
     """
     logger.log(logging.INFO, "[Graph] Graph from fieldname")
-    plots = [PlotCreator.get_instance().plot_from_fieldname(manager, x_fieldname, y_fieldname)]
-    plot(ax, plots, marker)
+    plots = [PlotCreator.get_instance().plot_from_fieldname(manager, x_fieldname, y_fieldname, x_range, where)]
+    plot(ax, plots, marker, decimation)
+    _release_plots(plots)
 
 
-def graph_from_fieldnames(ax, manager, x_fieldname, y_fieldnames, marker="."):
+def graph_from_fieldnames(ax, manager, x_fieldname, y_fieldnames, marker=".", x_range=None, where=None,
+                          decimation="minmax"):
     """ Plot multiple data from fieldnames in a matplotlib object
 
     Parameters
@@ -110,13 +137,68 @@ def graph_from_fieldnames(ax, manager, x_fieldname, y_fieldnames, marker="."):
         the list of fieldname of the y-axis variable to plot
     marker : string
         the style of the marker to plot
+    x_range : tuple(float, float)
+        the range (min, max) of the x values to plot (None to plot all the values)
+    where : str
+        the filter expression of the rows to plot (None to plot all the rows)
+    decimation : str
+        the decimation of the series with more points than pixels ('minmax', 'lttb' or None)
     """
     logger.log(logging.INFO, "[Graph] Graph from fieldnames")
-    plots = PlotCreator.get_instance().plot_from_fieldnames(manager, x_fieldname, y_fieldnames)
-    plot(ax, plots, marker)
+    plots = PlotCreator.get_instance().plot_from_fieldnames(manager, x_fieldname, y_fieldnames, x_range, where)
+    plot(ax, plots, marker, decimation)
+    _release_plots(plots)
+
+
+def graph_from_dataset(ax, dataset, x_fieldname, y_fieldnames, marker="."):
+    """ Plot data from fieldnames for each file of a data set in a matplotlib object (overlay of runs)
+
+    Parameters
+    ----------
+    ax : Axis
+        the matplotlib axis object
+    dataset : DataSet
+        the data set used to read data from csv files
+    x_fieldname : str
+        the fieldname of the x-axis variable to plot
+    y_fieldnames : list(str)
+        the list of fieldname of the y-axis variable to plot
+    marker : string
+        the style of the marker to plot
+    """
+    logger.log(logging.INFO, "[Graph] Graph from data set")
+    plots = PlotCreator.get_instance().plot_from_dataset(dataset, x_fieldname, y_fieldnames)
+    if plots:
+        plot(ax, plots, marker)
+    _release_plots(plots)
+
 
+def graph_from_groups(ax, manager, x_fieldname, y_fieldname, group_fieldname, marker="."):
+    """ Plot data from a fieldname for each value of a group field in a matplotlib object
 
-def graph_from_plots(ax, list_plots, marker="."):
+    Parameters
+    ----------
+    ax : Axis
+        the matplotlib axis object
+    manager : DataManager
+        the data manager used to read data from csv file
+    x_fieldname : str
+        the fieldname of the x-axis variable to plot
+    y_fieldname : str
+        the fieldname of the y-axis variable to plot
+    group_fieldname : str
+        the fieldname of the variable used to group the rows (text field for instance)
+    marker : string
+        the style of the marker to plot
+    """
+    logger.log(logging.INFO, "[Graph] Graph from groups")
+    plots = PlotCreator.get_instance().plot_from_groups(manager, x_fieldname, y_fieldname, group_fieldname)
+    if plots:
+        plot(ax, plots, marker)
+    _release_plots(plots)
+
+
+def graph_from_plots(ax, list_plots, marker=".", decimation="minmax"):
     """ Plot list of plots objects in a matplotlib object
 
     Parameters
@@ -127,12 +209,14 @@ def graph_from_plots(ax, list_plots, marker="."):
         the list of plot
     marker : string
         the style of the marker to plot
+    decimation : str
+        the decimation of the series with more points than pixels ('minmax', 'lttb' or None)
     """
     logger.log(logging.INFO, "[Graph] Graph from plots")
-    plot(ax, list_plots, marker)
+    plot(ax, list_plots, marker, decimation)
 
 
-def graph_from_plot_ids(ax, plot_ids, marker="."):
+def graph_from_plot_ids(ax, plot_ids, marker=".", decimation="minmax"):
     """ Plot list of plots from there ids in a matplotlib object
 
     Parameters
@@ -143,15 +227,14 @@ def graph_from_plot_ids(ax, plot_ids, marker="."):
         the list of plot ids
     marker : string
         the style of the marker to plot
+    decimation : str
+        the decimation of the series with more points than pixels ('minmax', 'lttb' or None)
     """
     logger.log(logging.INFO, "[Graph] Graph from plot ids")
-    plots_to_display = []
-    for plot_id in plot_ids:
-        pattern = re.search('id=(.+?) ', plot_id)
-        if pattern:
-            found = int(pattern.group(1))
-            plots_to_display.append(PlotCreator.get_instance().get_plots_dict()[found])
-    plot(ax, plots_to_display, marker)
+    plots_to_display = [PlotCreator.get_instance().get_plot_from_id(plot_id) for plot_id in plot_ids]
+    plots_to_display = [plot_tm for plot_tm in plots_to_display if plot_tm is not None]
+    if plots_to_display:
+        plot(ax, plots_to_display, marker, decimation)
 
 
 def graph_from_data(ax, x_data, y_data, x_label, y_label, marker="."):
@@ -175,6 +258,7 @@ def graph_from_data(ax, x_data, y_data, x_label, y_label, marker="."):
     logger.log(logging.INFO, "[Graph] Graph from data")
     plots_to_display = [PlotCreator.get_instance().plot_from_data(x_data, y_data, x_label, y_label)]
     plot(ax, plots_to_display, marker)
+    _release_plots(plots_to_display)
 
 
 def graph_from_multiple_data(ax, x_data, y_datas, x_label, y_multiple_label, marker="."):
@@ -198,6 +282,7 @@ def graph_from_multiple_data(ax, x_data, y_datas, x_label, y_multiple_label, mar
     logger.log(logging.INFO, "[Graph] Graph from multiple data")
     plots_to_display = PlotCreator.get_instance().plot_from_multiple_data(x_data, y_datas, x_label, y_multiple_label)
     plot(ax, plots_to_display, marker)
+    _release_plots(plots_to_display)
 
 
 def graph_add_title(ax, title):
@@ -235,9 +320,10 @@ def graph_compare_plot_from_fieldnames(ax, manager, x_fieldname, y_fieldnames, m
         graph_compare_plot(ax, plots[0], plots[1], marker)
     else:
         logger.log(logging.ERROR, "[Graph] You can only compare two graphs (" + str(len(plots)) + " given)")
+    _release_plots(plots)
 
 
-def graph_compare_plot(ax, plot1, plot2, marker="."):
+def graph_compare_plot(ax, plot1, plot2, marker=".", alignment="union", step=None):
     """ Fill between two plots (compare two plots)
 
     Parameters
@@ -250,10 +336,26 @@ def graph_compare_plot(ax, plot1, plot2, marker="."):
         the second plot to compare
     marker : string
         the style of the marker to plot
+    alignment : str
+        the common x values of the plots if they do not have the same x values ('union', 'intersection' or 'step')
+    step : float
+        the step of the common x values (alignment 'step' only)
     """
     logger.log(logging.INFO, "[Graph] Compare two plots")
     plot(ax, [plot1, plot2], marker)
-    ax.fill_between(plot1.get_x(), plot1.get_y(), plot2.get_y(), color='grey', alpha=0.3)
+    try:
+        x_data, y1_data, y2_data = align_plots(plot1, plot2, alignment, step)
+    except ValueError as error:
+        logger.log(logging.ERROR, "[Graph] " + str(error))
+        return
+
+    points = axes_points(ax)
+    if len(x_data) > points:
+        # the rows of the minimum and the maximum values of both plots (the filled area is the same at this resolution)
+        rows = np.arange(len(x_data))
+        rows = np.union1d(minmax_decimate(rows, y1_data, points)[0], minmax_decimate(rows, y2_data, points)[0])
+        x_data, y1_data, y2_data = x_data[rows], y1_data[rows], y2_data[rows]
+    ax.fill_between(x_data, y1_data, y2_data, color='grey', alpha=0.3)
     ax.legend(loc='upper center', bbox_to_anchor=(1.05, 0.75), ncol=1, fancybox=True)
 
 
@@ -278,9 +380,10 @@ def graph_compare_plot_diff_from_fieldnames(ax, manager, x_fieldname, y_fieldnam
         graph_compare_plot_diff(ax, plots[0], plots[1], marker)
     else:
         logger.log(logging.ERROR, "[Graph] You can only compare two graphs (" + str(len(plots)) + " given)")
+    _release_plots(plots)
 
 
-def graph_compare_plot_diff(ax, plot1, plot2, marker="."):
+def graph_compare_plot_diff(ax, plot1, plot2, marker=".", decimation="minmax", alignment="union", step=None):
     """ Plot the diff between two plots
 
     Parameters
@@ -293,20 +396,28 @@ def graph_compare_plot_diff(ax, plot1, plot2, marker="."):
         the second plot to compare
     marker : string
         the style of the marker to plot
+    decimation : str
+        the decimation of the diff with more points than pixels ('minmax', 'lttb' or None)
+    alignment : str
+        the common x values of the plots if they do not have the same x values ('union', 'intersection' or 'step')
+    step : float
+        the step of the common x values (alignment 'step' only)
     """
     logger.log(logging.INFO, "[Graph] Display compare graph")
-    diff = []
-    compar_dif = []
-    for ii in range(len(plot1.get_x())):
-        diff.append(abs(plot1.get_y()[ii] - plot2.get_y()[ii]))
-        compar_dif.append(0)
+    try:
+        x_data, diff = _compare_diff(plot1, plot2, alignment, step)
+    except ValueError as error:
+        logger.log(logging.ERROR, "[Graph] " + str(error))
+        return
+    x_data, diff = decimate(x_data, diff, axes_points(ax), decimation)
+    compar_dif = np.zeros(len(diff))
 
     label = "Difference between plots"
 
-    ax.plot(plot1.get_x(), diff, label=label, alpha=0.50, marker=marker)
-    ax.plot(plot1.get_x(), compar_dif, alpha=0.50, marker=marker)
+    ax.plot(x_data, diff, label=label, alpha=0.50, marker=marker)
+    ax.plot(x_data, compar_dif, alpha=0.50, marker=marker)
 
-    ax.fill_between(plot1.get_x(), diff, compar_dif, color='red', alpha=0.3)
+    ax.fill_between(x_data, diff, compar_dif, color='red', alpha=0.3)
 
 
 def graph_compare_plot_values_from_fieldnames(ax, manager, x_fieldname, y_fieldnames, threshold, on_graph):
@@ -332,11 +443,16 @@ def graph_compare_plot_values_from_fieldnames(ax, manager, x_fieldname, y_fieldn
         graph_compare_plot_values(ax, plots[0], plots[1], threshold, on_graph)
     else:
         logger.log(logging.ERROR, "[Graph] You can only compare two graphs (" + str(len(plots)) + " given)")
+    _release_plots(plots)
 
 
-def graph_compare_plot_values(ax, plot1, plot2, threshold, on_graph, round_value=2):
+def graph_compare_plot_values(ax, plot1, plot2, threshold, on_graph, round_value=2, label_spacing=LABEL_SPACING,
+                              max_labels=MAX_LABELS, alignment="union", step=None):
     """ Plot the diff values between two plots
 
+    Only the values in the visible range of x values are printed, with at most one value (the largest) per
+    label_spacing pixels. The values are printed again when the axis is zoomed or panned.
+
     Parameters
     ----------
     ax : Axis
@@ -351,19 +467,183 @@ def graph_compare_plot_values(ax, plot1, plot2, threshold, on_graph, round_value
         plot on graph or on the x axis
     round_value : int
         the number of decimal to use
+    label_spacing : int
+        the minimum space between two values in pixels
+    max_labels : int
+        the maximum number of values printed
+    alignment : str
+        the common x values of the plots if they do not have the same x values ('union', 'intersection' or 'step')
+    step : float
+        the step of the common x values (alignment 'step' only)
     """
     logger.log(logging.INFO, "[Graph] Display compare values")
-    for ii in range(len(plot1.get_x())):
-        value = abs(plot1.get_y()[ii] - plot2.get_y()[ii])
-        if value > threshold:
-            y_pos = 0
-            if on_graph:
-                y_pos = value
+    try:
+        x_data, diff = _compare_diff(plot1, plot2, alignment, step)
+    except ValueError as error:
+        logger.log(logging.ERROR, "[Graph] " + str(error))
+        return
+    with np.errstate(invalid='ignore'):
+        rows = np.flatnonzero(diff > threshold)
+    if on_graph:
+        y_pos = diff[rows]
+    else:
+        # the values on the x axis are printed on two lines
+        y_pos = np.where(rows % 2 == 1, -0.40, 0.0)
+
+    texts = []
+    labels = (x_data[rows], y_pos, diff[rows])
+    _update_value_labels(ax, texts, labels, round_value, label_spacing, max_labels)
+    ax.callbacks.connect('xlim_changed', lambda axis: _update_value_labels(axis, texts, labels, round_value,
+                                                                           label_spacing, max_labels))
+
+
+def graph_from_chunks(ax, manager, chunks, x_fieldname, y_fieldnames, marker=".", decimation="minmax"):
+    """ Plot multiple data from fieldnames chunk by chunk (streaming mode)
+
+    Parameters
+    ----------
+    ax : Axis
+        the matplotlib axis object
+    manager : DataManager
+        the data manager streaming the chunks (used for the units)
+    chunks : generator(dict)
+        the chunks of data ({field name : numpy array}) from DataManager.read_csv_chunks
+    x_fieldname : str
+        the fieldname of the x-axis variable to plot
+    y_fieldnames : list(str)
+        the list of fieldname of the y-axis variable to plot
+    marker : string
+        the style of the marker to plot
+    decimation : str
+        the decimation of the series with more points than pixels ('minmax', 'lttb' or None)
+    """
+    logger.log(logging.INFO, "[Graph] Graph from chunks")
+    lines = {}
+    previous = None
+    points = axes_points(ax)
+    for chunk in chunks:
+        if x_fieldname not in chunk or any(y_fieldname not in chunk for y_fieldname in y_fieldnames):
+            logger.log(logging.ERROR, "[Graph] Error field name does not exist (graph from chunks)")
+            return
+
+        for y_fieldname in y_fieldnames:
+            x_data = chunk[x_fieldname]
+            y_data = chunk[y_fieldname]
+            if previous is not None:
+                # start the segment on the last point of the previous chunk to keep the line continuous
+                x_data = np.concatenate((previous[x_fieldname][-1:], x_data))
+                y_data = np.concatenate((previous[y_fieldname][-1:], y_data))
+            x_data, y_data = decimate(x_data, y_data, points, decimation)
+
+            if y_fieldname in lines:
+                ax.plot(x_data, y_data, color=lines[y_fieldname].get_color(), alpha=0.50, marker=marker)
             else:
-                if ii % 2 == 1:
-                    y_pos -= 0.40
+                label = y_fieldname + " [" + manager.get_unit_from_field_name(y_fieldname) + "]"
+                lines[y_fieldname] = ax.plot(x_data, y_data, label=label, alpha=0.50, marker=marker)[0]
+
+        if len(chunk[x_fieldname]) > 0:
+            previous = chunk
 
-            ax.text(plot1.get_x()[ii] - 0.1, y_pos, round(value, round_value), size=8)
+    if lines:
+        ax.set_xlabel(x_fieldname + " [" + manager.get_unit_from_field_name(x_fieldname) + "]")
+        ax.legend(loc='upper center', bbox_to_anchor=(1.05, 0.75), ncol=1, fancybox=True)
+
+
+def graph_compare_plot_diff_from_chunks(ax, chunks, x_fieldname, y_fieldnames, marker=".", decimation="minmax"):
+    """ Plot the diff between two fields chunk by chunk (streaming mode)
+
+    Parameters
+    ----------
+    ax : Axis
+        the matplotlib axis object
+    chunks : generator(dict)
+        the chunks of data ({field name : numpy array}) from DataManager.read_csv_chunks
+    x_fieldname : str
+        the fieldname of the x-axis variable to plot
+    y_fieldnames : list(str)
+        the list of fieldname of the y-axis variable for the two plots to compare
+    marker : string
+        the style of the marker to plot
+    decimation : str
+        the decimation of the series with more points than pixels ('minmax', 'lttb' or None)
+    """
+    if len(y_fieldnames) != 2:
+        logger.log(logging.ERROR, "[Graph] You can only compare two graphs (" + str(len(y_fieldnames)) + " given)")
+        return
+
+    logger.log(logging.INFO, "[Graph] Display compare graph from chunks")
+    line = None
+    previous = None
+    points = axes_points(ax)
+    for chunk in chunks:
+        if x_fieldname not in chunk or any(y_fieldname not in chunk for y_fieldname in y_fieldnames):
+            logger.log(logging.ERROR, "[Graph] Error field name does not exist (compare graph from chunks)")
+            return
+
+        x_data = chunk[x_fieldname]
+        diff = np.abs(chunk[y_fieldnames[0]] - chunk[y_fieldnames[1]])
+        if previous is not None:
+            # start the segment on the last point of the previous chunk to keep the line continuous
+            x_data = np.concatenate((previous[0], x_data))
+            diff = np.concatenate((previous[1], diff))
+        if len(chunk[x_fieldname]) > 0:
+            previous = (x_data[-1:], diff[-1:])
+        x_data, diff = decimate(x_data, diff, points, decimation)
+
+        compar_dif = np.zeros(len(diff))
+        if line is None:
+            line = ax.plot(x_data, diff, label="Difference between plots", alpha=0.50, marker=marker)[0]
+        else:
+            ax.plot(x_data, diff, color=line.get_color(), alpha=0.50, marker=marker)
+        ax.plot(x_data, compar_dif, color='grey', alpha=0.50, marker=marker)
+        ax.fill_between(x_data, diff, compar_dif, color='red', alpha=0.3)
+
+
+def statistics_from_chunks(chunks, fieldnames):
+    """ Compute the statistics (count, min, max, mean, std) of fields chunk by chunk (streaming mode)
+
+    The statistics of each chunk are merged with the statistics of the previous chunks (nan values are ignored).
+
+    Parameters
+    ----------
+    chunks : generator(dict)
+        the chunks of data ({field name : numpy array}) from DataManager.read_csv_chunks
+    fieldnames : list(str)
+        the list of fieldname
+
+    Returns
+    ------
+    dict
+        the statistics of each field ({field name : {'count', 'min', 'max', 'mean', 'std'}})
+    """
+    logger.log(logging.INFO, "[Graph] Statistics from chunks")
+    statistics = {fieldname: {'count': 0, 'min': np.nan, 'max': np.nan, 'mean': np.nan, 'm2': 0.0}
+                  for fieldname in fieldnames}
+    for chunk in chunks:
+        for fieldname in fieldnames:
+            values = np.asarray(chunk[fieldname], dtype=np.float64)
+            values = values[~np.isnan(values)]
+            if values.size == 0:
+                continue
+
+            stats = statistics[fieldname]
+            count = stats['count'] + values.size
+            mean = values.mean()
+            if stats['count'] == 0:
+                stats['min'], stats['max'], stats['mean'] = float(values.min()), float(values.max()), float(mean)
+                stats['m2'] = float(np.square(values - mean).sum())
+            else:
+                delta = mean - stats['mean']
+                stats['min'] = min(stats['min'], float(values.min()))
+                stats['max'] = max(stats['max'], float(values.max()))
+                stats['m2'] += np.square(values - mean).sum() + delta * delta * stats['count'] * values.size / count
+                stats['mean'] += float(delta * values.size / count)
+            stats['count'] = count
+
+    for stats in statistics.values():
+        m2 = stats.pop('m2')
+        stats['std'] = float(np.sqrt(m2 / stats['count'])) if stats['count'] > 0 else np.nan
+    return statistics
 
 
 def graph_clear(ax):
@@ -377,9 +657,13 @@ def graph_clear(ax):
     ax.clear()
 
 
-def plot(ax, plots_to_display, marker="."):
+def plot(ax, plots_to_display, marker=".", decimation="minmax"):
     """  Plot in matplotlib object
 
+    The series with more points than the width of the axis in pixels are decimated (min-max or LTTB), the plots keep
+    all their points. With the min-max decimation, the series sorted by x are read from their level of detail pyramid
+    and the lines are updated with the visible range when the axis is zoomed or panned.
+
     Parameters
     ----------
     ax : Axis
@@ -388,12 +672,206 @@ def plot(ax, plots_to_display, marker="."):
         the list of plots to plot
     marker : string
         the style of the marker to plot
+    decimation : str
+        the decimation of the series with more points than pixels ('minmax', 'lttb' or None)
     """
 
     ax.set_xlabel(plots_to_display[0].get_x_axis() + " [" + plots_to_display[0].get_x_unit() + "]")
 
     for plot_tm in plots_to_display:
-        label = plot_tm.get_y_axis() + " [" + plot_tm.get_y_unit() + "]"
-        ax.plot(plot_tm.get_x(), plot_tm.get_y(), label=label, alpha=0.50, marker=marker)
+        graph_add_plot(ax, plot_tm, marker, decimation)
 
     ax.legend(loc='upper center', bbox_to_anchor=(1.05, 0.75), ncol=1, fancybox=True)
+
+
+def graph_add_plot(ax, plot_tm, marker=".", decimation="minmax"):
+    """ Add the line of a plot in a matplotlib object (the legend is not updated)
+
+    Parameters
+    ----------
+    ax : Axis
+        the matplotlib axis object
+    plot_tm : Plot
+        the plot
+    marker : string
+        the style of the marker to plot
+    decimation : str
+        the decimation of the series with more points than pixels ('minmax', 'lttb' or None)
+
+    Returns
+    ------
+    tuple(Line2D, int)
+        the line and the id of the callback updating the line when the axis is zoomed (None if there is no callback)
+    """
+    label = plot_tm.get_y_axis() + " [" + plot_tm.get_y_unit() + "]"
+    points = axes_points(ax)
+    pyramid = plot_tm.get_pyramid() if decimation == "minmax" else None
+    if pyramid is not None:
+        x_data, y_data = pyramid.get_range(None, None, points)
+    else:
+        x_data, y_data = decimate(plot_tm.get_x(), plot_tm.get_y(), points, decimation)
+    line = ax.plot(x_data, y_data, label=label, alpha=0.50, marker=marker)[0]
+
+    callback_id = None
+    if pyramid is not None:
+        callback_id = ax.callbacks.connect('xlim_changed', lambda axis: graph_zoom_lines(axis, [(line, pyramid)]))
+    return line, callback_id
+
+
+def graph_remove_plot(ax, line, callback_id=None):
+    """ Remove the line of a plot from a matplotlib object (the legend is not updated)
+
+    Parameters
+    ----------
+    ax : Axis
+        the matplotlib axis object
+    line : Line2D
+        the line of the plot
+    callback_id : int
+        the id of the callback updating the line when the axis is zoomed (None if there is no callback)
+    """
+    if line.axes is ax:
+        line.remove()
+    if callback_id is not None:
+        ax.callbacks.disconnect(callback_id)
+
+
+def graph_unzoom_plot(ax, line, plot_tm):
+    """ Set the data of the line of a plot read from its pyramid to the whole range of the plot (before autoscaling
+    the axis)
+
+    Parameters
+    ----------
+    ax : Axis
+        the matplotlib axis object
+    line : Line2D
+        the line of the plot
+    plot_tm : Plot
+        the plot
+    """
+    pyramid = plot_tm.get_pyramid()
+    if pyramid is not None:
+        line.set_data(*pyramid.get_range(None, None, axes_points(ax)))
+
+
+def graph_set_marker(lines, marker="."):
+    """ Change the marker of lines (the lines are not drawn again)
+
+    Parameters
+    ----------
+    lines : list(Line2D)
+        the lines
+    marker : string
+        the style of the marker to plot
+    """
+    for line in lines:
+        line.set_marker(marker)
+
+
+def graph_update_legend(ax):
+    """ Update the legend with the visible lines (the legend is removed if no line is visible)
+
+    Parameters
+    ----------
+    ax : Axis
+        the matplotlib axis object
+    """
+    lines = [line for line in ax.get_lines() if line.get_visible() and not line.get_label().startswith("_")]
+    if lines:
+        ax.legend(handles=lines, loc='upper center', bbox_to_anchor=(1.05, 0.75), ncol=1, fancybox=True)
+    elif ax.get_legend() is not None:
+        ax.get_legend().remove()
+
+
+def graph_zoom_lines(ax, zoom_lines):
+    """ Update the lines of a matplotlib axis to the visible range of x values (triggered when the x limits change)
+
+    Parameters
+    ----------
+    ax : Axis
+        the matplotlib axis object
+    zoom_lines : list(tuple(Line2D, LodPyramid))
+        the lines and the pyramids of their data
+    """
+    x_min, x_max = sorted(ax.get_xlim())
+    points = axes_points(ax)
+    for line, pyramid in zoom_lines:
+        if line.axes is ax:
+            line.set_data(*pyramid.get_range(x_min, x_max, points))
+
+
+def _compare_diff(plot1, plot2, alignment="union", step=None):
+    """ Compute the absolute difference between the values of two plots
+
+    Parameters
+    ----------
+    plot1 : Plot
+        the first plot to compare
+    plot2 : Plot
+        the second plot to compare
+    alignment : str
+        the common x values of the plots if they do not have the same x values ('union', 'intersection' or 'step')
+    step : float
+        the step of the common x values (alignment 'step' only)
+
+    Returns
+    ------
+    tuple(numpy.ndarray, numpy.ndarray)
+        the common x values and the absolute difference between the values of the plots on these x values
+    """
+    x_data, y1_data, y2_data = align_plots(plot1, plot2, alignment, step)
+    return x_data, np.abs(y1_data - y2_data)
+
+
+def _update_value_labels(ax, texts, labels, round_value, label_spacing, max_labels):
+    """ Print the diff values in the visible range of x values (the previously printed values are removed)
+
+    Parameters
+    ----------
+    ax : Axis
+        the matplotlib axis object
+    texts : list(Text)
+        the printed values (updated)
+    labels : tuple(numpy.ndarray, numpy.ndarray, numpy.ndarray)
+        the x and y positions and the diff values above the threshold
+    round_value : int
+        the number of decimal to use
+    label_spacing : int
+        the minimum space between two values in pixels
+    max_labels : int
+        the maximum number of values printed
+    """
+    for text in texts:
+        if text.axes is ax:
+            text.remove()
+    texts.clear()
+
+    x_pos, y_pos, values = labels
+    x_min, x_max = sorted(ax.get_xlim())
+    with np.errstate(invalid='ignore'):
+        rows = np.flatnonzero((x_pos >= x_min) & (x_pos <= x_max))
+    if len(rows) == 0:
+        return
+
+    # the largest value of each bucket of label_spacing pixels, then the largest values if there are too many
+    pixels = ax.transData.transform(np.column_stack((x_pos[rows], y_pos[rows])))[:, 0]
+    buckets = np.floor((pixels - pixels.min()) / max(label_spacing, 1)).astype(np.int64)
+    order = np.lexsort((-values[rows], buckets))
+    rows = rows[order[np.unique(buckets[order], return_index=True)[1]]]
+    if len(rows) > max_labels:
+        rows = rows[np.argpartition(-values[rows], max_labels)[:max_labels]]
+
+    for row in np.sort(rows):
+        texts.append(ax.text(x_pos[row] - 0.1, y_pos[row], round(float(values[row]), round_value), size=8))
+
+
+def _release_plots(plots):
+    """ Remove the plots created to draw a graph from the registry of PlotCreator (the lines keep their data)
+
+    Parameters
+    ----------
+    plots : list(plot)
+        the plots
+    """
+    for plot_tm in plots:
+        PlotCreator.get_instance().release_plot(plot_tm.get_plot_id())
@@ -0,0 +1,160 @@
+#!/usr/bin/python
+# coding: utf-8
+
+""" This file contains the LodPyramid class (level of detail of a series) """
+
+import numpy as np
+
+from ranalysis.data.zonemap import column_sortedness, ASCENDING
+from ranalysis.plot.decimation import minmax_bounds
+
+BUCKET_FACTOR = 4
+MIN_LEVEL_BUCKETS = 256
+
+
+class LodPyramid:
+    """ A class used to get the points of a series to plot in a range of x values at the resolution of the graph
+
+    The pyramid stores the rows of the minimum and the maximum values of the buckets of points of the series at several
+    levels (buckets of 4, 16, 64, ... points). The points of a range of x values are read from the coarsest level which
+    keeps a minimum and a maximum value per pixel, the series itself is only read for small ranges.
+
+    Attributes
+    ----------
+    __x : numpy.ndarray
+        the x data (sorted)
+    __y : numpy.ndarray
+        the y data
+    __levels : list(tuple(int, numpy.ndarray, numpy.ndarray))
+        the levels of the pyramid from the finest to the coarsest (bucket size, rows of the minimum and the maximum
+        values of each bucket)
+
+    Methods
+    -------
+    is_supported(x, y)
+        check if a pyramid can be built for a series
+    get_levels()
+        get the bucket sizes of the levels
+    get_range(x_min, x_max, points)
+        get the points to plot in a range of x values
+    """
+
+    def __init__(self, x, y, factor=BUCKET_FACTOR):
+        """ LodPyramid constructor (the levels are built from the series)
+
+        Parameters
+        ----------
+        x : list or numpy.ndarray
+            the x data (sorted in ascending order)
+        y : list or numpy.ndarray
+            the numeric y data
+        factor : int
+            the number of buckets of a level merged in a bucket of the next level
+        """
+        self.__x = np.asarray(x)
+        self.__y = np.asarray(y)
+        self.__levels = []
+
+        low, high = minmax_bounds(self.__y)
+        min_rows = max_rows = np.arange(len(self.__y))
+        bucket_size = 1
+        while len(min_rows) > MIN_LEVEL_BUCKETS:
+            bucket_size *= factor
+            min_rows = _reduce_buckets(min_rows, low, np.argmin, factor)
+            max_rows = _reduce_buckets(max_rows, high, np.argmax, factor)
+            self.__levels.append((bucket_size, min_rows, max_rows))
+
+    @staticmethod
+    def is_supported(x, y):
+        """ Check if a pyramid can be built for a series (numeric data sorted by x)
+
+        Parameters
+        ----------
+        x : list or numpy.ndarray
+            the x data
+        y : list or numpy.ndarray
+            the y data
+
+        Returns
+        ------
+        bool
+            true if the series is numeric and sorted in ascending order of x, false otherwise
+        """
+        x = np.asarray(x)
+        y = np.asarray(y)
+        return len(x) == len(y) and x.dtype.kind in 'biuf' and y.dtype.kind in 'biuf' \
+            and column_sortedness(x) == ASCENDING
+
+    def get_levels(self):
+        """ Get the bucket sizes of the levels
+
+        Returns
+        ------
+        list(int)
+            the number of points of the series in a bucket of each level (from the finest to the coarsest)
+        """
+        return [level[0] for level in self.__levels]
+
+    def get_range(self, x_min, x_max, points):
+        """ Get the points to plot in a range of x values (with the points just outside of the range to draw the
+        lines up to the borders of the graph)
+
+        Parameters
+        ----------
+        x_min : float
+            the minimum x value (None for the first point)
+        x_max : float
+            the maximum x value (None for the last point)
+        points : int
+            the maximum number of points
+
+        Returns
+        ------
+        tuple(numpy.ndarray, numpy.ndarray)
+            the x and y data of the range (all the points if there are less than the maximum number of points, the
+            minimum and the maximum values of the buckets of a level otherwise)
+        """
+        count = len(self.__x)
+        start = 0 if x_min is None else max(int(np.searchsorted(self.__x, x_min, 'left')) - 1, 0)
+        end = count if x_max is None else min(int(np.searchsorted(self.__x, x_max, 'right')) + 1, count)
+        if end - start <= points or not self.__levels:
+            return self.__x[start:end], self.__y[start:end]
+
+        bucket_size, min_rows, max_rows = self.__levels[-1]
+        for level in self.__levels:
+            if 2 * (end - start) <= points * level[0]:
+                bucket_size, min_rows, max_rows = level
+                break
+        first, last = start // bucket_size, -(-end // bucket_size)
+        min_rows = min_rows[first:last]
+        max_rows = max_rows[first:last]
+        # the two points of each bucket are kept in the order of the series
+        rows = np.stack((np.minimum(min_rows, max_rows), np.maximum(min_rows, max_rows)), axis=1).ravel()
+        return self.__x[rows], self.__y[rows]
+
+
+def _reduce_buckets(rows, values, reducer, factor):
+    """ Merge the buckets of a level into the buckets of the next level
+
+    Parameters
+    ----------
+    rows : numpy.ndarray
+        the rows of the minimum (or maximum) values of the buckets of the level
+    values : numpy.ndarray
+        the values of the series
+    reducer : function
+        numpy.argmin or numpy.argmax
+    factor : int
+        the number of buckets merged
+
+    Returns
+    ------
+    numpy.ndarray
+        the rows of the minimum (or maximum) values of the buckets of the next level
+    """
+    padding = -len(rows) % factor
+    if padding:
+        # the last bucket is completed with its last row
+        rows = np.concatenate((rows, np.repeat(rows[-1:], padding)))
+    groups = rows.reshape(-1, factor)
+    return groups[np.arange(len(groups)), reducer(values[groups], axis=1)]
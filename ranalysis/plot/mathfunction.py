@@ -0,0 +1,150 @@
+#!/usr/bin/python
+# coding: utf-8
+
+""" This file can be imported as a module and contains the math function compiler :
+
+    * compile_function - compile a math expression of x into a vectorized numpy function
+
+    The expression is parsed once (only the allowed words can be used), its constant parts are computed at compile time
+    and it is compiled into a function evaluating the expression on a whole numpy array. The compiled functions are kept
+    in a LRU cache.
+"""
+
+import ast
+from functools import lru_cache
+
+import numpy as np
+
+FUNCTION_CACHE_SIZE = 128
+VARIABLE = "x"
+
+FUNCTIONS = {
+    'sin': np.sin,
+    'cos': np.cos,
+    'tan': np.tan,
+    'arcsin': np.arcsin,
+    'arccos': np.arccos,
+    'arctan': np.arctan,
+    'exp': np.exp,
+    'ln': np.log,
+    'sqrt': np.sqrt,
+    'mod': np.mod,
+    'round': np.round
+}
+
+CONSTANTS = {
+    'pi': np.pi
+}
+
+_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod, ast.UAdd, ast.USub)
+_NAMESPACE = dict(FUNCTIONS, __builtins__={})
+
+
+@lru_cache(maxsize=FUNCTION_CACHE_SIZE)
+def compile_function(string_function):
+    """ Compile a math expression of x into a vectorized numpy function (ex: 2*sin(x)^2 + exp(-x/pi))
+
+    Parameters
+    ----------
+    string_function : str
+        the math expression
+
+    Returns
+    ------
+    function
+        the math function (called with a numpy array of x values, it returns the numpy array of the values)
+
+    Raises
+    ------
+    ValueError
+        if the expression is not valid or uses forbidden words, if its constant parts cannot be computed (the function
+        raises ValueError if the expression cannot be computed on the x values)
+    """
+    try:
+        tree = ast.parse(string_function.replace("^", "**").strip(), mode='eval')
+    except SyntaxError as error:
+        raise ValueError('Invalid math expression "{}": {}'.format(string_function, error.msg))
+
+    functions = [node.func for node in ast.walk(tree) if isinstance(node, ast.Call)]
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            if node.id != VARIABLE and node.id not in FUNCTIONS and node.id not in CONSTANTS:
+                raise ValueError('"{}" is forbidden to use in math expression'.format(node.id))
+            if (node.id in FUNCTIONS) != any(node is function for function in functions):
+                raise ValueError('Invalid use of "{}" in math expression'.format(node.id))
+        elif isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.keywords:
+                raise ValueError('Invalid function call in math expression "{}"'.format(string_function))
+        elif isinstance(node, ast.Constant):
+            if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+                raise ValueError('"{}" is forbidden to use in math expression'.format(node.value))
+        elif not isinstance(node, (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Load) + _OPERATORS):
+            raise ValueError('"{}" is forbidden to use in math expression'.format(type(node).__name__))
+
+    try:
+        tree = ast.fix_missing_locations(_ConstantFolder().visit(tree))
+    except (ArithmeticError, TypeError) as error:
+        raise ValueError('Invalid math expression "{}": {}'.format(string_function, error))
+    code = compile(tree, "<math function>", 'eval')
+
+    def func(x):
+        x = np.asarray(x, dtype=np.float64)
+        try:
+            with np.errstate(all='ignore'):
+                values = np.asarray(eval(code, _NAMESPACE, {VARIABLE: x}), dtype=np.float64)
+        except (ArithmeticError, TypeError) as error:
+            raise ValueError('Invalid math expression "{}": {}'.format(string_function, error))
+        # a constant expression gives one value for all the x values
+        return np.full(x.shape, values) if values.shape != x.shape else values
+
+    return func
+
+
+class _ConstantFolder(ast.NodeTransformer):
+    """ A class used to replace the constants and the operations on constants of an expression by their values """
+
+    def visit_Name(self, node):
+        """ Replace a constant by its value
+
+        Parameters
+        ----------
+        node : ast.Name
+            the name node
+
+        Returns
+        ------
+        ast.AST
+            the value of the constant or the name node
+        """
+        if node.id in CONSTANTS:
+            return ast.copy_location(ast.Constant(CONSTANTS[node.id]), node)
+        return node
+
+    def generic_visit(self, node):
+        """ Replace an operation or a function call on constants by its value
+
+        Parameters
+        ----------
+        node : ast.AST
+            the node
+
+        Returns
+        ------
+        ast.AST
+            the value of the operation or the node
+        """
+        node = super().generic_visit(node)
+        if isinstance(node, ast.BinOp):
+            operands = [node.left, node.right]
+        elif isinstance(node, ast.UnaryOp):
+            operands = [node.operand]
+        elif isinstance(node, ast.Call):
+            operands = node.args
+        else:
+            return node
+        if not all(isinstance(operand, ast.Constant) for operand in operands):
+            return node
+        expression = ast.fix_missing_locations(ast.Expression(node))
+        with np.errstate(all='ignore'):
+            value = eval(compile(expression, "<constant>", 'eval'), _NAMESPACE)
+        return ast.copy_location(ast.Constant(float(value)), node)
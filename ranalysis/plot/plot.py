@@ -3,6 +3,11 @@
 
 """ This file contains the Plot class """
 
+import numpy as np
+
+from ranalysis.data.zonemap import column_sortedness, ASCENDING
+from ranalysis.plot.lodpyramid import LodPyramid
+
 
 class Plot:
     """ A class used to represent a Plot
@@ -15,9 +20,9 @@ class Plot:
         the plot id (unique)
     __name : str
         the name of the plot
-    __x :  list (int, float, ...)
+    __x :  list (int, float, ...) or numpy.ndarray
         list of data (x-axis)
-    __y : list (int, float, ...)
+    __y : list (int, float, ...) or numpy.ndarray
         list of data (y-axis)
     __x_axis : str
         the label of the x-axis ("")
@@ -27,6 +32,17 @@ class Plot:
         the unit of the x-axis ("")
     __y_unit : str
         the unit of the x-axis ("")
+    __where : str
+        the filter expression of the rows of the plot ("" if all the rows are plotted)
+    __x_range : tuple(float, float)
+        the range (min, max) of the x values of the plot (None if all the values are plotted)
+    __sampling : dict
+        the sampling of the function of the plot ('xmin', 'xmax', 'discr', 'adaptive', 'tolerance', 'max_points', None
+        if the plot is not created from a function)
+    __pyramid : LodPyramid
+        the level of detail pyramid of the data (built the first time it is asked, None if it is not built)
+    __order : numpy.ndarray
+        the indexes sorting the data by x (computed the first time it is asked, None if it is not computed)
 
     Methods
     -------
@@ -38,6 +54,22 @@ class Plot:
         set function of the plot
     use_function()
         return a boolean of the use of a function
+    get_where()
+        return the filter expression of the plot (str)
+    set_where(where)
+        set the filter expression of the plot
+    get_x_range()
+        return the range of the x values of the plot (tuple)
+    set_x_range(x_range)
+        set the range of the x values of the plot
+    get_sampling()
+        return the sampling of the function of the plot (dict)
+    set_sampling(sampling)
+        set the sampling of the function of the plot
+    get_pyramid()
+        return the level of detail pyramid of the data (LodPyramid)
+    get_sorted_data()
+        return the x and y data sorted by x (tuple)
     get_x()
         return x data (list)
     set_x(x_data)
@@ -63,9 +95,9 @@ class Plot:
         ----------
         plot_id : int
             the plot id (unique)
-        x :  list (int, float, ...)
+        x :  list (int, float, ...) or numpy.ndarray
             list of data (x-axis)
-        y : list (int, float, ...)
+        y : list (int, float, ...) or numpy.ndarray
             list of data (y-axis)
         x_axis : str
             the label of the x-axis ("")
@@ -84,6 +116,11 @@ class Plot:
         self.__y_axis = y_axis
         self.__x_unit = x_unit
         self.__y_unit = y_unit
+        self.__where = ""
+        self.__x_range = None
+        self.__sampling = None
+        self.__pyramid = None
+        self.__order = None
 
     def __str__(self):
         """ Stringify plot object
@@ -93,7 +130,10 @@ class Plot:
         str
             a stringify version of the plot
         """
-        return "id=" + str(self.__plot_id) + " | f(" + self.__x_axis + ") = " + self.__y_axis
+        stringify = "id=" + str(self.__plot_id) + " | f(" + self.__x_axis + ") = " + self.__y_axis
+        if self.__where != "":
+            stringify += " | where " + self.__where
+        return stringify
 
     def get_plot_id(self):
         """ Get plot id
@@ -138,6 +178,98 @@ class Plot:
         else:
             return True
 
+    def get_where(self):
+        """ Get the filter expression
+
+        Returns
+        ------
+        str
+            the filter expression of the rows of the plot ("" if all the rows are plotted)
+        """
+        return self.__where
+
+    def set_where(self, where):
+        """ Set the filter expression
+
+        Parameters
+        ------
+        where
+            the filter expression
+        """
+        self.__where = where
+
+    def get_x_range(self):
+        """ Get the range of the x values
+
+        Returns
+        ------
+        tuple(float, float)
+            the range (min, max) of the x values of the plot (None if all the values are plotted)
+        """
+        return self.__x_range
+
+    def set_x_range(self, x_range):
+        """ Set the range of the x values
+
+        Parameters
+        ------
+        x_range
+            the range (min, max) of the x values
+        """
+        self.__x_range = x_range
+
+    def get_sampling(self):
+        """ Get the sampling of the function
+
+        Returns
+        ------
+        dict
+            the sampling of the function of the plot (None if the plot is not created from a function)
+        """
+        return self.__sampling
+
+    def set_sampling(self, sampling):
+        """ Set the sampling of the function
+
+        Parameters
+        ------
+        sampling
+            the sampling of the function ('xmin', 'xmax', 'discr', 'adaptive', 'tolerance', 'max_points')
+        """
+        self.__sampling = sampling
+
+    def get_pyramid(self):
+        """ Get the level of detail pyramid of the data (built once, when it is first asked)
+
+        Returns
+        ------
+        LodPyramid
+            the pyramid of the data (None if the data is not numeric or not sorted by x)
+        """
+        if self.__pyramid is None and LodPyramid.is_supported(self.__x, self.__y):
+            self.__pyramid = LodPyramid(self.__x, self.__y)
+        return self.__pyramid
+
+    def get_sorted_data(self):
+        """ Get the x and y data sorted by x (the argsort of the x data is computed once, when it is first asked)
+
+        Returns
+        ------
+        tuple(numpy.ndarray, numpy.ndarray)
+            the x and y data sorted in ascending order of x (the data itself if it is already sorted)
+        """
+        x_data = np.asarray(self.__x)
+        y_data = np.asarray(self.__y)
+        if self.__order is None:
+            if column_sortedness(x_data) == ASCENDING:
+                # an empty order stands for sorted data (no copy)
+                self.__order = np.arange(0)
+            else:
+                self.__order = np.argsort(x_data, kind='stable')
+        if len(self.__order) == 0:
+            return x_data, y_data
+        return x_data[self.__order], y_data[self.__order]
+
     def get_x(self):
         """ Get x data
 
@@ -157,6 +289,8 @@ class Plot:
             the x data
         """
         self.__x = x_data
+        self.__pyramid = None
+        self.__order = None
 
     def get_y(self):
         """ Get y data
@@ -177,6 +311,8 @@ class Plot:
             the y data
         """
         self.__y = y_data
+        self.__pyramid = None
+        self.__order = None
 
     def get_x_axis(self):
         """ Get x axis label
@@ -227,8 +363,13 @@ class Plot:
             the plot with data to use
         """
         self.__function = plot.get_function()
+        self.__where = plot.get_where()
+        self.__x_range = plot.get_x_range()
+        self.__sampling = plot.get_sampling()
         self.__x = plot.get_x()
         self.__y = plot.get_y()
+        self.__pyramid = None
+        self.__order = None
         self.__x_axis = plot.get_x_axis()
         self.__y_axis = plot.get_y_axis()
         self.__x_unit = plot.get_x_unit()
@@ -4,11 +4,13 @@
 """ This file contains the singleton PlotCreator class """
 
 import logging
-import re
+import os
 import numpy as np
 
 from ranalysis.log.loghandler import logger
+from ranalysis.plot.mathfunction import compile_function
 from ranalysis.plot.plot import Plot
+from ranalysis.plot.sampling import adaptive_sampling, DEFAULT_TOLERANCE, DEFAULT_MAX_POINTS
 
 
 class PlotCreator:
@@ -17,7 +19,9 @@ class PlotCreator:
     Attributes
     ----------
     __plots_dict : dict
-        the dictionary used to store plot {id : plot}
+        the registry of the plots {id : plot} (the plot id is the handle of the plot, a released plot is removed)
+    __owners : dict
+        the ids of the plots of each owner {owner : set(id)} (a tab of the GUI for instance)
     __counter :  int
         the counter used to create plot id
 
@@ -29,22 +33,36 @@ class PlotCreator:
         return a math function from a string
     get_plots_dict()
         return the plot dictionary
-    get_plot_from_stringify(plot_stringify):
-        return plot from its stringify version
     get_plot_from_id(plot_id)
         return a plot from the dictionary according to its id
-    plot_from_fieldname(data_manager, x_data_name, y_data_name)
+    set_owner(plot_id, owner)
+        set the owner of a plot
+    get_plot_ids(owner=None)
+        return the ids of the plots (of an owner)
+    release_plot(plot_id)
+        remove a plot from the registry
+    release_owner(owner)
+        remove the plots of an owner from the registry
+    plot_from_function_adaptive(function, xmin, xmax, tolerance, max_points, xlabel="", ylabel="")
+        create a plot from a mathematic function with an adaptive sampling
+    plot_from_fieldname(data_manager, x_data_name, y_data_name, x_range=None, where=None)
         create a plot from a variable fieldname
-    plot_from_fieldnames(data_manager, x_data_name, y_data_names)
+    plot_from_fieldnames(data_manager, x_data_name, y_data_names, x_range=None, where=None)
         create a list of plots from variable fieldnames
+    plot_from_dataset(dataset, x_data_name, y_data_names)
+        create a list of plots from variable fieldnames for each file of a data set (overlay of runs)
+    plot_from_groups(data_manager, x_data_name, y_data_name, group_data_name)
+        create a list of plots from a variable fieldname for each value of a group field
     plot_from_data(x_data, y_data, x_axis, y_axis, x_unit="", y_unit="")
         create a plot from a list of data
     plot_from_multiple_data(x_data, y_multiple_data, x_axis, y_multiple_axis, x_unit="", y_unit="")
         create a list of plots from multiple list of data
-    refresh_plots()
-        refresh all the plot
+    refresh_plots(data_manager, owner=None)
+        refresh all the plot (of an owner)
     __create_plot(x_data, y_data, x_axis, y_axis, x_unit="", y_unit="")
         create a plot
+    __select_rows(data_manager, x_data_name, x_range, where)
+        get the rows to plot
     """
 
     __instance = None
@@ -63,66 +81,28 @@ class PlotCreator:
         else:
             PlotCreator.__instance = self
             self.__plots_dict = {}
+            self.__owners = {}
             self.__counter = 0
-            self.__replacements = {
-                "sin": "np.sin",
-                "cos": "np.cos",
-                "tan": "np.tan",
-                "arcsin": "np.arcsin",
-                "arccos": "np.arccos",
-                "arctan": "np.arctan",
-                "exp": "np.exp",
-                "ln": "np.log",
-                "sqrt": "np.sqrt",
-                "mod": "np.mod",
-                "^": "**",
-                "pi": "np.pi"
-            }
-
-            self.__allowed_words = [
-                "x",
-                "sin",
-                "cos",
-                "tan",
-                "arcsin",
-                "arccos",
-                "arctan",
-                "exp",
-                "ln",
-                "sqrt",
-                "mod",
-                "round",
-                "pi"
-            ]
-
-    def string_to_function(self, string_function):
-        """ Evaluates the string and returns a function of x
+
+    @staticmethod
+    def string_to_function(string_function):
+        """ Compiles the string and returns a vectorized function of x (the compiled functions are cached)
 
         Parameters
         ----------
         string_function : str
-            the string to eval
+            the math expression (x, sin, cos, tan, arcsin, arccos, arctan, exp, ln, sqrt, mod, round, pi)
 
         Returns
         ------
         func
-            the math function from string
+            the math function from string (called with a numpy array of x values)
         """
-        # find all words and check if all are allowed:
-        for word in re.findall('[a-zA-Z_]+', string_function):
-            if word not in self.__allowed_words:
-                logger.log(logging.INFO, "[PlotCreator] " + word + " is forbidden to use in math expression")
-                raise ValueError(
-                    '"{}" is forbidden to use in math expression'.format(word)
-                )
-
-        for old, new in self.__replacements.items():
-            string_function = string_function.replace(old, new)
-
-        def func(x):
-            return eval(string_function)
-
-        return func
+        try:
+            return compile_function(str(string_function))
+        except ValueError as error:
+            logger.log(logging.INFO, "[PlotCreator] " + str(error))
+            raise
 
     def get_plots_dict(self):
         """ Get plots dictionary
@@ -134,38 +114,84 @@ class PlotCreator:
         """
         return self.__plots_dict
 
-    def get_plot_from_stringify(self, plot_stringify):
-        """ Get plot from its stringify version
-
-                Parameters
-                ----------
-                plot_stringify : str
-                    the stringify of a plot
-
-                Returns
-                ------
-                plot
-                    the plot
-                """
-        pattern = re.search('id=(.+?) ', plot_stringify)
-        if pattern:
-            found = int(pattern.group(1))
-            return self.get_plot_from_id(found)
-
     def get_plot_from_id(self, plot_id):
         """ Get plot from the dictionary according to its id
 
         Parameters
         ----------
-        plot_id : list(int)
+        plot_id : int
             the plot id to get
 
         Returns
         ------
         plot
-            the plot
+            the plot (None if the plot is released)
+        """
+        return self.__plots_dict.get(plot_id)
+
+    def set_owner(self, plot_id, owner):
+        """ Set the owner of a plot (the plots of an owner are released together)
+
+        Parameters
+        ----------
+        plot_id : int
+            the plot id
+        owner : str
+            the owner of the plot (a tab of the GUI for instance)
+        """
+        if plot_id in self.__plots_dict:
+            for plot_ids in self.__owners.values():
+                plot_ids.discard(plot_id)
+            self.__owners.setdefault(owner, set()).add(plot_id)
+
+    def get_plot_ids(self, owner=None):
+        """ Get the ids of the plots
+
+        Parameters
+        ----------
+        owner : str
+            the owner of the plots (None for all the plots)
+
+        Returns
+        ------
+        list(int)
+            the ids of the plots
+        """
+        if owner is None:
+            return list(self.__plots_dict)
+        return sorted(self.__owners.get(owner, ()))
+
+    def release_plot(self, plot_id):
+        """ Remove a plot from the registry (its data is freed when it is no more used)
+
+        Parameters
+        ----------
+        plot_id : int
+            the plot id
+
+        Returns
+        ------
+        bool
+            true if the plot was in the registry, false otherwise
+        """
+        for plot_ids in self.__owners.values():
+            plot_ids.discard(plot_id)
+        plot = self.__plots_dict.pop(plot_id, None)
+        if plot is not None:
+            logger.log(logging.INFO, "[PlotCreator] Release plot " + str(plot))
+        return plot is not None
+
+    def release_owner(self, owner):
+        """ Remove the plots of an owner from the registry
+
+        Parameters
+        ----------
+        owner : str
+            the owner of the plots
         """
-        return self.__plots_dict[plot_id]
+        logger.log(logging.INFO, "[PlotCreator] Release the plots of " + str(owner))
+        for plot_id in self.__owners.pop(owner, set()):
+            self.__plots_dict.pop(plot_id, None)
 
     def plot_from_function(self, function, xmin, xmax, discr, xlabel="", ylabel=""):
         """ Create a plot from a mathematic function
@@ -193,14 +219,51 @@ class PlotCreator:
         func = self.string_to_function(str(function))
         a = float(xmin)
         b = float(xmax)
-        x_interval = np.linspace(a, b, int(discr)).tolist()
-        fx = []
-        for x in x_interval:
-            fx.append(func(x))
+        x_interval = np.linspace(a, b, int(discr))
+
+        plot = self.plot_from_data(x_interval, func(x_interval), str(xlabel), str(ylabel))
+        plot.set_sampling({'xmin': a, 'xmax': b, 'discr': int(discr), 'adaptive': False,
+                           'tolerance': DEFAULT_TOLERANCE, 'max_points': DEFAULT_MAX_POINTS})
+        return plot
+
+    def plot_from_function_adaptive(self, function, xmin, xmax, tolerance=DEFAULT_TOLERANCE,
+                                    max_points=DEFAULT_MAX_POINTS, xlabel="", ylabel=""):
+        """ Create a plot from a mathematic function sampled with more points where it is not linear
+
+        Parameters
+        ----------
+        function : str
+            the mathematic function
+        xmin :  int
+            the x min
+        xmax : int
+            the x max
+        tolerance : float
+            the maximum deviation of the function from the segments between the points (relative to the range of the
+            values of the function)
+        max_points : int
+            the maximum number of points
+        xlabel :  str
+            the name of the x label
+        ylabel : str
+            the name of the y label
+
+        Returns
+        ------
+        plot
+            the plot
+        """
+        func = self.string_to_function(str(function))
+        x_interval, fx = adaptive_sampling(func, float(xmin), float(xmax), float(tolerance), int(max_points))
+        logger.log(logging.INFO, "[PlotCreator] Adaptive sampling of " + str(function) + " with "
+                   + str(len(x_interval)) + " points")
 
-        return self.plot_from_data(x_interval, fx, str(xlabel), str(ylabel))
+        plot = self.plot_from_data(x_interval, fx, str(xlabel), str(ylabel))
+        plot.set_sampling({'xmin': float(xmin), 'xmax': float(xmax), 'discr': len(x_interval), 'adaptive': True,
+                           'tolerance': float(tolerance), 'max_points': int(max_points)})
+        return plot
 
-    def plot_from_fieldname(self, data_manager, x_data_name, y_data_name):
+    def plot_from_fieldname(self, data_manager, x_data_name, y_data_name, x_range=None, where=None):
         """ Create a plot from a variable fieldname
 
         Parameters
@@ -211,6 +274,10 @@ class PlotCreator:
             the name of the x variable
         y_data_name : str
             the name of the y variable
+        x_range : tuple(float, float)
+            the range (min, max) of the x values to plot (None to plot all the values)
+        where : str
+            the filter expression of the rows to plot (ex: phase == 2 and P > 1e5, None to plot all the rows)
 
         Returns
         ------
@@ -218,15 +285,18 @@ class PlotCreator:
             the plot
         """
         logger.log(logging.INFO, "[PlotCreator] Plot from fieldnames")
-        plot = self.__create_plot(data_manager.get_data_from_field_name(x_data_name),
-                                  data_manager.get_data_from_field_name(y_data_name),
+        rows = self.__select_rows(data_manager, x_data_name, x_range, where)
+        plot = self.__create_plot(data_manager.get_labels_from_field_name(x_data_name)[rows],
+                                  data_manager.get_labels_from_field_name(y_data_name)[rows],
                                   x_data_name,
                                   y_data_name,
                                   data_manager.get_unit_from_field_name(x_data_name),
                                   data_manager.get_unit_from_field_name(y_data_name))
+        plot.set_where(where or "")
+        plot.set_x_range(x_range)
         return plot
 
-    def plot_from_fieldnames(self, data_manager, x_data_name, y_data_names):
+    def plot_from_fieldnames(self, data_manager, x_data_name, y_data_names, x_range=None, where=None):
         """ Create a list of plots from variable fieldnames
 
         Parameters
@@ -237,6 +307,10 @@ class PlotCreator:
             the name of the x variable
         y_data_names : list[str]
             the names of the y variables
+        x_range : tuple(float, float)
+            the range (min, max) of the x values to plot (None to plot all the values)
+        where : str
+            the filter expression of the rows to plot (ex: phase == 2 and P > 1e5, None to plot all the rows)
 
         Returns
         ------
@@ -244,14 +318,84 @@ class PlotCreator:
             the list of plots
         """
         logger.log(logging.INFO, "[PlotCreator] Plot from multiple fieldnames")
+        rows = self.__select_rows(data_manager, x_data_name, x_range, where)
+        x_data = data_manager.get_labels_from_field_name(x_data_name)[rows]
         plots_list = []
         for y_data_name in y_data_names:
-            plot = self.__create_plot(data_manager.get_data_from_field_name(x_data_name),
-                                      data_manager.get_data_from_field_name(y_data_name),
+            plot = self.__create_plot(x_data,
+                                      data_manager.get_labels_from_field_name(y_data_name)[rows],
                                       x_data_name,
                                       y_data_name,
                                       data_manager.get_unit_from_field_name(x_data_name),
                                       data_manager.get_unit_from_field_name(y_data_name))
+            plot.set_where(where or "")
+            plot.set_x_range(x_range)
+            plots_list.append(plot)
+        return plots_list
+
+    def plot_from_dataset(self, dataset, x_data_name, y_data_names):
+        """ Create a list of plots from variable fieldnames for each file of a data set (overlay of runs)
+
+        Parameters
+        ----------
+        dataset : DataSet
+            the data set used to read the csv files
+        x_data_name :  str
+            the name of the x variable
+        y_data_names : list[str]
+            the names of the y variables
+
+        Returns
+        ------
+        list(plot)
+            the list of plots (the y label ends with the name of the file)
+        """
+        logger.log(logging.INFO, "[PlotCreator] Plot from data set")
+        plots_list = []
+        for filename in dataset.get_filenames():
+            data_manager = dataset.get_manager(filename)
+            for y_data_name in y_data_names:
+                plot = self.__create_plot(data_manager.get_labels_from_field_name(x_data_name),
+                                          data_manager.get_labels_from_field_name(y_data_name),
+                                          x_data_name,
+                                          y_data_name + " (" + os.path.basename(filename) + ")",
+                                          data_manager.get_unit_from_field_name(x_data_name),
+                                          data_manager.get_unit_from_field_name(y_data_name))
+                plots_list.append(plot)
+        return plots_list
+
+    def plot_from_groups(self, data_manager, x_data_name, y_data_name, group_data_name):
+        """ Create a list of plots from a variable fieldname for each value of a group field (text field for instance)
+
+        Parameters
+        ----------
+        data_manager : DataManager
+            the data_manager used to read csv file
+        x_data_name :  str
+            the name of the x variable
+        y_data_name : str
+            the name of the y variable
+        group_data_name : str
+            the name of the variable used to group the rows
+
+        Returns
+        ------
+        list(plot)
+            the list of plots (the y label ends with the value of the group)
+        """
+        logger.log(logging.INFO, "[PlotCreator] Plot from groups")
+        x_data = data_manager.get_labels_from_field_name(x_data_name)
+        y_data = data_manager.get_labels_from_field_name(y_data_name)
+        groups = data_manager.get_labels_from_field_name(group_data_name)
+        plots_list = []
+        for group in np.unique(groups):
+            mask = groups == group
+            plot = self.__create_plot(x_data[mask],
+                                      y_data[mask],
+                                      x_data_name,
+                                      y_data_name + " (" + str(group) + ")",
+                                      data_manager.get_unit_from_field_name(x_data_name),
+                                      data_manager.get_unit_from_field_name(y_data_name))
             plots_list.append(plot)
         return plots_list
 
@@ -312,20 +456,23 @@ class PlotCreator:
                                                  x_unit, y_unit))
         return plots_list
 
-    def refresh_plots(self, data_manager):
+    def refresh_plots(self, data_manager, owner=None):
         """ Refresh the plots with new data
 
         Parameters
         ----------
         data_manager :  DataManager
             the data manager associated to the data
+        owner : str
+            the owner of the plots to refresh (None to refresh all the plots)
         """
         logger.log(logging.INFO, "[PlotCreator] Refresh plots data")
-        for plot in self.__plots_dict.values():
+        for plot in [self.__plots_dict[plot_id] for plot_id in self.get_plot_ids(owner)]:
             if plot.get_x_axis() in data_manager.get_field_names() \
                     and plot.get_y_axis() in data_manager.get_field_names():
-                plot.set_x(data_manager.get_data_from_field_name(plot.get_x_axis()))
-                plot.set_y(data_manager.get_data_from_field_name(plot.get_y_axis()))
+                rows = self.__select_rows(data_manager, plot.get_x_axis(), plot.get_x_range(), plot.get_where())
+                plot.set_x(data_manager.get_labels_from_field_name(plot.get_x_axis())[rows])
+                plot.set_y(data_manager.get_labels_from_field_name(plot.get_y_axis())[rows])
 
     def __create_plot(self, x_data, y_data, x_axis, y_axis, x_unit="", y_unit=""):
         """ Create a plot
@@ -355,3 +502,32 @@ class PlotCreator:
         self.__counter += 1
         logger.log(logging.INFO, "[PlotCreator] Create plot " + str(plot))
         return plot
+
+    @staticmethod
+    def __select_rows(data_manager, x_data_name, x_range, where):
+        """ Get the rows to plot (rows of the x range matching the filter expression)
+
+        Parameters
+        ----------
+        data_manager : DataManager
+            the data_manager used to read csv file
+        x_data_name :  str
+            the name of the x variable
+        x_range : tuple(float, float)
+            the range (min, max) of the x values to plot (None to plot all the values)
+        where : str
+            the filter expression of the rows to plot (None or "" to plot all the rows)
+
+        Returns
+        ------
+        slice or numpy.ndarray
+            the rows to plot (to index the data of the fields)
+        """
+        rows = slice(None) if x_range is None else data_manager.select_range(x_data_name, *x_range)
+        if not where:
+            return rows
+        mask = data_manager.filter_rows(where)
+        if x_range is None:
+            return np.flatnonzero(mask)
+        rows = np.arange(len(mask))[rows]
+        return rows[mask[rows]]
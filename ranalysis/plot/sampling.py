@@ -0,0 +1,80 @@
+#!/usr/bin/python
+# coding: utf-8
+
+""" This file can be imported as a module and contains the sampling functions of math functions :
+
+    * adaptive_sampling - sample a function with more points where it is not linear
+
+    The interval is first sampled uniformly, then the middle of each interval is evaluated (all the intervals in one
+    vectorized call) and kept when the function deviates from the segment between the two points of the interval. Only
+    the intervals which were split are tested again, until the deviations are below the tolerance or the number of
+    points reaches the budget.
+"""
+
+import numpy as np
+
+DEFAULT_TOLERANCE = 1e-3
+DEFAULT_MAX_POINTS = 10000
+INITIAL_POINTS = 65
+
+
+def adaptive_sampling(func, xmin, xmax, tolerance=DEFAULT_TOLERANCE, max_points=DEFAULT_MAX_POINTS):
+    """ Sample a function with more points where it is not linear (high curvature, sharp features, discontinuities)
+
+    Parameters
+    ----------
+    func : function
+        the vectorized function (called with a numpy array of x values)
+    xmin : float
+        the x min
+    xmax : float
+        the x max
+    tolerance : float
+        the maximum deviation of the function from the segments between the points (relative to the range of the
+        values of the function)
+    max_points : int
+        the maximum number of points
+
+    Returns
+    ------
+    tuple(numpy.ndarray, numpy.ndarray)
+        the x values (sorted) and the values of the function
+    """
+    max_points = max(int(max_points), 2)
+    x = np.linspace(xmin, xmax, min(INITIAL_POINTS, max_points))
+    y = np.asarray(func(x), dtype=np.float64)
+    # the smallest interval which can be split
+    resolution = abs(xmax - xmin) * 1e-12
+
+    candidates = np.arange(len(x) - 1)
+    while len(candidates) > 0 and len(x) < max_points:
+        middles = (x[candidates] + x[candidates + 1]) / 2
+        y_middles = np.asarray(func(middles), dtype=np.float64)
+
+        # the deviation of the middle point from the segment, relative to the range of the values (the extreme values
+        # near a pole are ignored to compute the range)
+        finite = y[np.isfinite(y)]
+        scale = np.subtract(*np.percentile(finite, [99, 1])) if finite.size else 0.0
+        with np.errstate(invalid='ignore'):
+            deviations = np.abs(y_middles - (y[candidates] + y[candidates + 1]) / 2) / (scale if scale > 0 else 1.0)
+        # a non finite value on one side of an interval only (discontinuity, pole) is always refined
+        finite_ends = np.isfinite(y[candidates]) & np.isfinite(y[candidates + 1]) & np.isfinite(y_middles)
+        any_finite = np.isfinite(y[candidates]) | np.isfinite(y[candidates + 1]) | np.isfinite(y_middles)
+        deviations = np.where(finite_ends, deviations, np.where(any_finite, np.inf, 0.0))
+
+        split = np.flatnonzero((deviations > tolerance) & (x[candidates + 1] - x[candidates] > resolution))
+        if len(split) > max_points - len(x):
+            # the budget is spent on the largest deviations
+            split = np.sort(split[np.argpartition(-deviations[split], max_points - len(x))[:max_points - len(x)]])
+        if len(split) == 0:
+            break
+
+        # the middle points are inserted after the left point of their interval
+        positions = candidates[split] + 1
+        x = np.insert(x, positions, middles[split])
+        y = np.insert(y, positions, y_middles[split])
+        # the two halves of each split interval are tested again (indexes in the new arrays)
+        left = positions + np.arange(len(positions)) - 1
+        candidates = np.sort(np.concatenate((left, left + 1)))
+
+    return x, y
@@ -0,0 +1,85 @@
+#!/usr/bin/python
+# coding: utf-8
+
+""" Tests of the ColumnFile class and of the column file writer """
+
+import numpy as np
+import pytest
+
+from ranalysis.data.columnfile import ColumnFile, write_column_file, is_column_file
+from ranalysis.data.zonemap import ASCENDING, UNSORTED
+
+
+def make_columns():
+    """ Make a numeric float column (with nan values), a sorted int column and a dictionary encoded column """
+    rows = 1000
+    values = np.sin(np.arange(rows) / 10.0)
+    values[::7] = np.nan
+    steps = np.arange(rows, dtype=np.int32)
+    codes = (np.arange(rows) % 3).astype(np.int8)
+    categories = {'name': np.array(["alpha", "beta", "gam,ma"])}
+    return ['value', 'step', 'name'], ['m', 's', '-'], [values, steps, codes], categories
+
+
+@pytest.mark.parametrize('compression', [None, 'zlib', 'lzma'])
+def test_column_file_round_trip(tmp_path, compression):
+    filename = str(tmp_path / "data.rcol")
+    fieldnames, units, columns, categories = make_columns()
+    write_column_file(filename, fieldnames, units, columns, categories, compression, block_rows=128)
+    assert is_column_file(filename)
+
+    column_file = ColumnFile(filename)
+    assert column_file.get_field_names() == fieldnames
+    assert column_file.get_units() == units
+    assert column_file.get_row_count() == 1000
+    assert column_file.get_block_rows() == 128
+    for header, column in zip(fieldnames, columns):
+        assert column_file.get_dtype(header) == column.dtype
+        np.testing.assert_array_equal(column_file.read_column(header), column)
+    assert column_file.get_categories('name').tolist() == categories['name'].tolist()
+    assert column_file.get_categories('value') is None
+    assert column_file.get_sortedness('step') == ASCENDING
+    assert column_file.get_sortedness('value') == UNSORTED
+
+
+@pytest.mark.parametrize('compression', [None, 'zlib', 'lzma'])
+def test_column_file_blocks(tmp_path, compression):
+    filename = str(tmp_path / "data.rcol")
+    fieldnames, units, columns, categories = make_columns()
+    write_column_file(filename, fieldnames, units, columns, categories, compression, block_rows=128)
+
+    column_file = ColumnFile(filename)
+    for header, column in zip(fieldnames, columns):
+        blocks = column_file.get_blocks(header)
+        assert [block['rows'] for block in blocks] == [128] * 7 + [104]
+        for index, block in enumerate(blocks):
+            values = column[index * 128:(index + 1) * 128]
+            np.testing.assert_array_equal(column_file.read_block(header, index), values)
+            values = values[~np.isnan(values)] if values.dtype.kind == 'f' else values
+            assert block['count'] == len(values)
+            assert block['min'] == values.min() and block['max'] == values.max()
+
+
+def test_column_file_empty_block_statistics(tmp_path):
+    filename = str(tmp_path / "data.rcol")
+    values = np.full(10, np.nan)
+    values[7] = 2.0
+    write_column_file(filename, ['value'], [], [values], block_rows=5)
+
+    blocks = ColumnFile(filename).get_blocks('value')
+    assert (blocks[0]['count'], blocks[0]['min'], blocks[0]['max']) == (0, None, None)
+    assert (blocks[1]['count'], blocks[1]['min'], blocks[1]['max']) == (1, 2.0, 2.0)
+    assert ColumnFile(filename).get_units() == [""]
+
+
+def test_column_file_rejects_unknown_compression(tmp_path):
+    filename = str(tmp_path / "data.rcol")
+    with pytest.raises(ValueError):
+        write_column_file(filename, ['value'], [], [np.arange(10.0)], compression='bz2')
+    assert not (tmp_path / "data.rcol").exists()
+
+    csv_filename = tmp_path / "data.csv"
+    csv_filename.write_text("time;value\n0;1\n")
+    assert not is_column_file(str(csv_filename))
+    with pytest.raises(ValueError):
+        ColumnFile(str(csv_filename))
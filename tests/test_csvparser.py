@@ -0,0 +1,20 @@
+#!/usr/bin/python
+# coding: utf-8
+
+""" Tests of the csv parser functions """
+
+import numpy as np
+
+from ranalysis.data.csvparser import parse_block
+
+
+def test_parse_block_text_and_numbers():
+    columns = parse_block([b"1;2,5;a\n", b"2;x;b\n"], ';', 3, 'utf-8')
+    np.testing.assert_array_equal(columns[0], [1.0, 2.0])
+    np.testing.assert_array_equal(columns[1], [2.5, np.nan])
+    assert columns[2].dtype.kind == 'U' and list(columns[2]) == ['a', 'b']
+
+
+def test_parse_block_nan_tokens_are_numeric():
+    columns = parse_block([b"1;nan;a\n", b"2;NaN;b\n", b"3;;c\n"], ';', 3, 'utf-8')
+    assert columns[1].dtype == np.float64 and np.isnan(columns[1]).all()
@@ -0,0 +1,63 @@
+#!/usr/bin/python
+# coding: utf-8
+
+""" Tests of the DataManager class """
+
+import numpy as np
+
+from ranalysis.data.datacache import DataCache
+from ranalysis.data.datamanager import DataManager
+
+
+def write_csv_file(path):
+    """ Write a small csv file (delimiter ';', with a unit row) """
+    with open(path, 'w') as outfile:
+        outfile.write("time;temp;name\ns;K;-\n")
+        for index in range(100):
+            outfile.write("{};{};run{}\n".format(index * 0.5, 300 + index, index % 3))
+
+
+def test_read_csv_file_default_options_use_cache(tmp_path):
+    filename = str(tmp_path / "data.csv")
+    write_csv_file(filename)
+    options = {'delimiter': ';', 'unit': 1, 'cache': 1, 'lazy': 1, 'cache_dir': str(tmp_path / "cache")}
+    cache = DataCache(options['cache_dir'])
+
+    # lazy mode: only the asked fields are parsed and stored in the cache
+    first = DataManager()
+    first.read_csv_file(filename, dict(options))
+    assert cache.load(filename, options) is None
+    first.get_data_from_field_name('temp')
+    first.get_data_from_field_name('name')
+    assert [column is not None for column in cache.load(filename, options)[2]] == [False, True, True]
+
+    second = DataManager()
+    second.read_csv_file(filename, dict(options))
+    assert isinstance(second.get_data_from_field_name('temp'), np.memmap)
+    np.testing.assert_array_equal(second.get_data_from_field_name('temp'), first.get_data_from_field_name('temp'))
+    assert list(second.get_labels_from_field_name('name')[:3]) == ['run0', 'run1', 'run2']
+    assert len(second.get_data_from_field_name('time')) == 100
+
+    third = DataManager()
+    third.read_csv_file(filename, dict(options))
+    assert all(isinstance(third.get_data_from_field_name(field_name), np.memmap)
+               for field_name in ('time', 'temp', 'name'))
+    np.testing.assert_array_equal(third.get_data_from_field_name('time'), np.arange(100) * 0.5)
+
+
+def test_refresh_data_keeps_types(tmp_path):
+    filename = str(tmp_path / "data.csv")
+    write_csv_file(filename)
+    manager = DataManager()
+    manager.read_csv_file(filename, {'delimiter': ';', 'unit': 1})
+    assert manager.get_data_from_field_name('temp').dtype == np.int32
+
+    with open(filename, 'a') as outfile:
+        outfile.write("50.0;400;run7\n50.5;;\n")
+    manager.refresh_data()
+
+    for field_name in ('time', 'temp', 'name'):
+        assert len(manager.get_data_from_field_name(field_name)) == 102
+    temp = manager.get_data_from_field_name('temp')
+    assert temp.dtype == np.float64 and temp[100] == 400 and np.isnan(temp[101])
+    assert list(manager.get_labels_from_field_name('name')[-3:]) == ['run0', 'run7', '']
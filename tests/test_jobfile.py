@@ -0,0 +1,24 @@
+#!/usr/bin/python
+# coding: utf-8
+
+""" Tests of the job file functions """
+
+import json
+
+from ranalysis.cli.jobfile import read_job_file, DEFAULT_OPTIONS
+
+
+def test_read_job_file_overlapping_options(tmp_path):
+    job_file = tmp_path / "jobs.json"
+    job_file.write_text(json.dumps({
+        'options': {'delimiter': ',', 'lazy': 0},
+        'inputs': {'run1': {'file': "run1.csv", 'options': {'delimiter': '\t', 'unit': 0}}},
+        'plots': [{'type': 'fieldname', 'input': "run1", 'x': "time", 'y': "temp"},
+                  {'type': 'fieldname', 'input': "run2.csv", 'x': "time", 'y': "temp"}]
+    }))
+    job = read_job_file(str(job_file))
+
+    options = job['inputs']['run1']['options']
+    assert options == dict(DEFAULT_OPTIONS, delimiter='\t', unit=0, lazy=0)
+    options = job['inputs'][str(tmp_path / "run2.csv")]['options']
+    assert options == dict(DEFAULT_OPTIONS, delimiter=',', lazy=0)
@@ -0,0 +1,25 @@
+#!/usr/bin/python
+# coding: utf-8
+
+""" Tests of the math function compiler """
+
+import numpy as np
+import pytest
+
+from ranalysis.plot.mathfunction import compile_function
+
+
+def test_compile_function():
+    func = compile_function("2*sin(x)^2 + exp(-x/pi)")
+    x = np.linspace(0, 10, 11)
+    np.testing.assert_allclose(func(x), 2 * np.sin(x) ** 2 + np.exp(-x / np.pi))
+
+
+def test_compile_function_overflow():
+    with pytest.raises(ValueError):
+        compile_function("10**400")
+
+
+def test_compile_function_invalid_arguments():
+    with pytest.raises(ValueError):
+        compile_function("round(x, x)")(np.linspace(0, 1, 5))
@@ -0,0 +1,102 @@
+#!/usr/bin/python
+# coding: utf-8
+
+""" Tests of the RowFilter class and of the row filter of the DataManager class """
+
+import numpy as np
+import pytest
+
+from ranalysis.data.datamanager import DataManager
+from ranalysis.data.rowfilter import RowFilter
+
+FIELDNAMES = ['time', 'temp', 'T (K)', 'name']
+COLUMNS = {
+    'time': np.arange(6) * 0.5,
+    'temp': np.array([290.0, 300.0, np.nan, 310.0, 320.0, 330.0]),
+    'T (K)': np.array([1, 2, 3, 4, 5, 6], dtype=np.int32),
+    'name': np.array([1, 2, 3, 1, 2, 0], dtype=np.int8)
+}
+CATEGORIES = {'name': np.array(["", "run0", "run1", "run2"])}
+
+
+def evaluate(expression):
+    """ Evaluate a filter expression on the test columns """
+    return RowFilter(expression, FIELDNAMES).evaluate(COLUMNS.get, CATEGORIES.get, 6).tolist()
+
+
+@pytest.mark.parametrize('expression, expected', [
+    ("temp > 300", [False, False, False, True, True, True]),
+    ("temp >= 300 and time < 2", [False, True, False, True, False, False]),
+    ("temp < 300 or time == 2.5", [True, False, False, False, False, True]),
+    ("not temp > 300", [True, True, True, False, False, False]),
+    ("(temp > 300) & ~(time > 2)", [False, False, False, True, True, False]),
+    ("1 < time <= 2", [False, False, False, True, True, False]),
+    ("mod(`T (K)`, 2) == 0", [False, True, False, True, False, True]),
+    ("`T (K)` * 2 - 1 > 6 and sqrt(temp) ** 2 > 0", [False, False, False, True, True, True]),
+    ("isnan(temp)", [False, False, True, False, False, False]),
+    ("abs(sin(time * pi)) < 1e-9", [True, False, True, False, True, False]),
+    ("true", [True] * 6)
+])
+def test_evaluate_accepted_operators(expression, expected):
+    assert evaluate(expression) == expected
+
+
+def test_evaluate_text_comparisons():
+    assert evaluate("name == 'run1'") == [False, True, False, False, True, False]
+    assert evaluate("'run0' != name") == [False, True, True, False, True, True]
+    assert evaluate("name == 'unknown'") == [False] * 6
+    assert evaluate("name == 'run2' or temp > 320") == [False, False, True, False, False, True]
+    with pytest.raises(ValueError):
+        evaluate("name < 'run1'")
+    with pytest.raises(ValueError):
+        evaluate("temp == 'run1'")
+
+
+def test_get_field_names():
+    assert sorted(RowFilter("`T (K)` > 2 and temp < 300", FIELDNAMES).get_field_names()) == ['T (K)', 'temp']
+
+
+@pytest.mark.parametrize('expression', [
+    "temp.real > 1",
+    "temp.__class__",
+    "__import__('os')",
+    "open('data.csv')",
+    "round(temp, decimals=1) > 1",
+    "unknown > 1",
+    "`pressure` > 1",
+    "temp[0] > 1",
+    "(lambda: 1)()",
+    "temp > ",
+    "temp in (1, 2)"
+])
+def test_rejected_expressions(expression):
+    with pytest.raises(ValueError):
+        evaluate(expression)
+
+
+def test_evaluate_rejects_non_condition():
+    with pytest.raises(ValueError):
+        evaluate("temp + 1")
+    with pytest.raises(ValueError):
+        evaluate("sin > 1")
+
+
+def test_filter_rows_mask_is_invalidated(tmp_path):
+    filename = str(tmp_path / "data.csv")
+    with open(filename, 'w') as outfile:
+        outfile.write("time;temp\n")
+        for index in range(10):
+            outfile.write("{};{}\n".format(index, 300 + index))
+    manager = DataManager()
+    manager.read_csv_file(filename, {'delimiter': ';', 'unit': 0})
+    mask = manager.filter_rows("temp > 305")
+    assert np.count_nonzero(mask) == 4
+    assert not mask.flags.writeable
+
+    with open(filename, 'a') as outfile:
+        outfile.write("10;400\n11;200\n")
+    manager.refresh_data()
+    mask = manager.filter_rows("temp > 305")
+    assert len(mask) == 12
+    assert np.count_nonzero(mask) == 5
+    assert mask[-2] and not mask[-1]